@@ -1,49 +1,516 @@
+import hashlib
 import json
+import logging
 import os
+import re
+import struct
+import tempfile
+import threading
 import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
+from app.core.cache_index import CacheIndex
+from app.core.metrics import observe_cache_lookup
+
+try:
+    import fcntl
+except ImportError:
+    # Windows上没有fcntl，只能在线程之间加锁
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 缓存文件格式：固定长度的文件头 + 原始缓存键 + （可能经过压缩的）数据
+# 文件头：魔数、版本、编码方式、内容类型、缓存键长度、过期时间、写入时间
+CACHE_FILE_MAGIC = b'RSC'
+CACHE_FILE_VERSION = 2
+CACHE_FILE_HEADER = struct.Struct('<3sBBBHdd')
+CACHE_FILE_SUFFIX = '.cache'
+MAX_KEY_BYTES = 0xFFFF
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {'none': CODEC_NONE, 'zlib': CODEC_ZLIB, 'gzip': CODEC_ZLIB, 'zstd': CODEC_ZSTD}
+
+CONTENT_TEXT = 0
+CONTENT_JSON = 1
+
+def _resolve_codec(name):
+    """
+    Map a codec name from the config to a codec id.
+    
+    Args:
+        name (str): auto, zstd, zlib/gzip or none
+    
+    Returns:
+        int: Codec id
+    """
+    name = (name or 'auto').lower()
+    if name == 'auto':
+        return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+    if name not in CODEC_NAMES:
+        raise ValueError(f'Unknown cache codec: {name}')
+    if CODEC_NAMES[name] == CODEC_ZSTD and zstandard is None:
+        raise RuntimeError('The zstandard package is required for CACHE_CODEC=zstd')
+    return CODEC_NAMES[name]
+
+def _compress(codec, raw):
+    if codec == CODEC_ZLIB:
+        return zlib.compress(raw, 6)
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return raw
+
+def _decompress(codec, payload):
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return payload
+
+def _encode_key(key):
+    return key.encode('utf-8')[:MAX_KEY_BYTES]
+
+def encode_cache_file(data, expires_at, timestamp, codec=CODEC_ZLIB, compress_min=1024, key=''):
+    """
+    Serialize a cache entry into the binary cache file format.
+    
+    Strings are stored as UTF-8 text, anything else as JSON. Payloads
+    smaller than compress_min bytes are stored uncompressed.
+    
+    Args:
+        data (any): Data to cache (str or JSON serializable)
+        expires_at (float): Expiry timestamp
+        timestamp (float): Write timestamp
+        codec (int): Compression codec id
+        compress_min (int): Minimum payload size worth compressing
+        key (str): Original cache key, kept as metadata
+    
+    Returns:
+        tuple: (file bytes, uncompressed payload size)
+    """
+    if isinstance(data, str):
+        content_type, raw = CONTENT_TEXT, data.encode('utf-8')
+    else:
+        content_type, raw = CONTENT_JSON, json.dumps(data, ensure_ascii=False).encode('utf-8')
+    if len(raw) < compress_min:
+        codec = CODEC_NONE
+    key_bytes = _encode_key(key)
+    header = CACHE_FILE_HEADER.pack(CACHE_FILE_MAGIC, CACHE_FILE_VERSION, codec, content_type, len(key_bytes),
+                                    expires_at, timestamp)
+    return header + key_bytes + _compress(codec, raw), len(raw)
+
+def read_cache_header(f):
+    """
+    Read the header and the original key of a cache file.
+    
+    Args:
+        f (file): Binary file positioned at the start
+    
+    Returns:
+        tuple: (codec, content_type, expires_at, timestamp, key)
+    
+    Raises:
+        ValueError: If the file is not a valid cache file
+    """
+    header = f.read(CACHE_FILE_HEADER.size)
+    if len(header) != CACHE_FILE_HEADER.size:
+        raise ValueError('Truncated cache file header')
+    magic, version, codec, content_type, key_length, expires_at, timestamp = CACHE_FILE_HEADER.unpack(header)
+    if magic != CACHE_FILE_MAGIC or version != CACHE_FILE_VERSION:
+        raise ValueError('Not a cache file')
+    key = f.read(key_length)
+    if len(key) != key_length:
+        raise ValueError('Truncated cache file header')
+    return codec, content_type, expires_at, timestamp, key.decode('utf-8', 'replace')
+
+def decode_cache_payload(codec, content_type, payload):
+    """
+    Decode the payload that follows a cache file header.
+    
+    Args:
+        codec (int): Compression codec id
+        content_type (int): Content type id
+        payload (bytes): Raw payload
+    
+    Returns:
+        tuple: (data, uncompressed payload size)
+    """
+    raw = _decompress(codec, payload)
+    text = raw.decode('utf-8') if isinstance(raw, bytes) else bytes(raw).decode('utf-8')
+    data = text if content_type == CONTENT_TEXT else json.loads(text)
+    return data, len(raw)
+
+class KeyedLock:
+    """
+    Per-key mutual exclusion between threads and, when a lock directory is
+    given, between processes through lock files.
+    """
+    
+    def __init__(self, lock_dir=None):
+        """
+        Initialize the lock table.
+        
+        Args:
+            lock_dir (str): Directory for inter-process lock files (optional)
+        """
+        self.lock_dir = lock_dir
+        self._locks = {}
+        self._guard = threading.Lock()
+        if lock_dir and fcntl is not None:
+            os.makedirs(lock_dir, exist_ok=True)
+    
+    def _lock_file_path(self, key):
+        safe_key = re.sub(r'[^A-Za-z0-9._-]', '_', key)[-200:]
+        return os.path.join(self.lock_dir, f'{safe_key}.lock')
+    
+    @contextmanager
+    def hold(self, key, blocking=True, timeout=None):
+        """
+        Hold the lock for a key.
+        
+        Args:
+            key (str): Lock key
+            blocking (bool): Wait for the lock instead of giving up immediately
+            timeout (float): Maximum time to wait in seconds (optional)
+        
+        Yields:
+            bool: True if the lock was acquired
+        """
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        thread_acquired = entry[0].acquire(blocking, -1 if timeout is None or not blocking else timeout)
+        acquired = thread_acquired
+        lock_file = None
+        try:
+            if thread_acquired and self.lock_dir and fcntl is not None:
+                lock_file = open(self._lock_file_path(key), 'a')
+                while True:
+                    try:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                            acquired = False
+                            break
+                        time.sleep(0.05)
+            yield acquired
+        finally:
+            if lock_file is not None:
+                # 关闭文件即释放flock
+                lock_file.close()
+            if thread_acquired:
+                entry[0].release()
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+class MemoryCache:
+    """
+    In-process LRU cache with a byte-size budget and per-entry expiry.
+    """
+    
+    def __init__(self, max_bytes=32 * 1024 * 1024, default_ttl=3600):
+        """
+        Initialize the in-memory cache.
+        
+        Args:
+            max_bytes (int): Approximate upper bound on the size of cached values
+            default_ttl (int): Default time-to-live in seconds
+        """
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = KeyedLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _estimate_size(data):
+        if isinstance(data, str):
+            return len(data)
+        return len(json.dumps(data))
+    
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+    
+    def set(self, key, data, ttl=None, expires_at=None, size=None):
+        """
+        Set a value in the cache, evicting least recently used entries as needed.
+        
+        Args:
+            key (str): Cache key
+            data (any): Data to cache
+            ttl (int): Time-to-live in seconds (optional)
+            expires_at (float): Absolute expiry timestamp, overrides ttl (optional)
+            size (int): Size of the value in bytes, estimated if omitted
+        """
+        if expires_at is None:
+            expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        if size is None:
+            size = self._estimate_size(data)
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, expires_at, size)
+            self.current_bytes += size
+            
+            if self.current_bytes > self.max_bytes:
+                # 先清除已过期的条目，再按LRU顺序淘汰
+                now = time.time()
+                for stale_key in [k for k, v in self._entries.items() if v[1] <= now]:
+                    self._remove(stale_key)
+                    self.evictions += 1
+                while self.current_bytes > self.max_bytes:
+                    self._remove(next(iter(self._entries)))
+                    self.evictions += 1
+    
+    def get(self, key):
+        """
+        Get a value from the cache if it exists and hasn't expired.
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            any: Cached data or None if not found or expired
+        """
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() > entry[1]:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        observe_cache_lookup('memory', entry is not None, start)
+        return entry[0] if entry is not None else None
+        
+    def get_many(self, keys):
+        """
+        Get several values from the cache.
+        
+        Args:
+            keys (list): Cache keys
+        
+        Returns:
+            dict: Mapping of key to cached data for the keys that were found
+        """
+        result = {}
+        for key in keys:
+            data = self.get(key)
+            if data is not None:
+                result[key] = data
+        return result
+    
+    def delete(self, key):
+        """
+        Delete a cache entry.
+        
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def clear(self):
+        """
+        Clear all cache entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+        
+    def lock(self, key, blocking=True, timeout=None):
+        """
+        Hold the single-flight lock for a key, so that only one caller
+        refreshes an entry at a time.
+        
+        Args:
+            key (str): Cache key
+            blocking (bool): Wait for the lock instead of giving up immediately
+            timeout (float): Maximum time to wait in seconds (optional)
+        
+        Returns:
+            contextmanager: Yields True if the lock was acquired
+        """
+        return self._key_locks.hold(key, blocking=blocking, timeout=timeout)
+    
+    def _tier_stats(self):
+        with self._lock:
+            now = time.time()
+            total = len(self._entries)
+            expired = sum(1 for v in self._entries.values() if v[1] <= now)
+            return {
+                'total': total,
+                'expired': expired,
+                'valid': total - expired,
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+    
+    def get_stats(self):
+        """
+        Get cache statistics.
+        
+        Returns:
+            dict: Cache statistics, with the per-tier details under 'tiers'
+                like the other backends
+        """
+        stats = self._tier_stats()
+        return {
+            'total': stats['total'],
+            'expired': stats['expired'],
+            'valid': stats['valid'],
+            'tiers': {'memory': stats}
+        }
+
 class Cache:
     """
     Simple file-based caching system for RSS feed data.
+    
+    Reads go through an in-process LRU tier first; the file tier is the
+    read-through backing store shared by all worker processes.
     """
     
-    def __init__(self, cache_dir='./cache', default_ttl=3600):
+    def __init__(self, cache_dir='./cache', default_ttl=3600, memory_limit=32 * 1024 * 1024, memory_ttl=60,
+                 codec='auto', compress_min=1024, max_size=0, sweep_interval=300, namespace='rsshub-py'):
         """
         Initialize cache with directory and default TTL.
         
         Args:
             cache_dir (str): Directory to store cache files
             default_ttl (int): Default time-to-live in seconds
+            memory_limit (int): Byte budget of the in-memory tier, 0 disables it
+            memory_ttl (int): Maximum lifetime of an entry in the in-memory tier,
+                bounding how long a worker can miss updates made by other workers
+            codec (str): Compression of cache files: auto, zstd, zlib or none
+            compress_min (int): Payloads smaller than this many bytes are not compressed
+            max_size (int): Maximum total size of the cache files in bytes, 0 for unlimited
+            sweep_interval (float): Seconds between background sweeps, 0 disables the sweeper
+            namespace (str): Subdirectory of cache_dir holding this cache's files
         """
         self.default_ttl = default_ttl
+        self.codec = _resolve_codec(codec)
+        self.compress_min = compress_min
+        self.memory_ttl = memory_ttl
+        self.memory = MemoryCache(max_bytes=memory_limit, default_ttl=memory_ttl) if memory_limit else None
+        self.max_size = max_size
+        self.sweep_interval = sweep_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sweeper = None
+        self._sweeper_pid = None
+        self._sweeper_lock = threading.Lock()
+        self._stop_sweeper = threading.Event()
+        self._shard_dirs = set()
         
         # Create cache directory if it doesn't exist
+        # 缓存文件保存在独立的命名空间目录中，不与/tmp中的其他文件混在一起
         try:
-            os.makedirs(cache_dir, exist_ok=True)
-            self.cache_dir = cache_dir
+            self.cache_dir = os.path.join(cache_dir, namespace)
+            os.makedirs(self.cache_dir, exist_ok=True)
         except Exception as e:
             # 如果无法创建目录，可能是生产环境只读文件系统
             # 尝试使用/tmp目录作为备选
             if cache_dir != '/tmp':
-                self.cache_dir = '/tmp'
+                self.cache_dir = os.path.join('/tmp', namespace)
                 os.makedirs(self.cache_dir, exist_ok=True)
             else:
                 # 如果连/tmp都失败，则无法使用缓存
                 raise
+        
+        # 锁文件用于在多个工作进程之间合并对同一条目的刷新
+        self._key_locks = KeyedLock(os.path.join(self.cache_dir, '.locks'))
+        
+        # 索引记录每个缓存文件的过期时间和大小，统计和清理时无需逐个打开文件
+        self.index = CacheIndex(os.path.join(self.cache_dir, '.index.sqlite3'))
+        if self.index.created:
+            self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """
+        Record the cache files written before the index existed.
+        """
+        for file_path in self._iter_cache_files():
+            try:
+                with open(file_path, 'rb') as f:
+                    _, _, expires_at, timestamp, key = read_cache_header(f)
+                self.index.put(os.path.relpath(file_path, self.cache_dir), key, expires_at,
+                               os.path.getsize(file_path), timestamp)
+            except Exception:
+                continue
+    
+    def _iter_cache_files(self, suffixes=(CACHE_FILE_SUFFIX,)):
+        """
+        Yield the paths of the files in the shard directories.
+        """
+        for root, dirs, files in os.walk(self.cache_dir):
+            if root == self.cache_dir:
+                # 只遍历两级分片目录，跳过锁文件目录
+                dirs[:] = [d for d in dirs if len(d) == 2]
+            for filename in files:
+                if root != self.cache_dir and filename.endswith(suffixes):
+                    yield os.path.join(root, filename)
+    
+    @staticmethod
+    def _hash_key(key):
+        """
+        Hash a cache key into a fixed-length file name.
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            str: Hex digest
+        """
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
     
     def _get_cache_file_path(self, key):
         """
         Get the file path for a cache key.
         
+        Keys are hashed and spread over two levels of shard directories
+        (ab/cd/abcd....cache), so file names have a fixed length and no
+        directory grows beyond a few hundred entries.
+        
         Args:
             key (str): Cache key
         
         Returns:
             str: File path
         """
-        safe_key = key.replace('/', '_').replace('\\', '_')
-        return os.path.join(self.cache_dir, f'{safe_key}.json')
+        digest = self._hash_key(key)
+        return os.path.join(self.cache_dir, digest[:2], digest[2:4], f'{digest}{CACHE_FILE_SUFFIX}')
     
     def set(self, key, data, ttl=None):
         """
@@ -57,20 +524,63 @@ class Cache:
         if ttl is None:
             ttl = self.default_ttl
         
-        cache_data = {
-            'data': data,
-            'timestamp': time.time(),
-            'expires_at': time.time() + ttl
-        }
+        timestamp = time.time()
+        expires_at = timestamp + ttl
+        content, size = encode_cache_file(data, expires_at, timestamp, self.codec, self.compress_min, key=key)
         
         file_path = self._get_cache_file_path(key)
-        with open(file_path, 'w') as f:
-            json.dump(cache_data, f)
+        shard_dir = os.path.dirname(file_path)
+        if shard_dir not in self._shard_dirs:
+            os.makedirs(shard_dir, exist_ok=True)
+            self._shard_dirs.add(shard_dir)
+        # 先写入临时文件再原子替换，其他进程不会读到写了一半的文件
+        fd, tmp_path = tempfile.mkstemp(dir=shard_dir, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+        self.index.put(os.path.relpath(file_path, self.cache_dir), key, expires_at, len(content), timestamp)
+        self._remember(key, data, expires_at, size)
+        self._ensure_sweeper()
+    
+    def _remember(self, key, data, expires_at, size):
+        """
+        Store a value in the in-memory tier, capped at memory_ttl.
+        """
+        if self.memory is not None:
+            self.memory.set(key, data, expires_at=min(expires_at, time.time() + self.memory_ttl), size=size)
     
     def get(self, key):
         """
         Get a value from the cache if it exists and hasn't expired.
         
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            any: Cached data or None if not found or expired
+        """
+        if self.memory is not None:
+            data = self.memory.get(key)
+            if data is not None:
+                return data
+        
+        start = time.perf_counter()
+        data = self._get_file(key)
+        observe_cache_lookup('file', data is not None, start)
+        return data
+    
+    def _get_file(self, key):
+        """
+        Read a value from the file tier.
+        
         Args:
             key (str): Cache key
         
@@ -80,26 +590,56 @@ class Cache:
         file_path = self._get_cache_file_path(key)
         
         if not os.path.exists(file_path):
+            self.misses += 1
             return None
         
         try:
-            with open(file_path, 'r') as f:
-                cache_data = json.load(f)
+            with open(file_path, 'rb') as f:
+                codec, content_type, expires_at, stored_at, stored_key = read_cache_header(f)
+                
+                if stored_key != _encode_key(key).decode('utf-8', 'replace'):
+                    # 哈希冲突：文件属于另一个缓存键
+                    self.misses += 1
+                    return None
+                
+                # Check if cache has expired (只需读取文件头)
+                if time.time() > expires_at:
+                    expired = True
+                else:
+                    expired = False
+                    data, size = decode_cache_payload(codec, content_type, f.read())
             
-            # Check if cache has expired
-            if time.time() > cache_data['expires_at']:
-                # Delete expired cache
-                os.remove(file_path)
+            if expired:
+                # Delete expired cache（其他进程可能已经写入了新文件，只删除读到的这个）
+                self.misses += 1
+                self._remove_unchanged([(os.path.relpath(file_path, self.cache_dir), stored_at)])
                 return None
             
-            return cache_data['data']
+            self.hits += 1
+            self._remember(key, data, expires_at, size)
+            return data
         except Exception:
-            # If there's any error reading the cache, consider it invalid
-            try:
-                os.remove(file_path)
-            except:
-                pass
+            # 读取失败时按未命中处理，不删除文件：可能是其他进程刚替换的新文件
+            # 损坏的文件会在过期后由清理任务删除
+            self.misses += 1
             return None
+        
+    def get_many(self, keys):
+        """
+        Get several values from the cache.
+        
+        Args:
+            keys (list): Cache keys
+        
+        Returns:
+            dict: Mapping of key to cached data for the keys that were found
+        """
+        result = {}
+        for key in keys:
+            data = self.get(key)
+            if data is not None:
+                result[key] = data
+        return result
     
     def delete(self, key):
         """
@@ -108,23 +648,155 @@ class Cache:
         Args:
             key (str): Cache key
         """
+        if self.memory is not None:
+            self.memory.delete(key)
+        
         file_path = self._get_cache_file_path(key)
-        if os.path.exists(file_path):
+        self._remove_files([os.path.relpath(file_path, self.cache_dir)])
+    
+    def _remove_files(self, paths):
+        """
+        Remove cache files and their index entries.
+        
+        Args:
+            paths (list): File paths relative to the cache directory
+        """
+        for path in paths:
             try:
-                os.remove(file_path)
-            except:
+                os.remove(os.path.join(self.cache_dir, path))
+            except OSError:
                 pass
+        self.index.remove(paths)
     
-    def clear(self):
+    def _remove_unchanged(self, entries):
         """
-        Clear all cache entries.
+        Remove cache files unless they have been written again since they
+        were inspected.
+        
+        Each file is first moved aside atomically and its write timestamp
+        checked. A file written by another process in the meantime is put
+        back, unless an even newer file has already taken its place.
+        
+        Args:
+            entries (list): (path relative to the cache directory, stored_at of the inspected file) pairs
+        
+        Returns:
+            int: Number of files removed
         """
-        for filename in os.listdir(self.cache_dir):
-            if filename.endswith('.json'):
+        removed = []
+        for path, stored_at in entries:
+            file_path = os.path.join(self.cache_dir, path)
+            aside = f'{file_path}.{os.getpid()}-{threading.get_ident()}.tmp'
+            try:
+                os.rename(file_path, aside)
+            except OSError:
+                # 文件已不存在，只需删除索引记录
+                removed.append((path, stored_at))
+                continue
+            try:
+                with open(aside, 'rb') as f:
+                    current = read_cache_header(f)[3]
+            except Exception:
+                # 原子写入的文件总能读取文件头，无法读取的是损坏的文件
+                current = stored_at
+            if current != stored_at:
                 try:
-                    os.remove(os.path.join(self.cache_dir, filename))
-                except:
+                    os.link(aside, file_path)
+                except OSError:
+                    # 已有更新的文件
                     pass
+            else:
+                removed.append((path, stored_at))
+            try:
+                os.remove(aside)
+            except OSError:
+                pass
+        self.index.remove_stored(removed)
+        return len(removed)
+    
+    def clear(self):
+        """
+        Clear all cache entries.
+        """
+        if self.memory is not None:
+            self.memory.clear()
+        
+        self._remove_files(self.index.paths())
+        # 清除未记录在索引中的文件，例如写入中断留下的临时文件
+        # 只遍历命名空间内的分片目录，不会扫描/tmp中的其他文件
+        for file_path in self._iter_cache_files((CACHE_FILE_SUFFIX, '.tmp')):
+            try:
+                os.remove(file_path)
+            except:
+                pass
+        
+    def lock(self, key, blocking=True, timeout=None):
+        """
+        Hold the single-flight lock for a key, so that only one caller
+        refreshes an entry at a time.
+        
+        Args:
+            key (str): Cache key
+            blocking (bool): Wait for the lock instead of giving up immediately
+            timeout (float): Maximum time to wait in seconds (optional)
+        
+        Returns:
+            contextmanager: Yields True if the lock was acquired
+        """
+        return self._key_locks.hold(key, blocking=blocking, timeout=timeout)
+    
+    def sweep(self):
+        """
+        Remove expired cache files, then evict the soonest expiring files
+        until the cache fits into max_size.
+        
+        Returns:
+            dict: Number of expired and evicted files removed
+        """
+        # 多个工作进程同时运行清理时，只由一个进程执行
+        with self.lock('.sweep', blocking=False) as acquired:
+            if not acquired:
+                return {'expired': 0, 'evicted': 0}
+            
+            # 索引中的记录可能已被其他进程的写入取代，只删除写入时间仍然一致的文件
+            expired = self._remove_unchanged(self.index.expired(time.time()))
+            
+            evicted = 0
+            if self.max_size:
+                _, _, total_bytes = self.index.stats(time.time())
+                if total_bytes > self.max_size:
+                    evicted = self._remove_unchanged(self.index.eviction_candidates(total_bytes - self.max_size))
+                    self.evictions += evicted
+            return {'expired': expired, 'evicted': evicted}
+    
+    def _ensure_sweeper(self):
+        """
+        Start the background sweeper in the current process if needed.
+        """
+        if not self.sweep_interval or self._sweeper_pid == os.getpid():
+            return
+        with self._sweeper_lock:
+            # 线程不会在fork后保留，每个工作进程各自启动
+            if self._sweeper_pid == os.getpid():
+                return
+            self._sweeper_pid = os.getpid()
+            self._stop_sweeper.clear()
+            self._sweeper = threading.Thread(target=self._sweep_forever, name='cache-sweeper', daemon=True)
+            self._sweeper.start()
+    
+    def _sweep_forever(self):
+        while not self._stop_sweeper.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Error sweeping cache: {e}", exc_info=True)
+    
+    def stop_sweeper(self):
+        """
+        Stop the background sweeper of the current process.
+        """
+        self._stop_sweeper.set()
+        self._sweeper_pid = None
     
     def get_stats(self):
         """
@@ -133,27 +805,279 @@ class Cache:
         Returns:
             dict: Cache statistics
         """
-        total = 0
-        expired = 0
-        current_time = time.time()
+        total, expired, total_bytes = self.index.stats(time.time())
         
-        for filename in os.listdir(self.cache_dir):
-            if filename.endswith('.json'):
-                total += 1
-                file_path = os.path.join(self.cache_dir, filename)
-                try:
-                    with open(file_path, 'r') as f:
-                        cache_data = json.load(f)
-                    if current_time > cache_data['expires_at']:
-                        expired += 1
-                except:
-                    expired += 1
+        tiers = {
+            'file': {
+                'total': total,
+                'expired': expired,
+                'valid': total - expired,
+                'bytes': total_bytes,
+                'max_bytes': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+        }
+        if self.memory is not None:
+            tiers['memory'] = self.memory._tier_stats()
         
         return {
             'total': total,
             'expired': expired,
-            'valid': total - expired
+            'valid': total - expired,
+            'tiers': tiers
+        }
+
+class RedisCache:
+    """
+    Redis-backed cache shared by every worker and container.
+    
+    Entries use native Redis expiry, multi-key reads are pipelined and
+    connections come from a pool. Writes and deletes are counted in a Redis
+    hash shared by all instances, so statistics never scan the keyspace.
+    """
+    
+    def __init__(self, url='redis://localhost:6379/0', default_ttl=3600, prefix='rsshub:',
+                 max_connections=20, client=None, lock_ttl=60):
+        """
+        Initialize the Redis cache.
+        
+        Args:
+            url (str): Redis connection URL
+            default_ttl (int): Default time-to-live in seconds
+            prefix (str): Namespace prepended to every key
+            max_connections (int): Size of the connection pool
+            client (redis.Redis): Existing client to use instead of creating one
+            lock_ttl (int): Seconds after which an abandoned lock is released
+        """
+        self.default_ttl = default_ttl
+        self.lock_ttl = lock_ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError('The redis package is required for CACHE_BACKEND=redis')
+            pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+            client = redis.Redis(connection_pool=pool)
+        self.client = client
+    
+    def _key(self, key):
+        return f'{self.prefix}{key}'
+    
+    @property
+    def _stats_key(self):
+        # 不与缓存键冲突：缓存键由FeedCache和爬虫生成，不含该后缀
+        return f'{self.prefix}__stats__'
+    
+    def _decode(self, raw):
+        if raw is None:
+            self.misses += 1
+            return None
+        try:
+            data = json.loads(raw)
+        except Exception:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+    
+    def set(self, key, data, ttl=None):
+        """
+        Set a value in the cache.
+        
+        Args:
+            key (str): Cache key
+            data (any): Data to cache (must be JSON serializable)
+            ttl (int): Time-to-live in seconds (optional)
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(self._key(key), json.dumps(data), ex=max(1, int(ttl)))
+        pipe.hincrby(self._stats_key, 'writes', 1)
+        pipe.execute()
+    
+    def get(self, key):
+        """
+        Get a value from the cache if it exists and hasn't expired.
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            any: Cached data or None if not found or expired
+        """
+        start = time.perf_counter()
+        data = self._decode(self.client.get(self._key(key)))
+        observe_cache_lookup('redis', data is not None, start)
+        return data
+    
+    def get_many(self, keys):
+        """
+        Get several values from the cache in one round trip.
+        
+        Args:
+            keys (list): Cache keys
+        
+        Returns:
+            dict: Mapping of key to cached data for the keys that were found
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(self._key(key))
+        result = {}
+        for key, raw in zip(keys, pipe.execute()):
+            data = self._decode(raw)
+            if data is not None:
+                result[key] = data
+        return result
+    
+    def delete(self, key):
+        """
+        Delete a cache entry.
+        
+        Args:
+            key (str): Cache key
+        """
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(self._key(key))
+        pipe.hincrby(self._stats_key, 'deletes', 1)
+        pipe.execute()
+    
+    def clear(self):
+        """
+        Clear all cache entries under this cache's prefix.
+        """
+        batch = []
+        for name in self.client.scan_iter(match=f'{self.prefix}*', count=500):
+            batch.append(name)
+            if len(batch) >= 500:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+    
+    @contextmanager
+    def lock(self, key, blocking=True, timeout=None):
+        """
+        Hold the single-flight lock for a key across all instances.
+        
+        Args:
+            key (str): Cache key
+            blocking (bool): Wait for the lock instead of giving up immediately
+            timeout (float): Maximum time to wait in seconds (optional)
+        
+        Yields:
+            bool: True if the lock was acquired
+        """
+        redis_lock = self.client.lock(self._key(f'lock:{key}'), timeout=self.lock_ttl,
+                                      blocking=blocking, blocking_timeout=timeout)
+        acquired = redis_lock.acquire()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    redis_lock.release()
+                except Exception:
+                    # 锁可能已因超时被自动释放
+                    pass
+    
+    def get_stats(self):
+        """
+        Get cache statistics.
+        
+        The number of keys is not reported: counting them needs a SCAN of
+        the whole keyspace, too slow for every /metrics scrape. Writes and
+        deletes are counted across all instances, hits and misses per process.
+        
+        Returns:
+            dict: Cache statistics
+        """
+        writes, deletes = self.client.hmget(self._stats_key, 'writes', 'deletes')
+        return {
+            'tiers': {
+                'redis': {
+                    'writes': int(writes or 0),
+                    'deletes': int(deletes or 0),
+                    'hits': self.hits,
+                    'misses': self.misses
+                }
+            }
         }
 
-# Create a global cache instance
-cache = Cache()
\ No newline at end of file
+class LazyCache:
+    """
+    Proxy that creates the real cache backend on first use.
+    
+    Used in lazy-initialization mode so that cold starts do not pay for
+    creating cache directories or opening Redis connections.
+    """
+    
+    def __init__(self, factory):
+        """
+        Initialize the proxy.
+        
+        Args:
+            factory (callable): Zero-argument callable creating the cache
+        """
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+    
+    def _get_instance(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+    
+    def __getattr__(self, name):
+        return getattr(self._get_instance(), name)
+
+def create_cache(config, cache_dir=None):
+    """
+    Create the cache backend selected by the application config.
+    
+    Args:
+        config (Mapping): Application config (CACHE_BACKEND and related settings)
+        cache_dir (str): Directory for the file backend, defaults to CACHE_DIR
+    
+    Returns:
+        Cache | MemoryCache | RedisCache: Cache instance
+    """
+    backend = (config.get('CACHE_BACKEND') or 'file').lower()
+    default_ttl = config.get('DEFAULT_CACHE_TTL', 3600)
+    memory_limit = config.get('CACHE_MEMORY_LIMIT', 32 * 1024 * 1024)
+    
+    if backend == 'memory':
+        return MemoryCache(max_bytes=memory_limit, default_ttl=default_ttl)
+    if backend == 'redis':
+        return RedisCache(
+            url=config.get('REDIS_URL', 'redis://localhost:6379/0'),
+            default_ttl=default_ttl,
+            prefix=config.get('CACHE_REDIS_PREFIX', 'rsshub:'),
+            max_connections=config.get('REDIS_MAX_CONNECTIONS', 20)
+        )
+    if backend != 'file':
+        raise ValueError(f'Unknown cache backend: {backend}')
+    
+    return Cache(
+        cache_dir=cache_dir or config.get('CACHE_DIR', './cache'),
+        default_ttl=default_ttl,
+        memory_limit=memory_limit,
+        memory_ttl=config.get('CACHE_MEMORY_TTL', 60),
+        codec=config.get('CACHE_CODEC', 'auto'),
+        compress_min=config.get('CACHE_COMPRESS_MIN', 1024),
+        max_size=config.get('CACHE_MAX_SIZE', 0),
+        sweep_interval=config.get('CACHE_SWEEP_INTERVAL', 300),
+        namespace=config.get('CACHE_NAMESPACE', 'rsshub-py')
+    )
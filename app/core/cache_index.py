@@ -0,0 +1,178 @@
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class CacheIndex:
+    """
+    SQLite index of the file cache: one row per cache file with its key,
+    expiry and size.
+
+    Statistics, clearing and sweeps query the index instead of opening
+    every file. The database runs in WAL mode so several worker processes
+    can update it concurrently. The index is best effort: a failed update
+    is logged and only affects statistics and sweeps until the file is
+    written again.
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS entries ('
+        ' path TEXT PRIMARY KEY,'
+        ' key TEXT NOT NULL,'
+        ' expires_at REAL NOT NULL,'
+        ' size INTEGER NOT NULL,'
+        ' stored_at REAL NOT NULL'
+        ')',
+        'CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)'
+    )
+
+    def __init__(self, db_path, timeout=5.0):
+        """
+        Open (and create if needed) the index database.
+
+        Args:
+            db_path (str): Path of the SQLite database file
+            timeout (float): Seconds to wait for a write lock held by another process
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self.created = not os.path.exists(db_path)
+        self._local = threading.local()
+        with self._connection() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self):
+        """
+        Get this thread's connection, reconnecting after a fork.
+        """
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def _execute(self, sql, params=()):
+        try:
+            return self._connection().execute(sql, params)
+        except sqlite3.Error as e:
+            logger.warning(f"Cache index query failed: {e}")
+            return None
+
+    def put(self, path, key, expires_at, size, stored_at):
+        """
+        Record a cache file.
+
+        Args:
+            path (str): File path relative to the cache directory
+            key (str): Original cache key
+            expires_at (float): Expiry timestamp
+            size (int): File size in bytes
+            stored_at (float): Write timestamp
+        """
+        self._execute(
+            'INSERT OR REPLACE INTO entries (path, key, expires_at, size, stored_at) VALUES (?, ?, ?, ?, ?)',
+            (path, key, expires_at, size, stored_at)
+        )
+
+    def remove(self, paths):
+        """
+        Forget cache files.
+
+        Args:
+            paths (list): File paths relative to the cache directory
+        """
+        paths = list(paths)
+        # SQLite限制单条语句的参数数量，分批删除
+        for start in range(0, len(paths), 500):
+            batch = paths[start:start + 500]
+            self._execute(f'DELETE FROM entries WHERE path IN ({",".join("?" * len(batch))})', batch)
+
+    def remove_stored(self, entries):
+        """
+        Forget cache files, unless they have been written again since.
+
+        Args:
+            entries (list): (path relative to the cache directory, stored_at) pairs
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        try:
+            self._connection().executemany('DELETE FROM entries WHERE path = ? AND stored_at = ?', entries)
+        except sqlite3.Error as e:
+            logger.warning(f"Cache index query failed: {e}")
+
+    def clear(self):
+        """
+        Forget every cache file.
+        """
+        self._execute('DELETE FROM entries')
+
+    def paths(self):
+        """
+        Get every recorded cache file.
+
+        Returns:
+            list: File paths relative to the cache directory
+        """
+        cursor = self._execute('SELECT path FROM entries')
+        return [row[0] for row in cursor] if cursor is not None else []
+
+    def expired(self, now):
+        """
+        Get the cache files that have expired.
+
+        Args:
+            now (float): Current timestamp
+
+        Returns:
+            list: (path relative to the cache directory, stored_at) pairs
+        """
+        cursor = self._execute('SELECT path, stored_at FROM entries WHERE expires_at <= ?', (now,))
+        return [tuple(row) for row in cursor] if cursor is not None else []
+
+    def eviction_candidates(self, excess):
+        """
+        Get the files to remove to free at least ``excess`` bytes, soonest
+        expiring first.
+
+        Args:
+            excess (int): Number of bytes to free
+
+        Returns:
+            list: (path relative to the cache directory, stored_at) pairs
+        """
+        cursor = self._execute('SELECT path, size, stored_at FROM entries ORDER BY expires_at')
+        candidates = []
+        if cursor is None:
+            return candidates
+        freed = 0
+        for path, size, stored_at in cursor:
+            if freed >= excess:
+                break
+            candidates.append((path, stored_at))
+            freed += size
+        return candidates
+
+    def stats(self, now):
+        """
+        Get aggregate statistics of the recorded cache files.
+
+        Args:
+            now (float): Current timestamp
+
+        Returns:
+            tuple: (total entries, expired entries, total bytes)
+        """
+        cursor = self._execute(
+            'SELECT COUNT(*), COALESCE(SUM(expires_at <= ?), 0), COALESCE(SUM(size), 0) FROM entries', (now,)
+        )
+        row = cursor.fetchone() if cursor is not None else None
+        return tuple(row) if row is not None else (0, 0, 0)
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+# 无法解析日期且没有其他可用时间时使用的固定时间，保证输出可重复
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_MONTHS = (None, 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+# 预先格式化的两位数字，避免每次调用时格式化
+_TWO_DIGITS = tuple(f'{i:02d}' for i in range(100))
+# 时区偏移 -> "+0800"形式的字符串，源中出现的时区通常只有少数几种
+_ZONES = {None: ''}
+
+
+@lru_cache(maxsize=16384)
+def _parse(value):
+    try:
+        # Python 3.11起fromisoformat支持完整的ISO 8601，包括Z后缀
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        # 没有时区信息的时间按UTC处理
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_datetime(value):
+    """
+    Parse an ISO 8601 (Atom/OPDS) or RFC 822 (RSS) timestamp.
+
+    Results are memoized, so timestamps repeated across entries and
+    refreshes are parsed once.
+
+    Args:
+        value (str|datetime|None): Timestamp
+
+    Returns:
+        datetime: Timezone-aware datetime, or None if the value cannot be parsed
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    return _parse(value.strip())
+
+
+def normalize_date(value, fallback=EPOCH):
+    """
+    Parse a timestamp, falling back to a fixed date.
+
+    Args:
+        value (str|datetime|None): Timestamp
+        fallback (datetime): Date used when the value cannot be parsed, for
+            example the feed's own updated time
+
+    Returns:
+        datetime: Parsed date or the fallback
+    """
+    parsed = parse_datetime(value)
+    return parsed if parsed is not None else fallback
+
+
+def normalize_dates(values, fallback=EPOCH):
+    """
+    Parse the timestamps of a whole feed.
+
+    Args:
+        values (iterable): Timestamps
+        fallback (datetime): Date used for values that cannot be parsed
+
+    Returns:
+        list: Parsed dates
+    """
+    return [normalize_date(value, fallback) for value in values]
+
+
+def format_rfc822(value):
+    """
+    Format a datetime as an RFC 822 date for RSS, like
+    strftime('%a, %d %b %Y %H:%M:%S %z') without its per-call overhead.
+
+    Args:
+        value (datetime): Date
+
+    Returns:
+        str: Formatted date
+    """
+    offset = value.utcoffset()
+    zone = _ZONES.get(offset)
+    if zone is None:
+        minutes = int(offset.total_seconds()) // 60
+        sign = '-' if minutes < 0 else '+'
+        minutes = abs(minutes)
+        zone = _ZONES[offset] = f'{sign}{minutes // 60:02d}{minutes % 60:02d}'
+    two = _TWO_DIGITS
+    return (f'{_DAYS[value.weekday()]}, {two[value.day]} {_MONTHS[value.month]} {value.year:04d} '
+            f'{two[value.hour]}:{two[value.minute]}:{two[value.second]} {zone}')
+
+
+def format_rfc822_many(values):
+    """
+    Format the dates of a whole feed as RFC 822 dates.
+
+    Args:
+        values (iterable): Dates
+
+    Returns:
+        list: Formatted dates
+    """
+    return [format_rfc822(value) for value in values]
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import accumulate
+
+from app.core.metrics import time_stage
+from app.core.models import FeedItem, serialize_items
+from app.core.pagination import item_mark
+from app.core.rss_generator import iter_rss, page_link
+
+# 当前刷新所使用的上游缓存内容的新鲜度，由BaseSpider.fetch_url记录
+_upstream_freshness = ContextVar('upstream_freshness', default=None)
+
+
+class UpstreamFreshness:
+    """
+    Earliest expiry of the cached upstream content used by a refresh.
+
+    Spiders may be given cached upstream content that is about to expire, or
+    that has already expired and is being revalidated in the background. The
+    rendered feed must not outlive it, or new upstream content would only be
+    served after another full cache_ttl.
+    """
+
+    # 使用了已过期的上游内容时渲染结果的有效期，后台刷新完成后即可得到新内容
+    STALE_TTL = 5
+
+    def __init__(self):
+        self.fresh_until = None
+
+    def observe(self, fresh_until):
+        """
+        Record the expiry of cached upstream content that was used.
+
+        Args:
+            fresh_until (float): Time until which the content is fresh
+        """
+        if self.fresh_until is None or fresh_until < self.fresh_until:
+            self.fresh_until = fresh_until
+
+    def ttl(self, ttl):
+        """
+        Limit a freshness lifetime to the upstream content it was rendered from.
+
+        Args:
+            ttl (int): Lifetime in seconds when the content was fetched just now
+
+        Returns:
+            float: Lifetime in seconds
+        """
+        if self.fresh_until is None:
+            return ttl
+        return min(ttl, max(self.STALE_TTL, self.fresh_until - time.time()))
+
+
+@contextmanager
+def track_upstream_freshness():
+    """
+    Track the cached upstream content used while the block runs.
+
+    The tracker is shared with threads and tasks started from the block,
+    since they copy the current context.
+
+    Yields:
+        UpstreamFreshness: Tracker, complete once the block has finished
+    """
+    freshness = UpstreamFreshness()
+    token = _upstream_freshness.set(freshness)
+    try:
+        yield freshness
+    finally:
+        _upstream_freshness.reset(token)
+
+
+def note_upstream_freshness(fresh_until):
+    """
+    Record that cached upstream content fresh until the given time was used.
+
+    Args:
+        fresh_until (float): Time until which the content is fresh
+    """
+    freshness = _upstream_freshness.get()
+    if freshness is not None:
+        freshness.observe(fresh_until)
+
+
+class FeedCache:
+    """
+    Cache for rendered RSS output, keyed by feed name.
+
+    Each entry stores the final XML together with a strong ETag and a
+    Last-Modified timestamp. The ETag is derived from the feed items, so as
+    long as the source content is unchanged the same bytes (and validators)
+    are reused even after the entry has been refreshed.
+
+    Entries also record where each item's fragment starts and ends in the
+    XML, so windows of the feed (limit, since, cursor) are served by slicing
+    the cached document instead of rendering the items again.
+    """
+
+    # 过期后仍保留旧条目的时间，用于比较内容是否发生变化
+    RETAIN_SECONDS = 86400
+
+    def __init__(self, cache):
+        """
+        Initialize the rendered feed cache.
+
+        Args:
+            cache (Cache): Backing cache instance
+        """
+        self.cache = cache
+
+    def _cache_key(self, feed_name):
+        return f'feed_{feed_name}'
+
+    @staticmethod
+    def fingerprint(items):
+        """
+        Compute a stable fingerprint of a list of feed items.
+
+        Args:
+            items (list): FeedItems (or legacy item dicts)
+
+        Returns:
+            str: Hex digest identifying the item content
+        """
+        payload = json.dumps(serialize_items(items), ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, feed_name):
+        """
+        Get the cached entry for a feed, fresh or not.
+
+        Args:
+            feed_name (str): Feed name
+
+        Returns:
+            dict: Entry with xml, etag, last_modified, fresh_until, or None
+        """
+        with time_stage('cache'):
+            try:
+                entry = self.cache.get(self._cache_key(feed_name))
+            except Exception:
+                return None
+        if entry is not None and 'offsets' not in entry:
+            # 旧格式的缓存条目无法截取窗口，视为未缓存
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        """
+        Check whether an entry can be served without consulting the spider.
+
+        Args:
+            entry (dict): Cached entry
+
+        Returns:
+            bool: True if the entry is still fresh
+        """
+        return entry is not None and time.time() < entry.get('fresh_until', 0)
+
+    def store(self, feed_name, items, render, ttl, previous=None):
+        """
+        Store rendered output for a feed, reusing the previous rendering
+        when the items have not changed.
+
+        Args:
+            feed_name (str): Feed name
+            items (list): Feed items the output is rendered from
+            render (callable): Zero-argument callable returning the document
+                chunks as produced by iter_rss: the channel header, one chunk
+                per item and the closing tags
+            ttl (int): Freshness lifetime in seconds
+            previous (dict): Previously cached entry, if any
+
+        Returns:
+            dict: The stored entry
+        """
+        digest = self.fingerprint(items)
+        now = time.time()
+
+        if previous is not None and previous.get('digest') == digest:
+            # 内容未变化，沿用之前的输出和校验信息
+            entry = dict(previous)
+        else:
+            with time_stage('render'):
+                chunks = list(render())
+            entry = {
+                'xml': ''.join(chunks),
+                # 第i个条目位于xml[offsets[i]:offsets[i + 1]]，结束标签从offsets[-1]开始
+                'offsets': list(accumulate(len(chunk) for chunk in chunks[:-1])),
+                # 每个条目的[发布时间戳, 锚点]，用于按时间和游标截取窗口
+                'marks': [list(item_mark(FeedItem.coerce(item))) for item in items],
+                'digest': digest,
+                'etag': digest[:32],
+                'last_modified': int(now)
+            }
+        entry['fresh_until'] = now + ttl
+
+        try:
+            self.cache.set(self._cache_key(feed_name), entry, ttl + self.RETAIN_SECONDS)
+        except Exception:
+            # 如果缓存不可用，忽略错误
+            pass
+
+        return entry
+
+    def refresh(self, feed_name, spider, previous=None):
+        """
+        Run a spider and store the rendered feed.
+
+        The entry stays fresh no longer than the cached upstream content the
+        spider used, see UpstreamFreshness.
+
+        Args:
+            feed_name (str): Feed name
+            spider (BaseSpider): Spider producing the feed items
+            previous (dict): Previously cached entry, if any
+
+        Returns:
+            dict: The stored entry, or None if the spider returned no items
+        """
+        with track_upstream_freshness() as freshness:
+            items = spider.fetch_items()
+        if not items:
+            # 获取失败时不缓存空结果
+            return None
+        return self.store(feed_name, items, lambda: iter_rss(items, feed_name),
+                          freshness.ttl(spider.cache_ttl), previous=previous)
+
+    @staticmethod
+    def window(entry, window, next_url=None):
+        """
+        Cut a window out of a cached entry.
+
+        The selected item fragments are sliced from the cached XML between
+        its channel header and closing tags; adjacent items are copied as one
+        slice. Nothing is rendered again.
+
+        Args:
+            entry (dict): Cached entry
+            window (FeedWindow): Requested window
+            next_url (callable): Maps the cursor of the next page to its URL (optional)
+
+        Returns:
+            dict: Entry-like dict with xml, etag, last_modified and next (URL of
+                the next page or None)
+        """
+        xml = entry['xml']
+        offsets = entry['offsets']
+        marks = ((timestamp, anchor, position) for position, (timestamp, anchor) in enumerate(entry['marks']))
+        positions, cursor = window.page(marks)
+
+        parts = [xml[:offsets[0]]]
+        start = end = None
+        for position in positions:
+            if position != end:
+                if start is not None:
+                    parts.append(xml[offsets[start]:offsets[end]])
+                start = position
+            end = position + 1
+        if start is not None:
+            parts.append(xml[offsets[start]:offsets[end]])
+        next_link = next_url(cursor) if cursor is not None and next_url is not None else None
+        if next_link:
+            parts.append(page_link(next_link))
+        parts.append(xml[offsets[-1]:])
+
+        # 同一份内容的同一个窗口总是得到相同的输出
+        etag = hashlib.sha256(f"{entry['etag']}|{window.key}".encode('utf-8')).hexdigest()[:32]
+        return {
+            'xml': ''.join(parts),
+            'etag': etag,
+            'last_modified': entry['last_modified'],
+            'next': next_link
+        }
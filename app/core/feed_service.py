@@ -0,0 +1,208 @@
+"""
+Feed serving decisions shared by the Flask routes and the ASGI application.
+
+Rate limiting, window parameters, windows of cached entries, conditional
+responses and load shedding are decided here. The functions return
+FeedReply objects that each server turns into its own response type, so
+both servers answer the same request in the same way.
+"""
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from werkzeug.http import http_date, is_resource_modified, quote_etag
+
+from app.core.feed_cache import FeedCache
+from app.core.metrics import LOAD_SHED, RATE_LIMITED, current_feed
+from app.core.pagination import FeedWindow, page_url
+
+RSS_CONTENT_TYPE = 'application/rss+xml; charset=utf-8'
+JSON_CONTENT_TYPE = 'application/json'
+
+
+@dataclass(slots=True)
+class FeedReply:
+    """
+    A response to a feed request, independent of the server.
+    """
+
+    status: int
+    headers: list = field(default_factory=list)
+    body: str = ''
+
+
+@dataclass(slots=True)
+class FeedRequest:
+    """
+    The parts of a feed request the serving decisions depend on.
+    """
+
+    # 客户端IP，代理之后由ProxyFix或uvicorn的代理头支持设置
+    client: str
+    # 查询参数（每个参数取第一个值）
+    args: dict
+    # 不含查询字符串的请求URL，用于生成下一页的地址
+    base_url: str
+    if_none_match: str = None
+    if_modified_since: str = None
+    method: str = 'GET'
+    window: FeedWindow = None
+
+    def next_url(self, cursor):
+        """
+        Get the URL of the next page of the requested feed.
+
+        Args:
+            cursor (str): Cursor of the next page
+
+        Returns:
+            str: Page URL
+        """
+        return page_url(self.base_url, self.args, cursor)
+
+    def is_modified(self, etag, last_modified):
+        """
+        Check the request's conditional headers against a representation.
+
+        Args:
+            etag (str): Unquoted ETag
+            last_modified (datetime): Last-Modified time
+
+        Returns:
+            bool: False if the client copy is current (304)
+        """
+        environ = {'REQUEST_METHOD': self.method}
+        if self.if_none_match:
+            environ['HTTP_IF_NONE_MATCH'] = self.if_none_match
+        if self.if_modified_since:
+            environ['HTTP_IF_MODIFIED_SINCE'] = self.if_modified_since
+        return is_resource_modified(environ, etag=etag, last_modified=last_modified)
+
+
+def json_reply(status, data, headers=()):
+    """
+    Build a JSON reply.
+
+    Args:
+        status (int): HTTP status
+        data (dict): JSON body
+        headers (iterable): Additional (name, value) headers
+
+    Returns:
+        FeedReply: Reply
+    """
+    return FeedReply(status, [('Content-Type', JSON_CONTENT_TYPE), *headers], json.dumps(data, ensure_ascii=False))
+
+
+def retry_later(status, message, retry_after):
+    """
+    Build an error reply asking the client to retry later.
+
+    Args:
+        status (int): HTTP status (429 or 503)
+        message (str): Error message
+        retry_after (float): Seconds until the client should retry
+
+    Returns:
+        FeedReply: JSON error reply with a Retry-After header
+    """
+    return json_reply(status, {'error': message}, [('Retry-After', str(max(1, math.ceil(retry_after))))])
+
+
+def prepare(feed_request, config, max_limit=None):
+    """
+    Apply API_RATE_LIMIT and parse the window parameters of a feed request.
+
+    The current feed (metrics.current_feed) must be set. The parsed window
+    is stored on the request.
+
+    Args:
+        feed_request (FeedRequest): Request
+        config (Mapping): Application config
+        max_limit (int): Upper bound applied to limit (optional)
+
+    Returns:
+        FeedReply: 429 or 400 reply if the request must be rejected, otherwise None
+    """
+    limiter = config.get('RATE_LIMITER')
+    if limiter is not None:
+        feed = current_feed.get()
+        allowed, retry_after = limiter.acquire(f'{feed_request.client}|{feed}')
+        if not allowed:
+            RATE_LIMITED.inc(feed=feed)
+            return retry_later(429, 'Rate limit exceeded', retry_after)
+
+    try:
+        feed_request.window = FeedWindow.from_args(feed_request.args, max_limit=max_limit)
+    except ValueError as e:
+        return json_reply(400, {'error': str(e)})
+    return None
+
+
+def rss_reply(xml, next_link=None):
+    """
+    Build a reply for RSS that is not backed by a cached entry.
+
+    Args:
+        xml (str): RSS document
+        next_link (str): URL of the next page, if any
+
+    Returns:
+        FeedReply: 200 reply without validators
+    """
+    headers = [('Content-Type', RSS_CONTENT_TYPE)]
+    if next_link:
+        headers.append(('Link', f'<{next_link}>; rel="next"'))
+    return FeedReply(200, headers, xml)
+
+
+def entry_reply(entry, feed_request):
+    """
+    Build the reply for a cached feed entry.
+
+    The requested window is cut out of the cached document, and 304 is
+    returned if the client copy is current.
+
+    Args:
+        entry (dict): Cached entry from FeedCache
+        feed_request (FeedRequest): Request
+
+    Returns:
+        FeedReply: 200 with the XML body, or 304
+    """
+    if feed_request.window is not None:
+        # 从缓存的文档中截取窗口，不重新渲染
+        entry = FeedCache.window(entry, feed_request.window, feed_request.next_url)
+    last_modified = datetime.fromtimestamp(entry['last_modified'], tz=timezone.utc)
+    headers = [
+        ('Content-Type', RSS_CONTENT_TYPE),
+        ('ETag', quote_etag(entry['etag'])),
+        ('Last-Modified', http_date(last_modified))
+    ]
+    if entry.get('next'):
+        headers.append(('Link', f"<{entry['next']}>; rel=\"next\""))
+    if not feed_request.is_modified(entry['etag'], last_modified):
+        return FeedReply(304, headers)
+    return FeedReply(200, headers, entry['xml'])
+
+
+def upstream_busy(entry, error, feed_request):
+    """
+    Answer a request that needs upstream content while upstream capacity is exhausted.
+
+    Args:
+        entry (dict): Stale cached entry from FeedCache, if any
+        error (UpstreamBusy): The exception raised by the HTTP client, if any
+        feed_request (FeedRequest): Request
+
+    Returns:
+        FeedReply: The stale feed, or 503 if nothing is cached
+    """
+    # 不排队等待上游：有旧内容时返回旧内容，否则让客户端稍后重试
+    if entry is not None:
+        LOAD_SHED.inc(feed=current_feed.get(), action='stale')
+        return entry_reply(entry, feed_request)
+    LOAD_SHED.inc(feed=current_feed.get(), action='rejected')
+    return retry_later(503, 'Upstream capacity exhausted, try again later',
+                       error.retry_after if error is not None else 5)
@@ -0,0 +1,185 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.rate_limit import ConcurrencyLimit
+
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    # 未安装brotli时urllib3无法解码br，只接受gzip/deflate
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class HttpClient:
+    """
+    Process-wide HTTP client with one keep-alive connection pool per host.
+
+    Requests to the same host reuse pooled connections instead of paying a
+    new TCP+TLS handshake each time. Failed requests are retried with
+    exponential backoff. The number of requests in flight can be capped;
+    requests that find no free slot within the queue timeout raise
+    UpstreamBusy instead of piling up.
+
+    Retries happen while the request holds its in-flight slot, so the
+    backoff is capped and 429/503 (upstream asking us to slow down) are not
+    retried: waiting out a Retry-After would hold the slot for its duration.
+    """
+
+    RETRY_STATUSES = (500, 502, 504)
+
+    def __init__(self, pool_size=10, max_retries=3, backoff_factor=0.5, timeout=30, max_in_flight=0,
+                 queue_timeout=1.0, backoff_max=2.0):
+        """
+        Initialize the client.
+
+        Args:
+            pool_size (int): Maximum number of kept-alive connections per host
+            max_retries (int): Number of retries for failed requests
+            backoff_factor (float): Base delay of the exponential backoff in seconds
+            timeout (int): Request timeout in seconds
+            max_in_flight (int): Maximum number of requests in flight across all hosts, 0 for unlimited
+            queue_timeout (float): Seconds a request waits for a free slot before raising UpstreamBusy
+            backoff_max (float): Maximum delay between retries in seconds
+        """
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.in_flight = ConcurrencyLimit(max_in_flight, queue_timeout)
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            backoff_max=self.backoff_max,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=False,
+            # 重试耗尽后返回最后一个响应，由调用方raise_for_status
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        return session
+
+    def session_for(self, url):
+        """
+        Get the pooled session for a URL's host.
+
+        Args:
+            url (str): Request URL
+
+        Returns:
+            requests.Session: Session bound to the host's connection pool
+        """
+        parts = urlsplit(url)
+        host = f'{parts.scheme}://{parts.netloc}'
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._sessions[host] = self._create_session()
+        return session
+
+    def get(self, url, headers=None, timeout=None):
+        """
+        Issue a GET request through the host's pooled session.
+
+        Args:
+            url (str): URL to fetch
+            headers (dict): Optional headers
+            timeout (int): Request timeout in seconds, defaults to the client timeout
+
+        Returns:
+            requests.Response: Upstream response
+
+        Raises:
+            UpstreamBusy: If the limit of requests in flight is reached
+        """
+        with self.in_flight:
+            return self.session_for(url).get(url, headers=headers, timeout=timeout or self.timeout)
+
+    def get_stats(self):
+        """
+        Get connection pool statistics per host.
+
+        Returns:
+            dict: Requests, new connections (handshakes) and pool usage per host
+        """
+        stats = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+        for host, session in sessions:
+            adapter = session.get_adapter(host)
+            pools = adapter.poolmanager.pools
+            host_stats = {'requests': 0, 'connections_created': 0, 'in_use': 0, 'pool_size': self.pool_size}
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host_stats['requests'] += pool.num_requests
+                host_stats['connections_created'] += pool.num_connections
+                if pool.pool is not None:
+                    # 队列中保存空闲连接（或占位的None），其余即为正在使用的连接
+                    host_stats['in_use'] += pool.pool.maxsize - pool.pool.qsize()
+            stats[host] = host_stats
+        return stats
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _app_config():
+    try:
+        from flask import current_app
+        return current_app.config
+    except Exception:
+        # 不在应用上下文中
+        return None
+
+
+def get_http_client(config=None):
+    """
+    Get the process-wide HTTP client, creating it on first use.
+
+    The client is built from the HTTP settings of the application config
+    (HTTP_POOL_SIZE, MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_BACKOFF_MAX,
+    REQUEST_TIMEOUT, MAX_UPSTREAM_FETCHES, UPSTREAM_QUEUE_TIMEOUT), taken
+    from ``config`` or the current Flask application. Creating it on first
+    use keeps requests out of the application's startup imports.
+
+    Args:
+        config (Mapping): Application config, defaults to the current application's
+
+    Returns:
+        HttpClient: Shared client
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if config is None:
+                    config = _app_config() or {}
+                _client = HttpClient(
+                    pool_size=config.get('HTTP_POOL_SIZE', 10),
+                    max_retries=config.get('MAX_RETRIES', 3),
+                    backoff_factor=config.get('HTTP_BACKOFF_FACTOR', 0.5),
+                    timeout=config.get('REQUEST_TIMEOUT', 30),
+                    max_in_flight=config.get('MAX_UPSTREAM_FETCHES', 0),
+                    queue_timeout=config.get('UPSTREAM_QUEUE_TIMEOUT', 1.0),
+                    backoff_max=config.get('HTTP_BACKOFF_MAX', 2.0)
+                )
+    return _client
@@ -0,0 +1,78 @@
+import logging
+
+from app.core.models import FeedItem
+from app.core.rate_limit import UpstreamBusy
+
+logger = logging.getLogger(__name__)
+
+# 部分源获取失败时合并结果的有效期（秒），之后重新获取所有源
+PARTIAL_TTL = 60
+
+
+def merge_items(item_lists, limit=None):
+    """
+    Merge items from several feeds, newest first.
+
+    Items are deduplicated by their RSS guid (guid, falling back to link,
+    then title), keeping the first occurrence in feed order.
+
+    Args:
+        item_lists (list): One list of FeedItems (or legacy item dicts) per feed
+        limit (int): Maximum number of items to return (optional)
+
+    Returns:
+        list: Merged FeedItems sorted by pub_date, newest first
+    """
+    seen = set()
+    merged = []
+    for items in item_lists:
+        for item in items:
+            item = FeedItem.coerce(item)
+            key = item.guid or item.link or item.title
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+
+    # sorted是稳定排序，发布时间相同的条目保持原有顺序
+    merged = sorted(merged, key=FeedItem.sort_date, reverse=True)
+    return merged[:limit] if limit else merged
+
+
+async def _fetch_concurrently(spiders):
+    import asyncio
+    from app.spiders.async_spider import as_async
+
+    return await asyncio.gather(*(as_async(spider).afetch_items() for spider in spiders),
+                                return_exceptions=True)
+
+
+def fetch_all(spiders):
+    """
+    Run several spiders concurrently.
+
+    Args:
+        spiders (list): Spider instances
+
+    Returns:
+        tuple: (one item list per spider, names of the spiders that failed);
+            failed spiders contribute no items
+
+    Raises:
+        UpstreamBusy: If a spider could not fetch because upstream capacity was exhausted
+    """
+    from app.spiders.async_spider import run_sync
+
+    results = []
+    failed = []
+    for spider, result in zip(spiders, run_sync(_fetch_concurrently(spiders))):
+        if isinstance(result, UpstreamBusy):
+            # 不把缺少部分源的结果当作完整的合并结果缓存
+            raise result
+        if isinstance(result, Exception):
+            logger.warning(f"Error fetching {spider.name}: {result}")
+            failed.append(spider.name)
+            results.append([])
+        else:
+            results.append(result)
+    return results, failed
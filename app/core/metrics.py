@@ -0,0 +1,281 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 当前正在处理的RSS源，用作各项指标的feed标签
+current_feed = ContextVar('current_feed', default='')
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonically increasing counter with labels.
+    """
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Initialize the counter.
+
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (tuple): Label names
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """
+        Increment the counter.
+
+        Args:
+            amount (float): Amount to add
+            **labels: Label values
+        """
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        """
+        Render the samples in the Prometheus text format.
+
+        Returns:
+            list: Sample lines
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in values]
+
+
+class Histogram:
+    """
+    Histogram of observed values, for example durations in seconds.
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (tuple): Label names
+            buckets (tuple): Upper bounds of the buckets, in increasing order
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # 标签值 -> [各桶计数, 总和, 总数]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """
+        Record an observation.
+
+        Args:
+            value (float): Observed value
+            **labels: Label values
+        """
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration of a block in seconds.
+
+        Args:
+            **labels: Label values
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self):
+        """
+        Render the samples in the Prometheus text format.
+
+        Returns:
+            list: Sample lines
+        """
+        with self._lock:
+            values = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(float(bound))}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f'{self.name}_bucket{labels} {count}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+STAGE_DURATION = Histogram(
+    'rsshub_stage_duration_seconds',
+    'Time spent in each stage of serving a feed (resolve, cache, fetch, parse, render).',
+    ('feed', 'stage')
+)
+CACHE_LOOKUP_DURATION = Histogram(
+    'rsshub_cache_lookup_duration_seconds',
+    'Duration of cache lookups by tier and result.',
+    ('feed', 'tier', 'result')
+)
+UPSTREAM_DURATION = Histogram(
+    'rsshub_upstream_fetch_duration_seconds',
+    'Duration of upstream requests by response status.',
+    ('feed', 'status')
+)
+UPSTREAM_BYTES = Counter(
+    'rsshub_upstream_response_bytes_total',
+    'Bytes received from upstream servers.',
+    ('feed', 'status')
+)
+RATE_LIMITED = Counter(
+    'rsshub_rate_limited_requests_total',
+    'Requests rejected with 429 by the per-client rate limit.',
+    ('feed',)
+)
+LOAD_SHED = Counter(
+    'rsshub_load_shed_requests_total',
+    'Requests answered with stale content or 503 because upstream capacity was exhausted.',
+    ('feed', 'action')
+)
+
+REGISTRY = (STAGE_DURATION, CACHE_LOOKUP_DURATION, UPSTREAM_DURATION, UPSTREAM_BYTES, RATE_LIMITED, LOAD_SHED)
+
+
+def time_stage(stage):
+    """
+    Time a stage of serving the current feed.
+
+    Args:
+        stage (str): Stage name
+
+    Returns:
+        contextmanager: Observes the block's duration
+    """
+    return STAGE_DURATION.time(feed=current_feed.get(), stage=stage)
+
+
+def observe_cache_lookup(tier, hit, start):
+    """
+    Record a cache lookup for the current feed.
+
+    Args:
+        tier (str): Cache tier (memory, file, redis)
+        hit (bool): Whether the lookup found a value
+        start (float): time.perf_counter() at the start of the lookup
+    """
+    CACHE_LOOKUP_DURATION.observe(time.perf_counter() - start, feed=current_feed.get(), tier=tier,
+                                  result='hit' if hit else 'miss')
+
+
+def observe_upstream(status, size, duration):
+    """
+    Record an upstream request for the current feed.
+
+    Args:
+        status (int|str): HTTP status, or "error" if the request failed
+        size (int): Response body size in bytes
+        duration (float): Request duration in seconds
+    """
+    feed = current_feed.get()
+    UPSTREAM_DURATION.observe(duration, feed=feed, status=str(status))
+    UPSTREAM_BYTES.inc(size, feed=feed, status=str(status))
+
+
+def _stats_samples(cache_stats, http_stats):
+    gauges = []
+    if cache_stats:
+        for tier, stats in (cache_stats.get('tiers') or {}).items():
+            for field, name, kind in (('valid', 'rsshub_cache_entries', 'gauge'),
+                                      ('expired', 'rsshub_cache_expired_entries', 'gauge'),
+                                      ('bytes', 'rsshub_cache_bytes', 'gauge'),
+                                      ('max_bytes', 'rsshub_cache_max_bytes', 'gauge'),
+                                      ('hits', 'rsshub_cache_hits_total', 'counter'),
+                                      ('misses', 'rsshub_cache_misses_total', 'counter'),
+                                      ('evictions', 'rsshub_cache_evictions_total', 'counter'),
+                                      ('writes', 'rsshub_cache_writes_total', 'counter'),
+                                      ('deletes', 'rsshub_cache_deletes_total', 'counter')):
+                if stats.get(field) is not None:
+                    gauges.append((name, kind, f'tier="{_escape_label(tier)}"', stats[field]))
+    for host, stats in (http_stats or {}).items():
+        labels = f'host="{_escape_label(host)}"'
+        gauges.append(('rsshub_http_requests_total', 'counter', labels, stats['requests']))
+        gauges.append(('rsshub_http_connections_created_total', 'counter', labels, stats['connections_created']))
+        gauges.append(('rsshub_http_connections_in_use', 'gauge', labels, stats['in_use']))
+    return gauges
+
+
+def render_metrics(cache_stats=None, http_stats=None):
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Args:
+        cache_stats (dict): Result of the cache's get_stats(), exported as gauges
+        http_stats (dict): Result of HttpClient.get_stats(), exported per host
+
+    Returns:
+        str: Metrics document
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        lines.extend(metric.collect())
+
+    declared = set()
+    # 同一指标的样本必须相邻
+    samples = sorted(_stats_samples(cache_stats, http_stats), key=lambda sample: sample[0])
+    for name, kind, labels, value in samples:
+        if name not in declared:
+            declared.add(name)
+            lines.append(f'# TYPE {name} {kind}')
+        lines.append(f'{name}{{{labels}}} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from app.core.dates import parse_datetime
+
+# 没有发布时间的条目排在最后
+_OLDEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class Enclosure:
+    """
+    Media file attached to a feed item.
+    """
+
+    url: str
+    type: str = 'application/octet-stream'
+    length: int = 0
+
+
+@dataclass(slots=True)
+class FeedItem:
+    """
+    A single feed entry.
+
+    Items serialize to compact rows (plain lists) for the cache and back,
+    and are consumed directly by the RSS writer.
+    """
+
+    title: str = 'Untitled'
+    link: str = ''
+    description: str = ''
+    pub_date: datetime = None
+    guid: str = None
+    author: str = None
+    categories: tuple = ()
+    enclosure: Enclosure = None
+
+    def to_row(self):
+        """
+        Serialize the item into a JSON-compatible row.
+
+        Returns:
+            list: Item fields in declaration order
+        """
+        enclosure = self.enclosure
+        return [
+            self.title,
+            self.link,
+            self.description,
+            self.pub_date.isoformat() if self.pub_date is not None else None,
+            self.guid,
+            self.author,
+            list(self.categories),
+            [enclosure.url, enclosure.type, enclosure.length] if enclosure is not None else None
+        ]
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Restore an item serialized with to_row.
+
+        Args:
+            row (list): Serialized item
+
+        Returns:
+            FeedItem: Item
+        """
+        title, link, description, pub_date, guid, author, categories, enclosure = row
+        return cls(
+            title,
+            link,
+            description,
+            datetime.fromisoformat(pub_date) if pub_date is not None else None,
+            guid,
+            author,
+            tuple(categories),
+            Enclosure(*enclosure) if enclosure is not None else None
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build an item from the dict representation used by older spiders.
+
+        Args:
+            data (dict): Item with title, link, description, pub_date and optional
+                guid, author, categories and enclosure (url, type, length)
+
+        Returns:
+            FeedItem: Item
+        """
+        enclosure = data.get('enclosure')
+        if isinstance(enclosure, dict):
+            enclosure = Enclosure(**enclosure)
+        return cls(
+            data.get('title', 'Untitled'),
+            data.get('link', ''),
+            data.get('description', ''),
+            parse_datetime(data.get('pub_date')),
+            data.get('guid'),
+            data.get('author'),
+            tuple(data.get('categories') or ()),
+            enclosure
+        )
+
+    @classmethod
+    def coerce(cls, item):
+        """
+        Get a FeedItem for a FeedItem or a legacy item dict.
+
+        Args:
+            item (FeedItem|dict): Item
+
+        Returns:
+            FeedItem: Item
+        """
+        return item if isinstance(item, cls) else cls.from_dict(item)
+
+    def sort_date(self):
+        """
+        Get the publication date as an aware datetime for sorting.
+
+        Returns:
+            datetime: Publication date, the oldest possible date if unknown
+        """
+        pub_date = self.pub_date
+        if pub_date is None:
+            return _OLDEST
+        if pub_date.tzinfo is None:
+            return pub_date.replace(tzinfo=timezone.utc)
+        return pub_date
+
+
+@dataclass(slots=True)
+class FeedChannel:
+    """
+    Channel-level metadata of a feed.
+    """
+
+    title: str
+    link: str
+    description: str = ''
+    build_date: datetime = None
+
+
+def serialize_items(items):
+    """
+    Serialize items for the cache.
+
+    Args:
+        items (iterable): FeedItems or legacy item dicts
+
+    Returns:
+        list: Rows
+    """
+    return [FeedItem.coerce(item).to_row() for item in items]
+
+
+def deserialize_items(rows):
+    """
+    Restore items serialized with serialize_items.
+
+    Args:
+        rows (list): Rows
+
+    Returns:
+        list: FeedItems
+    """
+    from_row = FeedItem.from_row
+    return [from_row(row) for row in rows]
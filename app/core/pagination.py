@@ -0,0 +1,237 @@
+import base64
+import binascii
+import hashlib
+from dataclasses import dataclass
+from datetime import timezone
+from itertools import islice
+from urllib.parse import urlencode
+
+from app.core.models import FeedItem
+from app.core.dates import parse_datetime
+
+
+def item_mark(item):
+    """
+    Get the values item windows are computed from.
+
+    Args:
+        item (FeedItem): Item
+
+    Returns:
+        tuple: (publication timestamp or None, anchor identifying the item)
+    """
+    timestamp = item.sort_date().timestamp() if item.pub_date is not None else None
+    key = item.guid or item.link or item.title
+    return timestamp, hashlib.blake2b(key.encode('utf-8'), digest_size=4).hexdigest()
+
+
+def mark_items(items):
+    """
+    Pair items with their marks, for windowing items as they are produced.
+
+    Args:
+        items (iterable): FeedItems (or legacy item dicts)
+
+    Yields:
+        tuple: (timestamp, anchor, item)
+    """
+    for item in items:
+        item = FeedItem.coerce(item)
+        yield (*item_mark(item), item)
+
+
+def encode_cursor(position, timestamp, anchor):
+    """
+    Encode the position after the last item of a page as an opaque cursor.
+
+    Args:
+        position (int): Index of the first item of the next page
+        timestamp (float): Publication timestamp of the last item, or None
+        anchor (str): Anchor of the last item
+
+    Returns:
+        str: URL-safe cursor
+    """
+    raw = f"{position}:{'' if timestamp is None else repr(timestamp)}:{anchor}"
+    return base64.urlsafe_b64encode(raw.encode('ascii')).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): Cursor
+
+    Returns:
+        tuple: (position, timestamp or None, anchor)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+        position, timestamp, anchor = raw.split(':')
+        position = int(position)
+        timestamp = float(timestamp) if timestamp else None
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError('Invalid cursor')
+    if position < 1 or not anchor:
+        raise ValueError('Invalid cursor')
+    return position, timestamp, anchor
+
+
+def _parse_since(value):
+    try:
+        # Unix时间戳
+        return float(value)
+    except ValueError:
+        pass
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError('since must be a Unix timestamp, ISO 8601 or RFC 822 date')
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+@dataclass(slots=True)
+class FeedWindow:
+    """
+    The part of a feed requested with the limit, since and cursor query parameters.
+
+    Items keep their feed order. A cursor continues after the last item of
+    the previous page; if that item has moved because the feed changed, the
+    next page holds the items published before it instead, together with the
+    items published at the same time, so items are never skipped (but may be
+    repeated).
+    """
+
+    limit: int = None
+    # Unix时间戳，只返回在此之后发布的条目
+    since: float = None
+    # (下一页第一条的位置, 上一页最后一条的发布时间, 上一页最后一条的锚点)
+    cursor: tuple = None
+
+    @classmethod
+    def from_args(cls, args, max_limit=None):
+        """
+        Parse the window query parameters of a request.
+
+        Args:
+            args (Mapping): Query parameters
+            max_limit (int): Upper bound applied to limit (optional)
+
+        Returns:
+            FeedWindow: Window, or None if the whole feed is requested
+
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        limit = args.get('limit')
+        since = args.get('since')
+        cursor = args.get('cursor')
+        if not limit and not since and not cursor:
+            return None
+
+        if limit:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise ValueError('limit must be an integer')
+            if limit < 1:
+                raise ValueError('limit must be positive')
+            if max_limit:
+                limit = min(limit, max_limit)
+        return cls(
+            limit=limit or None,
+            since=_parse_since(since) if since else None,
+            cursor=decode_cursor(cursor) if cursor else None
+        )
+
+    @property
+    def key(self):
+        """Stable representation of the window, used to derive validators."""
+        return f'{self.limit}|{self.since!r}|{self.cursor}'
+
+    def _matches(self, timestamp, anchor, last=None):
+        """
+        Check an item against since and, when continuing by date, against the
+        (timestamp, anchor) of the last item of the previous page.
+        """
+        before, last_anchor = last if last is not None else (None, None)
+        if timestamp is None:
+            # 没有发布时间的条目不参与按时间的筛选
+            return self.since is None and before is None
+        if self.since is not None and timestamp <= self.since:
+            return False
+        if before is None:
+            return anchor != last_anchor
+        # 与上一页最后一条同时发布的条目也包括在内（可能重复，但不会遗漏），只排除该条目本身
+        return timestamp < before or (timestamp == before and anchor != last_anchor)
+
+    def _select(self, marks, ordered):
+        start, before, last_anchor = self.cursor if self.cursor is not None else (0, None, None)
+        last = (before, last_anchor)
+        anchored = self.cursor is None
+        # 游标位置之前符合时间条件的条目，上一页的最后一条不在原位置时使用
+        held = []
+        for position, (timestamp, anchor, value) in enumerate(marks):
+            if ordered and self.since is not None and timestamp is not None and timestamp <= self.since:
+                # 条目按发布时间从新到旧排列，之后的条目都更早
+                break
+            if position < start:
+                if position == start - 1 and anchor == last_anchor:
+                    anchored = True
+                    held = []
+                elif self._matches(timestamp, anchor, last):
+                    held.append((position, timestamp, anchor, value))
+                continue
+            if not anchored:
+                yield from held
+                held = []
+                if not self._matches(timestamp, anchor, last):
+                    continue
+            elif not self._matches(timestamp, anchor):
+                continue
+            yield position, timestamp, anchor, value
+        yield from held
+
+    def page(self, marks, ordered=False):
+        """
+        Select the items of the window.
+
+        Marks are consumed lazily: once the page is complete the remaining
+        items are not requested, so a generator of parsed items stops early.
+
+        Args:
+            marks (iterable): (timestamp, anchor, value) for each item in feed order
+            ordered (bool): Items are sorted newest first, so selection can stop
+                at the first item not newer than since
+
+        Returns:
+            tuple: (values of the selected items, cursor of the next page or None)
+        """
+        selected = self._select(marks, ordered)
+        if self.limit is None:
+            return [value for *_, value in selected], None
+        page = list(islice(selected, self.limit + 1))
+        if len(page) <= self.limit:
+            return [value for *_, value in page], None
+        position, timestamp, anchor, _ = page[self.limit - 1]
+        return [value for *_, value in page[:self.limit]], encode_cursor(position + 1, timestamp, anchor)
+
+
+def page_url(base_url, args, cursor):
+    """
+    Build the URL of another page of a feed.
+
+    Args:
+        base_url (str): URL of the feed without query string
+        args (Mapping): Query parameters of the current request
+        cursor (str): Cursor of the page
+
+    Returns:
+        str: Page URL
+    """
+    return f'{base_url}?{urlencode({**args, "cursor": cursor})}'
@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamBusy(Exception):
+    """
+    Raised when an upstream request cannot start because the limit of
+    in-flight upstream requests has been reached.
+    """
+
+    def __init__(self, retry_after=5):
+        """
+        Initialize the exception.
+
+        Args:
+            retry_after (float): Suggested seconds before retrying
+        """
+        super().__init__('Too many upstream requests in flight')
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    In-process token bucket rate limiter.
+
+    Each key (for example a client IP and feed) gets a bucket holding up to
+    ``burst`` tokens that refills at ``rate`` tokens per ``period`` seconds;
+    every request takes one token. Buckets are per process, so with several
+    workers a client can make up to ``rate`` requests per period to each.
+    """
+
+    def __init__(self, rate, period=60, burst=None, max_keys=100000):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate (int): Requests allowed per period
+            period (float): Length of the period in seconds
+            burst (int): Bucket size, defaults to rate
+            max_keys (int): Number of buckets kept before idle ones are discarded
+        """
+        self.rate = rate / period
+        self.capacity = burst or rate
+        self.max_keys = max_keys
+        # 键 -> [剩余令牌数, 上次更新时间]
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        """
+        Take a token from a key's bucket.
+
+        Args:
+            key (str): Bucket key
+
+        Returns:
+            tuple: (allowed, seconds until a token is available)
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = [self.capacity, now]
+            tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True, 0.0
+            bucket[0] = tokens
+            return False, (1 - tokens) / self.rate
+
+    def _prune(self, now):
+        # 已经回满的桶与新建的桶等价，可以直接丢弃
+        refill = self.capacity / self.rate
+        for key in [key for key, (_, updated) in self._buckets.items() if now - updated >= refill]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            # 仍然过多时丢弃最久未使用的一半
+            oldest = sorted(self._buckets, key=lambda key: self._buckets[key][1])
+            for key in oldest[:len(oldest) // 2]:
+                del self._buckets[key]
+
+
+class RedisRateLimiter:
+    """
+    Token bucket rate limiter shared by every worker and container through Redis.
+
+    Each check runs as one Lua script, so concurrent requests cannot take
+    the same token. If Redis is unavailable requests are allowed.
+    """
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+    def __init__(self, rate, period=60, burst=None, url='redis://localhost:6379/0', prefix='rsshub:ratelimit:',
+                 client=None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate (int): Requests allowed per period
+            period (float): Length of the period in seconds
+            burst (int): Bucket size, defaults to rate
+            url (str): Redis connection URL
+            prefix (str): Namespace prepended to every bucket key
+            client (redis.Redis): Existing client to use instead of creating one
+        """
+        self.rate = rate / period
+        self.capacity = burst or rate
+        self.prefix = prefix
+
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError('The redis package is required for RATE_LIMIT_BACKEND=redis')
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self._script = client.register_script(self.SCRIPT)
+
+    def acquire(self, key):
+        """
+        Take a token from a key's bucket.
+
+        Args:
+            key (str): Bucket key
+
+        Returns:
+            tuple: (allowed, seconds until a token is available)
+        """
+        try:
+            allowed, wait = self._script(keys=[f'{self.prefix}{key}'], args=[self.capacity, self.rate])
+        except Exception as e:
+            logger.warning(f"Rate limit check failed, allowing request: {e}")
+            return True, 0.0
+        return bool(allowed), float(wait)
+
+
+class ConcurrencyLimit:
+    """
+    Cap on the number of operations in flight in this process, such as
+    upstream requests.
+    """
+
+    def __init__(self, limit, timeout=1.0, retry_after=5):
+        """
+        Initialize the limit.
+
+        Args:
+            limit (int): Maximum number of operations in flight, 0 for unlimited
+            timeout (float): Seconds to wait for a free slot before giving up
+            retry_after (float): Retry-After suggested to clients when giving up
+        """
+        self.limit = limit
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(limit) if limit else None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        if self._slots is not None and not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+            raise UpstreamBusy(self.retry_after)
+        with self._lock:
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.in_flight -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def saturated(self):
+        """
+        Check whether every slot is currently taken.
+
+        Returns:
+            bool: True if a new operation would have to wait
+        """
+        return bool(self.limit) and self.in_flight >= self.limit
+
+
+def create_rate_limiter(config):
+    """
+    Create the rate limiter selected by the application config.
+
+    Args:
+        config (Mapping): Application config (API_RATE_LIMIT and related settings)
+
+    Returns:
+        RateLimiter | RedisRateLimiter: Limiter, or None if rate limiting is disabled
+    """
+    rate = config.get('API_RATE_LIMIT', 60)
+    if not rate:
+        return None
+    burst = config.get('API_RATE_LIMIT_BURST') or None
+    backend = (config.get('RATE_LIMIT_BACKEND') or 'memory').lower()
+    if backend == 'redis':
+        return RedisRateLimiter(
+            rate,
+            burst=burst,
+            url=config.get('REDIS_URL', 'redis://localhost:6379/0'),
+            prefix=f"{config.get('CACHE_REDIS_PREFIX', 'rsshub:')}ratelimit:"
+        )
+    if backend != 'memory':
+        raise ValueError(f'Unknown rate limit backend: {backend}')
+    return RateLimiter(rate, burst=burst)
@@ -1,85 +1,158 @@
 import datetime
+import io
 import os
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
 
-def generate_rss(items, feed_title):
+from app.core.metrics import time_stage
+from app.core.models import FeedChannel, FeedItem
+from app.core.dates import format_rfc822
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" ?>\n'
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+
+def _escape(text):
     """
-    Generate RSS XML content from a list of items.
-    
+    Escape character data for XML output.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Escaped text
+    """
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    return text
+
+def _element(tag, text, indent, newline, attrs=''):
+    """
+    Serialize a leaf element, using the short form when it has no text.
+    """
+    if not text:
+        return f'{indent}<{tag}{attrs}/>{newline}'
+    return f'{indent}<{tag}{attrs}>{_escape(text)}</{tag}>{newline}'
+
+def page_link(href, pretty=True):
+    """
+    Serialize a link to the next page of a paged feed (RFC 5005).
+
+    The Atom namespace is declared on the element itself, so the link can be
+    inserted into an already rendered document.
+
+    Args:
+        href (str): URL of the next page
+        pretty (bool): Indent the element like iter_rss does
+
+    Returns:
+        str: atom:link element
+    """
+    indent, newline = ('    ', '\n') if pretty else ('', '')
+    return f'{indent}<atom:link xmlns:atom="{ATOM_NS}" rel="next" href="{_escape(href)}"/>{newline}'
+
+def build_channel(feed_title, feed_path=None):
+    """
+    Build the default channel metadata of a feed.
+
     Args:
-        items (list): List of dictionaries containing item data (title, link, description, pub_date)
         feed_title (str): Title of the RSS feed
-    
+        feed_path (str): Path of the feed below RSS_FEED_LINK, defaults to feed_title
+
     Returns:
-        str: Formatted RSS XML string
+        FeedChannel: Channel metadata
     """
-    # Create root element
-    rss = Element('rss')
-    rss.set('version', '2.0')
-    # 添加XML命名空间声明以支持UTF-8","},{"old_str":
-    
-    # Create channel element
-    channel = SubElement(rss, 'channel')
-    
-    # Add channel elements
-    title = SubElement(channel, 'title')
-    title.text = f'{feed_title.title()} RSS Feed'
-    
-    link = SubElement(channel, 'link')
     # 从环境变量读取RSS链接前缀，如果未设置则使用默认值
     rss_feed_link = os.environ.get('RSS_FEED_LINK', 'https://rsshubpy.vercel.app')
-    link.text = f'{rss_feed_link}/{feed_title}'
-    
-    description = SubElement(channel, 'description')
-    description.text = f'Latest updates from {feed_title.title()} source'
-    
-    pub_date = SubElement(channel, 'pubDate')
-    pub_date.text = datetime.datetime.now(datetime.timezone.utc).strftime('%a, %d %b %Y %H:%M:%S %z')
-    
-    last_build_date = SubElement(channel, 'lastBuildDate')
-    last_build_date.text = pub_date.text
-    
-    # Add items to channel
+    return FeedChannel(
+        title=f'{feed_title.title()} RSS Feed',
+        link=f'{rss_feed_link}/{feed_path or feed_title}',
+        description=f'Latest updates from {feed_title.title()} source'
+    )
+
+def iter_rss(items, feed_title, pretty=True, feed_path=None, channel=None, next_link=None):
+    """
+    Serialize RSS 2.0 XML in a single pass, yielding it chunk by chunk.
+
+    Args:
+        items (iterable): FeedItems (or legacy item dicts)
+        feed_title (str): Title of the RSS feed
+        pretty (bool): Indent the output; compact output has no insignificant whitespace
+        feed_path (str): Path of the feed below RSS_FEED_LINK, defaults to feed_title
+        channel (FeedChannel): Channel metadata, defaults to build_channel(feed_title, feed_path)
+        next_link (str): URL of the next page when the items are one page of the feed
+
+    Yields:
+        str: Consecutive fragments of the RSS document
+    """
+    if pretty:
+        i1, i2, i3, nl = '  ', '    ', '      ', '\n'
+    else:
+        i1 = i2 = i3 = nl = ''
+
+    if channel is None:
+        channel = build_channel(feed_title, feed_path)
+    build_date = format_rfc822(channel.build_date or datetime.datetime.now(datetime.timezone.utc))
+
+    yield ''.join((
+        XML_DECLARATION,
+        f'<rss version="2.0">{nl}',
+        f'{i1}<channel>{nl}',
+        _element('title', channel.title, i2, nl),
+        _element('link', channel.link, i2, nl),
+        _element('description', channel.description, i2, nl),
+        _element('pubDate', build_date, i2, nl),
+        _element('lastBuildDate', build_date, i2, nl)
+    ))
+
     for item in items:
-        item_elem = SubElement(channel, 'item')
-        
-        # Add title
-        item_title = SubElement(item_elem, 'title')
-        item_title.text = item.get('title', 'Untitled')
-        
-        # Add link
-        item_link = SubElement(item_elem, 'link')
-        item_link.text = item.get('link', '')
-        
-        # Add description
-        item_description = SubElement(item_elem, 'description')
-        item_description.text = item.get('description', '')
-        
-        # Add pubDate
-        if 'pub_date' in item:
-            item_pub_date = SubElement(item_elem, 'pubDate')
-            item_pub_date.text = item['pub_date']
-        
-        # Add guid
-        item_guid = SubElement(item_elem, 'guid')
-        item_guid.set('isPermaLink', 'true')
-        item_guid.text = item.get('link', f'urn:uuid:{datetime.datetime.now().timestamp()}')
-    
-    # Convert to pretty XML string with proper encoding
-    rough_string = tostring(rss, encoding='unicode')
-    # 手动添加XML声明
-    xml_declaration = '<?xml version="1.0" encoding="UTF-8" ?>\n'
-    
-    # 使用minidom美化XML
-    reparsed = minidom.parseString(rough_string.encode('utf-8'))
-    pretty_xml = reparsed.toprettyxml(indent='  ', encoding='utf-8').decode('utf-8')
-    
-    # 移除minidom自动添加的XML声明，使用我们自己的
-    if pretty_xml.startswith('<?xml'):
-        # 找到第一个换行符的位置
-        first_newline = pretty_xml.find('\n')
-        if first_newline != -1:
-            pretty_xml = xml_declaration + pretty_xml[first_newline+1:]
-    
-    return pretty_xml
\ No newline at end of file
+        if not isinstance(item, FeedItem):
+            item = FeedItem.from_dict(item)
+        parts = [
+            f'{i2}<item>{nl}',
+            _element('title', item.title, i3, nl),
+            _element('link', item.link, i3, nl),
+            _element('description', item.description, i3, nl)
+        ]
+        if item.author:
+            parts.append(_element('author', item.author, i3, nl))
+        for category in item.categories:
+            parts.append(_element('category', category, i3, nl))
+        enclosure = item.enclosure
+        if enclosure is not None:
+            parts.append(f'{i3}<enclosure url="{_escape(enclosure.url)}" length="{int(enclosure.length)}" '
+                         f'type="{_escape(enclosure.type)}"/>{nl}')
+        if item.pub_date is not None:
+            parts.append(_element('pubDate', format_rfc822(item.pub_date), i3, nl))
+        guid = item.guid or item.link or f'urn:uuid:{datetime.datetime.now().timestamp()}'
+        parts.append(_element('guid', guid, i3, nl, ' isPermaLink="true"'))
+        parts.append(f'{i2}</item>{nl}')
+        yield ''.join(parts)
+
+    # 下一页链接放在最后一个条目之后，与从缓存文档中截取窗口时的位置一致
+    yield f"{page_link(next_link, pretty) if next_link else ''}{i1}</channel>{nl}</rss>\n"
+
+def generate_rss(items, feed_title, pretty=True, feed_path=None, channel=None, next_link=None):
+    """
+    Generate RSS XML content from a list of items.
+
+    Args:
+        items (list): FeedItems (or legacy item dicts)
+        feed_title (str): Title of the RSS feed
+        pretty (bool): Indent the output (default) or write it compactly
+        feed_path (str): Path of the feed below RSS_FEED_LINK, defaults to feed_title
+        channel (FeedChannel): Channel metadata, defaults to build_channel(feed_title, feed_path)
+        next_link (str): URL of the next page when the items are one page of the feed
+
+    Returns:
+        str: Formatted RSS XML string
+    """
+    with time_stage('render'):
+        buffer = io.StringIO()
+        for chunk in iter_rss(items, feed_title, pretty=pretty, feed_path=feed_path, channel=channel,
+                              next_link=next_link):
+            buffer.write(chunk)
+        return buffer.getvalue()
@@ -0,0 +1,198 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.feed_cache import FeedCache
+from app.core.metrics import current_feed
+
+logger = logging.getLogger(__name__)
+
+
+class FeedScheduler:
+    """
+    Background pre-warming of every registered feed.
+
+    Each feed is refreshed ahead of its expiry, at an interval derived from
+    the spider's cache_ttl. Refreshes are jittered, run on a bounded thread
+    pool and populate both the upstream and the rendered feed caches, so
+    readers never wait on upstream work.
+    """
+
+    def __init__(self, app, feeds=None, max_workers=2, lead=0.2, jitter=0.1):
+        """
+        Initialize the scheduler.
+
+        Args:
+            app (Flask): Application providing the cache and config
+            feeds (list): Feed names to refresh, defaults to all of spider_registry
+            max_workers (int): Maximum number of concurrent refreshes
+            lead (float): Fraction of cache_ttl before expiry at which to refresh
+            jitter (float): Random fraction by which each interval is varied
+        """
+        self.app = app
+        self.feeds = feeds
+        self.max_workers = max_workers
+        self.lead = lead
+        self.jitter = jitter
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _feed_names(self):
+        from app.spiders.registry import spider_registry
+        return list(self.feeds) if self.feeds is not None else list(spider_registry)
+
+    def interval_for(self, spider):
+        """
+        Get the base refresh interval for a spider.
+
+        Args:
+            spider (BaseSpider): Spider instance
+
+        Returns:
+            float: Interval in seconds
+        """
+        return max(1.0, spider.cache_ttl * (1 - self.lead))
+
+    def _jittered(self, interval):
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def refresh(self, feed_name):
+        """
+        Refresh one feed's upstream content and rendered output.
+
+        Args:
+            feed_name (str): Feed name
+
+        Returns:
+            float: Base interval until the next refresh of this feed
+        """
+        # 预热产生的指标同样以该RSS源为标签
+        token = current_feed.set(feed_name)
+        try:
+            return self._refresh(feed_name)
+        finally:
+            current_feed.reset(token)
+
+    def _refresh(self, feed_name):
+        from app.spiders.registry import spider_registry
+
+        with self.app.app_context():
+            # 使用独立的爬虫实例，force_refresh不会影响请求使用的共享实例
+            spider = spider_registry.create(feed_name)
+            interval = self.interval_for(spider)
+            cache = self.app.config.get('CACHE_INSTANCE')
+            if cache is None:
+                return interval
+
+            feed_cache = FeedCache(cache)
+            # 多个工作进程都运行调度器时，只由一个进程执行刷新
+            with cache.lock(f'prewarm_{feed_name}', blocking=False) as acquired:
+                if not acquired:
+                    return interval
+
+                previous = feed_cache.get(feed_name)
+                if previous is not None and previous['fresh_until'] - time.time() > spider.cache_ttl - interval / 2:
+                    # 最近半个周期内已被其他进程刷新过
+                    return interval
+
+                spider.force_refresh = True
+                start = time.perf_counter()
+                entry = feed_cache.refresh(feed_name, spider, previous=previous)
+                logger.info(f"Pre-warmed {feed_name} in {time.perf_counter() - start:.2f}s"
+                            f"{'' if entry is not None else ' (no items)'}")
+        return interval
+
+    def _safe_refresh(self, feed_name):
+        try:
+            return self.refresh(feed_name)
+        except Exception as e:
+            logger.error(f"Error pre-warming {feed_name}: {e}", exc_info=True)
+            return None
+
+    def run_once(self):
+        """
+        Refresh every feed once, bounded by max_workers.
+
+        Returns:
+            dict: Mapping of feed name to its base refresh interval
+        """
+        feeds = self._feed_names()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='prewarm') as executor:
+            return dict(zip(feeds, executor.map(self._safe_refresh, feeds)))
+
+    def run_forever(self):
+        """
+        Keep every feed warm until stop() is called.
+        """
+        intervals = self.run_once()
+        now = time.monotonic()
+        # 以(下次刷新时间, 源名称)为元素的小顶堆
+        schedule = [(now + self._jittered(interval or 60), name) for name, interval in intervals.items()]
+        heapq.heapify(schedule)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='prewarm') as executor:
+            while schedule and not self._stop.is_set():
+                due, _ = schedule[0]
+                if self._stop.wait(max(0.0, due - time.monotonic())):
+                    break
+
+                batch = []
+                while schedule and schedule[0][0] <= time.monotonic():
+                    batch.append(heapq.heappop(schedule)[1])
+                for name, interval in zip(batch, executor.map(self._safe_refresh, batch)):
+                    # 刷新失败时一分钟后重试
+                    heapq.heappush(schedule, (time.monotonic() + self._jittered(interval or 60), name))
+
+    def start(self):
+        """
+        Run the scheduler in a daemon thread of the current process.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name='feed-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the scheduler thread.
+
+        Args:
+            timeout (float): Maximum time to wait for the thread to exit
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main():
+    """
+    Run the pre-warming scheduler as a standalone worker.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Keep RSS feeds warm in the shared cache.')
+    parser.add_argument('--once', action='store_true', help='refresh every feed once and exit')
+    parser.add_argument('--workers', type=int, default=None, help='maximum concurrent refreshes')
+    parser.add_argument('feeds', nargs='*', help='feeds to refresh (default: all)')
+    args = parser.parse_args()
+
+    from main import app
+
+    scheduler = FeedScheduler(
+        app,
+        feeds=args.feeds or None,
+        max_workers=args.workers or app.config.get('PREWARM_CONCURRENCY', 2),
+        jitter=app.config.get('PREWARM_JITTER', 0.1)
+    )
+    if args.once:
+        scheduler.run_once()
+    else:
+        scheduler.run_forever()
+
+
+if __name__ == '__main__':
+    main()
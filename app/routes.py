@@ -1,15 +1,54 @@
-from flask import Blueprint, render_template, jsonify
-from importlib import import_module
+from flask import Blueprint, render_template, jsonify, request, current_app, Response, stream_with_context
 import os
 import inspect
-from app.core.rss_generator import generate_rss
+from app.core.rss_generator import generate_rss, iter_rss
+from app.core.feed_cache import FeedCache, track_upstream_freshness
+from app.core.merge import PARTIAL_TTL, merge_items, fetch_all
+from app.core import feed_service
+from app.core.feed_service import FeedRequest
+from app.core.metrics import current_feed, render_metrics, time_stage
+from app.core.pagination import mark_items
+from app.core.rate_limit import UpstreamBusy
+from app.spiders.registry import spider_registry
 
 main = Blueprint('main', __name__)
 
-# 爬虫注册表 - 用于动态加载和管理所有爬虫
-spider_registry = {
-    'emagazine': 'app.spiders.emagazine.EMagazineSpider'
-}
+def load_spider(feed_name):
+    """
+    Get the spider registered for a feed.
+    
+    The spider class is resolved once and its instance is shared between
+    requests, since spiders hold no per-request state.
+    
+    Args:
+        feed_name (str): Feed name in spider_registry
+    
+    Returns:
+        BaseSpider: Spider instance
+    """
+    with time_stage('resolve'):
+        return spider_registry.get_spider(feed_name)
+
+def _feed_request():
+    """Get the parts of the current Flask request the serving decisions depend on."""
+    return FeedRequest(
+        client=request.remote_addr,
+        args=request.args.to_dict(),
+        base_url=request.base_url,
+        if_none_match=request.headers.get('If-None-Match'),
+        if_modified_since=request.headers.get('If-Modified-Since'),
+        method=request.method
+    )
+
+def _response(reply):
+    """Convert a FeedReply to a Flask response."""
+    return Response(reply.body, status=reply.status, headers=reply.headers)
+
+def _upstream_saturated():
+    """Check whether every upstream request slot of this process is taken."""
+    from app.core.http_client import get_http_client
+    
+    return get_http_client().in_flight.saturated()
 
 @main.route('/')
 def index():
@@ -18,27 +57,234 @@ def index():
     available_feeds = list(spider_registry.keys())
     return render_template('index.html', feeds=available_feeds)
 
+@main.route('/merge')
+@main.route('/merge/<bundle>')
+def get_merged_feed(bundle=None):
+    """合并多个RSS源：/merge?feeds=a,b,c 或预先配置的 /merge/<bundle>"""
+    if bundle is not None:
+        bundles = current_app.config.get('FEED_BUNDLES') or {}
+        if bundle not in bundles:
+            return jsonify({'error': f'Bundle "{bundle}" not found'}), 404
+        feed_names = bundles[bundle]
+        feed_title, feed_path = bundle, f'merge/{bundle}'
+    else:
+        feed_names = [name.strip() for name in request.args.get('feeds', '').split(',') if name.strip()]
+        feed_title, feed_path = 'merged', f'merge?feeds={",".join(feed_names)}'
+    
+    # 去重并保持顺序
+    feed_names = list(dict.fromkeys(feed_names))
+    if not feed_names:
+        return jsonify({'error': 'No feeds specified'}), 400
+    unknown = [name for name in feed_names if name not in spider_registry]
+    if unknown:
+        return jsonify({'error': f'Feed "{unknown[0]}" not found'}), 404
+    
+    max_items = current_app.config.get('MERGE_MAX_ITEMS', 100)
+    token = current_feed.set(f'merge/{bundle}' if bundle is not None else 'merge')
+    try:
+        feed_request = _feed_request()
+        rejected = feed_service.prepare(feed_request, current_app.config, max_limit=max_items)
+        if rejected is not None:
+            return _response(rejected)
+        with time_stage('total'):
+            return _serve_merged_feed(feed_names, feed_title, feed_path, max_items, feed_request)
+    finally:
+        current_feed.reset(token)
+
+def _serve_merged_feed(feed_names, feed_title, feed_path, max_items, feed_request):
+    """
+    Serve the merged feed of several registered feeds.
+    
+    The newest max_items items are merged and cached once; windows are cut
+    out of the cached document.
+    
+    Args:
+        feed_names (list): Feed names in spider_registry
+        feed_title (str): Title of the merged feed
+        feed_path (str): Path of the merged feed below RSS_FEED_LINK
+        max_items (int): Maximum number of items
+        feed_request (FeedRequest): Request, with the requested window of the merged feed
+    
+    Returns:
+        Response: RSS response
+    """
+    try:
+        spiders = [load_spider(name) for name in feed_names]
+        
+        cache = current_app.config.get('CACHE_INSTANCE')
+        if cache is None:
+            item_lists, _ = fetch_all(spiders)
+            items = merge_items(item_lists, max_items)
+            return _rss_response(items, feed_title, feed_request, feed_path=feed_path, ordered=True)
+        
+        feed_cache = FeedCache(cache)
+        # 标题和源的顺序都会影响输出，以路径区分缓存条目
+        cache_name = feed_path
+        entry = feed_cache.get(cache_name)
+        if not feed_cache.is_fresh(entry):
+            try:
+                with track_upstream_freshness() as freshness:
+                    item_lists, failed = fetch_all(spiders)
+            except UpstreamBusy as e:
+                return _response(feed_service.upstream_busy(entry, e, feed_request))
+            if failed and entry is not None:
+                # 部分源获取失败：继续返回之前的合并结果，不用不完整的结果覆盖它
+                return _response(feed_service.entry_reply(entry, feed_request))
+            items = merge_items(item_lists, max_items)
+            if items:
+                # 不完整的结果只短暂缓存，之后重新获取失败的源
+                ttl = PARTIAL_TTL if failed else min(spider.cache_ttl for spider in spiders)
+                ttl = freshness.ttl(ttl)
+                entry = feed_cache.store(cache_name, items, lambda: iter_rss(items, feed_title, feed_path=feed_path),
+                                         ttl, previous=entry)
+            elif entry is None:
+                return _rss_response([], feed_title, feed_path=feed_path)
+        
+        return _response(feed_service.entry_reply(entry, feed_request))
+    except UpstreamBusy as e:
+        return _response(feed_service.upstream_busy(None, e, feed_request))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @main.route('/<feed_name>')
 def get_feed(feed_name):
     """统一的RSS源路由，支持动态加载任意注册的爬虫"""
     if feed_name not in spider_registry:
         return jsonify({'error': f'Feed "{feed_name}" not found'}), 404
     
+    # 本次请求产生的各项指标都以该RSS源为标签
+    token = current_feed.set(feed_name)
+    try:
+        feed_request = _feed_request()
+        rejected = feed_service.prepare(feed_request, current_app.config)
+        if rejected is not None:
+            return _response(rejected)
+        with time_stage('total'):
+            return _serve_feed(feed_name, feed_request)
+    finally:
+        current_feed.reset(token)
+
+def _serve_feed(feed_name, feed_request):
+    """
+    Serve a registered feed from the rendered feed cache, refreshing it if needed.
+    
+    Windows are cut out of the cached document. Without a cached document to
+    cut from (no cache, or stream mode), the window is passed down to the
+    spider so it stops producing items once the window is complete.
+    
+    Args:
+        feed_name (str): Feed name in spider_registry
+        feed_request (FeedRequest): Request, with the requested window of the feed
+    
+    Returns:
+        Response: RSS response
+    """
+    window = feed_request.window
     try:
-        # 动态导入爬虫类
-        module_path, class_name = spider_registry[feed_name].rsplit('.', 1)
-        module = import_module(module_path)
-        SpiderClass = getattr(module, class_name)
+        spider = load_spider(feed_name)
+        
+        cache = current_app.config.get('CACHE_INSTANCE')
+        if cache is None:
+            if window is not None:
+                return _rss_response(spider.iter_items(), feed_name, feed_request)
+            items = spider.fetch_items()
+            return _response(feed_service.rss_reply(generate_rss(items, feed_name)))
         
-        # 实例化爬虫并获取内容
-        spider = SpiderClass()
-        items = spider.fetch_items()
-        rss_content = generate_rss(items, feed_name)
+        # 优先使用已渲染的RSS输出
+        feed_cache = FeedCache(cache)
+        entry = feed_cache.get(feed_name)
+        if not feed_cache.is_fresh(entry):
+            if current_app.config.get('STREAM_FEEDS'):
+                if entry is not None and _upstream_saturated():
+                    return _response(feed_service.upstream_busy(entry, None, feed_request))
+                if window is not None:
+                    # 只解析窗口内的条目，结果不完整，不写入缓存
+                    try:
+                        return _rss_response(spider.iter_items(), feed_name, feed_request)
+                    except UpstreamBusy as e:
+                        return _response(feed_service.upstream_busy(entry, e, feed_request))
+                return _stream_feed(spider, feed_name, feed_cache, entry)
+            
+            try:
+                refreshed = feed_cache.refresh(feed_name, spider, previous=entry)
+            except UpstreamBusy as e:
+                return _response(feed_service.upstream_busy(entry, e, feed_request))
+            if refreshed is not None:
+                entry = refreshed
+            elif entry is None:
+                # 获取失败时不缓存空结果，下次请求重新获取
+                return _response(feed_service.rss_reply(generate_rss([], feed_name)))
         
-        return rss_content, 200, {'Content-Type': 'application/rss+xml; charset=utf-8'}
+        return _response(feed_service.entry_reply(entry, feed_request))
+    except UpstreamBusy as e:
+        return _response(feed_service.upstream_busy(None, e, feed_request))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _stream_feed(spider, feed_name, feed_cache, previous):
+    """
+    Stream a feed to the client while items are produced by the spider.
+    
+    The channel header is sent immediately and each item is serialized as
+    soon as the spider yields it. The complete document is stored in the
+    rendered feed cache once the stream has finished.
+    
+    Args:
+        spider (BaseSpider): Spider instance
+        feed_name (str): Feed name
+        feed_cache (FeedCache): Rendered feed cache
+        previous (dict): Stale cached entry, if any
+    
+    Returns:
+        Response: Chunked RSS response
+    """
+    def generate():
+        items = []
+        chunks = []
+        busy = []
+        
+        def collect():
+            try:
+                for item in spider.iter_items():
+                    items.append(item)
+                    yield item
+            except UpstreamBusy:
+                # 响应头已经发出，结束输出且不写入缓存
+                busy.append(True)
+        
+        with track_upstream_freshness() as freshness:
+            for chunk in iter_rss(collect(), feed_name):
+                chunks.append(chunk)
+                yield chunk
+        
+        if items and not busy:
+            feed_cache.store(feed_name, items, lambda: chunks, freshness.ttl(spider.cache_ttl), previous=previous)
+    
+    return Response(stream_with_context(generate()), mimetype='application/rss+xml',
+                    headers={'Content-Type': 'application/rss+xml; charset=utf-8'})
+
+def _rss_response(items, feed_title, feed_request=None, feed_path=None, ordered=False):
+    """
+    Render items, or a window of them, without the rendered feed cache.
+    
+    Args:
+        items (iterable): FeedItems; consumed only until the window is complete
+        feed_title (str): Title of the feed
+        feed_request (FeedRequest): Request, with the requested window of the feed (optional)
+        feed_path (str): Path of the feed below RSS_FEED_LINK, defaults to feed_title
+        ordered (bool): Items are sorted newest first
+    
+    Returns:
+        Response: RSS response
+    """
+    next_link = None
+    if feed_request is not None and feed_request.window is not None:
+        items, cursor = feed_request.window.page(mark_items(items), ordered=ordered)
+        if cursor is not None:
+            next_link = feed_request.next_url(cursor)
+    xml = generate_rss(items, feed_title, feed_path=feed_path, next_link=next_link)
+    return _response(feed_service.rss_reply(xml, next_link))
+
 @main.route('/api/feeds')
 def list_feeds():
     """API端点：获取所有可用的RSS源列表"""
@@ -47,6 +293,29 @@ def list_feeds():
         'count': len(spider_registry)
     })
 
+@main.route('/api/stats')
+def stats():
+    """API端点：获取缓存和上游连接池的运行状态"""
+    from app.core.http_client import get_http_client
+    
+    cache = current_app.config.get('CACHE_INSTANCE')
+    return jsonify({
+        'cache': cache.get_stats() if cache is not None else None,
+        'http': get_http_client().get_stats()
+    })
+
+@main.route('/metrics')
+def metrics():
+    """Prometheus指标：各阶段耗时直方图、缓存和上游连接池状态"""
+    from app.core.http_client import get_http_client
+    
+    cache = current_app.config.get('CACHE_INSTANCE')
+    body = render_metrics(
+        cache_stats=cache.get_stats() if cache is not None else None,
+        http_stats=get_http_client().get_stats()
+    )
+    return Response(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @main.route('/health')
 def health_check():
     """健康检查端点"""
@@ -1,6 +1,11 @@
 # Spiders module for RSS Generator
 """Spider classes for fetching content from various sources."""
 
-from app.spiders.emagazine import EMagazineSpider
+__all__ = ['EMagazineSpider']
 
-__all__ = ['EMagazineSpider']
\ No newline at end of file
+def __getattr__(name):
+    # 延迟导入爬虫模块，启动时只加载实际被访问的爬虫
+    if name == 'EMagazineSpider':
+        from app.spiders.emagazine import EMagazineSpider
+        return EMagazineSpider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,274 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from app.core.rate_limit import UpstreamBusy
+from app.spiders.base_spider import BaseSpider
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    Per-host request rate limit shared by all threads and event loops.
+    """
+
+    def __init__(self, rate):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate (float): Maximum requests per second per host, 0 for unlimited
+        """
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url):
+        """
+        Reserve the next request slot for a URL's host.
+
+        Args:
+            url (str): Request URL
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        if not self.interval:
+            return 0.0
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        return slot - now
+
+    async def wait(self, url):
+        """
+        Wait until a request to the URL's host is allowed.
+
+        Args:
+            url (str): Request URL
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def gather_bounded(factories, limit):
+    """
+    Run coroutines with at most ``limit`` of them in flight.
+
+    Args:
+        factories (iterable): Zero-argument callables returning coroutines
+        limit (int): Maximum concurrency
+
+    Returns:
+        list: Results in input order; failed coroutines yield their exception
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(factory):
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(run(factory) for factory in factories), return_exceptions=True)
+
+
+def run_sync(coroutine):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Args:
+        coroutine (coroutine): Coroutine to run
+
+    Returns:
+        any: The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    # 已处于事件循环中（例如ASGI），在独立线程的新事件循环中运行
+    # 复制上下文变量，使线程中仍可访问Flask应用上下文、当前RSS源和上游新鲜度
+    context = contextvars.copy_context()
+    result = {}
+
+    def target():
+        try:
+            result['value'] = asyncio.run(coroutine)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=context.run, args=(target,))
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+class AsyncBaseSpider(BaseSpider):
+    """
+    Base class for spiders that fetch several pages concurrently.
+
+    Subclasses implement ``afetch_items``; the synchronous ``fetch_items``
+    runs it to completion so async spiders plug into the same routes as
+    sync ones. Upstream requests share BaseSpider's cache and pooled
+    client and are bounded by ``max_concurrency`` and ``host_rate_limit``.
+
+    ``afetch_url`` is a thread-pool wrapper around the blocking HTTP client:
+    each fetch occupies an executor thread (up to ``EXECUTOR_WORKERS``)
+    while it waits for upstream, not just an event loop slot.
+    """
+
+    # 同时进行的上游请求数量上限
+    max_concurrency = 8
+    # 每个主机每秒的请求数上限，0表示不限制
+    host_rate_limit = 0
+
+    _rate_limiters = {}
+    _rate_limiters_lock = threading.Lock()
+    # 阻塞的上游请求在独立线程池中运行，避免受默认线程池大小（与CPU数相关）的限制
+    _executor = None
+    _executor_lock = threading.Lock()
+    EXECUTOR_WORKERS = 64
+
+    @abstractmethod
+    async def afetch_items(self):
+        """
+        Fetch items from the source.
+        Must be implemented by subclasses.
+
+        Returns:
+            list: FeedItems
+        """
+        pass
+
+    def fetch_items(self):
+        """
+        Fetch items by running afetch_items to completion.
+
+        Returns:
+            list: FeedItems
+        """
+        return run_sync(self.afetch_items())
+
+    @property
+    def rate_limiter(self):
+        """
+        Rate limiter shared by every instance with the same host_rate_limit.
+        """
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(self.host_rate_limit)
+            if limiter is None:
+                limiter = self._rate_limiters[self.host_rate_limit] = HostRateLimiter(self.host_rate_limit)
+            return limiter
+
+    @classmethod
+    def _get_executor(cls):
+        with cls._executor_lock:
+            if AsyncBaseSpider._executor is None:
+                AsyncBaseSpider._executor = ThreadPoolExecutor(
+                    max_workers=cls.EXECUTOR_WORKERS, thread_name_prefix='async-spider'
+                )
+            return AsyncBaseSpider._executor
+
+    async def afetch_url(self, url, headers=None, use_cache=True):
+        """
+        Fetch URL content with caching support without blocking the event loop.
+
+        Args:
+            url (str): URL to fetch
+            headers (dict): Optional headers
+            use_cache (bool): Whether to use cache
+
+        Returns:
+            str: Response content
+        """
+        await self.rate_limiter.wait(url)
+        # 复制上下文变量，使线程中仍可访问Flask应用上下文
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), context.run, self.fetch_url, url, headers, use_cache
+        )
+
+    async def afetch_many(self, urls, headers=None, use_cache=True):
+        """
+        Fetch several URLs concurrently, at most max_concurrency at a time.
+
+        Args:
+            urls (list): URLs to fetch
+            headers (dict): Optional headers
+            use_cache (bool): Whether to use cache
+
+        Returns:
+            list: Response contents in input order, None for failed fetches
+
+        Raises:
+            UpstreamBusy: If a fetch could not start because upstream capacity
+                was exhausted, so a partial result is not cached as a full feed
+        """
+        urls = list(urls)
+        results = await gather_bounded(
+            [lambda url=url: self.afetch_url(url, headers, use_cache) for url in urls],
+            self.max_concurrency
+        )
+        contents = []
+        for url, result in zip(urls, results):
+            if isinstance(result, UpstreamBusy):
+                raise result
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching {url}: {result}")
+                contents.append(None)
+            else:
+                contents.append(result)
+        return contents
+
+
+class SyncSpiderAdapter:
+    """
+    Expose a synchronous spider through the async spider interface.
+    """
+
+    def __init__(self, spider):
+        """
+        Wrap a spider.
+
+        Args:
+            spider (BaseSpider): Synchronous spider
+        """
+        self.spider = spider
+
+    def __getattr__(self, name):
+        return getattr(self.spider, name)
+
+    async def afetch_items(self):
+        """
+        Fetch items in a worker thread.
+
+        Returns:
+            list: List of items
+        """
+        return await asyncio.to_thread(self.spider.fetch_items)
+
+
+def as_async(spider):
+    """
+    Get an object with ``afetch_items`` for any spider.
+
+    Args:
+        spider (BaseSpider): Sync or async spider
+
+    Returns:
+        AsyncBaseSpider | SyncSpiderAdapter: Async-capable spider
+    """
+    if isinstance(spider, AsyncBaseSpider):
+        return spider
+    return SyncSpiderAdapter(spider)
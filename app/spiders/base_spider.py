@@ -1,7 +1,18 @@
 from abc import ABC, abstractmethod
-import requests
-from bs4 import BeautifulSoup
+import contextvars
+import hashlib
+import logging
+import threading
+import time
 from flask import current_app
+from app.core.dates import parse_datetime
+from app.core.feed_cache import note_upstream_freshness
+from app.core.http_client import get_http_client
+from app.core.metrics import observe_upstream, time_stage
+from app.core.models import FeedItem, deserialize_items
+from app.core.rate_limit import UpstreamBusy
+
+logger = logging.getLogger(__name__)
 
 class BaseSpider(ABC):
     """
@@ -9,16 +20,26 @@ class BaseSpider(ABC):
     Provides common functionality for fetching and parsing content.
     """
     
-    def __init__(self, name=None, cache_ttl=3600):
+    # 本进程中正在后台刷新的缓存键，每个键同时只启动一个刷新线程
+    _refreshing = set()
+    _refreshing_lock = threading.Lock()
+    
+    def __init__(self, name=None, cache_ttl=3600, stale_ttl=86400, lock_timeout=60):
         """
         Initialize the spider.
         
         Args:
             name (str): Name of the spider
             cache_ttl (int): Cache time-to-live in seconds
+            stale_ttl (int): How long expired content may still be served while it is refreshed
+            lock_timeout (int): Maximum time to wait for a concurrent fetch of the same URL
         """
         self.name = name or self.__class__.__name__
         self.cache_ttl = cache_ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        # 为True时忽略未过期的缓存，重新从上游获取（用于预热）
+        self.force_refresh = False
     
     @abstractmethod
     def fetch_items(self):
@@ -27,14 +48,31 @@ class BaseSpider(ABC):
         Must be implemented by subclasses.
         
         Returns:
-            list: List of items with title, link, description, pub_date
+            list: FeedItems
         """
         pass
     
+    def iter_items(self):
+        """
+        Iterate over items from the source.
+        Spiders that can parse incrementally should override this so items
+        are yielded as soon as they are available.
+        
+        Yields:
+            FeedItem: Items
+        """
+        yield from self.fetch_items()
+    
     def fetch_url(self, url, headers=None, use_cache=True):
         """
         Fetch URL content with caching support.
         
+        Cached content is fresh for cache_ttl seconds. After that it is still
+        served for stale_ttl seconds while a single background refresh runs.
+        Concurrent misses for the same URL wait for one upstream request
+        instead of each fetching it. Refreshes are conditional requests using
+        the upstream ETag/Last-Modified, so an unchanged page costs a 304.
+        
         Args:
             url (str): URL to fetch
             headers (dict): Optional headers
@@ -43,39 +81,267 @@ class BaseSpider(ABC):
         Returns:
             str: Response content
         """
+        with time_stage('fetch'):
+            return self._fetch_url(url, headers, use_cache)
+    
+    def _fetch_url(self, url, headers=None, use_cache=True):
+        cache = self._get_cache() if use_cache else None
+        if cache is None:
+            return self._download(url, headers)
+        
         cache_key = f'url_{url}'
         
         # Try to get from cache first
-        if use_cache:
-            # 从Flask应用的缓存中获取
+        entry = self._get_cached_entry(cache, cache_key)
+        if entry is not None and not self.force_refresh:
+            if time.time() >= entry['fresh_until']:
+                # 已过期但仍可使用：立即返回旧内容，并在后台刷新
+                self._refresh_in_background(cache, cache_key, url, headers)
+            # 由此渲染的RSS不应比上游内容更晚过期
+            note_upstream_freshness(entry['fresh_until'])
+            return entry['content']
+        
+        # 缓存未命中：同一时间只有一个请求访问上游，其余请求等待其结果
+        with cache.lock(cache_key, timeout=self.lock_timeout):
+            current = self._get_cached_entry(cache, cache_key)
+            if current is not None and not self.force_refresh:
+                note_upstream_freshness(current['fresh_until'])
+                return current['content']
+            return self._revalidate(cache, cache_key, url, headers, current or entry)
+    
+    def iter_parsed(self, content, parse):
+        """
+        Parse upstream content through the parsed-item cache.
+        
+        The parsed items are cached per spider together with a hash of the
+        content they were parsed from. Unchanged content is not parsed
+        again; changed content is parsed with the previous items available,
+        so the parser only has to build items for entries it has not seen.
+        
+        Args:
+            content (str): Upstream content
+            parse (callable): parse(content, known) yielding (entry_key, item)
+                pairs. ``known`` maps the entry keys of the previous parse to
+                their items; entries whose key is in it may reuse that item.
+                Entries without a stable key use None.
+        
+        Yields:
+            FeedItem: Parsed items
+        """
+        cache = self._get_cache()
+        if cache is None:
+            with time_stage('parse'):
+                for _, item in parse(content, {}):
+                    yield item
+            return
+        
+        cache_key = f'items_{self.name}'
+        content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        try:
+            previous = cache.get(cache_key)
+        except Exception:
+            previous = None
+        
+        previous_items = None
+        if isinstance(previous, dict):
+            try:
+                previous_items = deserialize_items(previous['items'])
+            except (KeyError, TypeError, ValueError):
+                # 旧格式的缓存条目，重新解析
+                previous = None
+        
+        if previous is not None and previous.get('content_hash') == content_hash:
+            # 上游内容未变化，直接使用上次的解析结果
+            yield from previous_items
+            return
+        
+        known = {}
+        if previous is not None:
+            known = {key: item for key, item in zip(previous['keys'], previous_items) if key is not None}
+        
+        keys = []
+        rows = []
+        with time_stage('parse'):
+            for key, item in parse(content, known):
+                item = FeedItem.coerce(item)
+                keys.append(key)
+                rows.append(item.to_row())
+                yield item
+        
+        # 只有完整解析后才写入缓存
+        try:
+            cache.set(cache_key, {'content_hash': content_hash, 'keys': keys, 'items': rows},
+                      self.cache_ttl + self.stale_ttl)
+        except Exception:
+            # 如果缓存不可用，忽略错误
+            pass
+    
+    def _get_cache(self):
+        """
+        Get the application cache instance, if available.
+        
+        Returns:
+            Cache: Cache instance or None
+        """
+        config = self._get_config()
+        # 如果不在应用上下文中，缓存不可用
+        return config.get('CACHE_INSTANCE') if config is not None else None
+    
+    def _get_config(self):
+        """
+        Get the application config, if available.
+        
+        Returns:
+            Config: Flask config or None
+        """
+        try:
+            return current_app.config
+        except Exception:
+            return None
+    
+    def _get_cached_entry(self, cache, cache_key):
+        try:
+            entry = cache.get(cache_key)
+        except Exception:
+            # 如果缓存不可用，继续正常获取
+            return None
+        if isinstance(entry, dict) and 'content' in entry:
+            return entry
+        return None
+    
+    def _store(self, cache, cache_key, content, etag=None, last_modified=None):
+        entry = {
+            'content': content,
+            'fresh_until': time.time() + self.cache_ttl,
+            'etag': etag,
+            'last_modified': last_modified
+        }
+        try:
+            # 缓存条目在过期后继续保留stale_ttl秒，期间可作为旧内容返回
+            cache.set(cache_key, entry, self.cache_ttl + self.stale_ttl)
+        except Exception:
+            # 如果缓存不可用，忽略错误
+            pass
+    
+    def _revalidate(self, cache, cache_key, url, headers, previous=None):
+        """
+        Fetch a URL, conditionally if a previous copy is cached, and store it.
+        
+        Args:
+            cache (Cache): Cache instance
+            cache_key (str): Cache key of the URL
+            url (str): URL to fetch
+            headers (dict): Optional headers
+            previous (dict): Previously cached entry, if any
+        
+        Returns:
+            str: Response content
+        """
+        validators = {}
+        if previous is not None:
+            if previous.get('etag'):
+                validators['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                validators['If-Modified-Since'] = previous['last_modified']
+        
+        response = self._request(url, headers, validators)
+        if response.status_code == 304 and validators:
+            # 上游内容未变化，只延长缓存有效期
+            content = previous['content']
+            etag = response.headers.get('ETag') or previous.get('etag')
+            last_modified = response.headers.get('Last-Modified') or previous.get('last_modified')
+        else:
+            response.raise_for_status()
+            content = response.text
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        
+        self._store(cache, cache_key, content, etag, last_modified)
+        return content
+    
+    def _refresh_in_background(self, cache, cache_key, url, headers):
+        """
+        Start a background refresh unless one is already running for this key.
+        
+        At most one thread per key is started in this process; the cache lock
+        keeps other processes from refreshing the same key at the same time.
+        """
+        with self._refreshing_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        
+        def refresh():
             try:
-                cached_content = current_app.config.get('CACHE_INSTANCE').get(cache_key)
-                if cached_content:
-                    return cached_content
+                with cache.lock(cache_key, blocking=False) as acquired:
+                    if not acquired:
+                        return
+                    entry = self._get_cached_entry(cache, cache_key)
+                    if entry is not None and time.time() < entry['fresh_until']:
+                        # 其他进程已经完成刷新
+                        return
+                    self._revalidate(cache, cache_key, url, headers, entry)
             except Exception as e:
-                # 如果缓存不可用，继续正常获取
-                pass
+                logger.warning(f"Error refreshing {url}: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(cache_key)
         
+        # 复制上下文变量，使后台线程中仍可访问Flask应用上下文（缓存和HTTP客户端配置）
+        context = contextvars.copy_context()
+        try:
+            threading.Thread(target=context.run, args=(refresh,), name=f'refresh-{self.name}', daemon=True).start()
+        except Exception:
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+            raise
+    
+    def _request(self, url, headers=None, extra_headers=None):
+        """
+        Issue a GET request to the upstream server.
+        
+        Args:
+            url (str): URL to fetch
+            headers (dict): Optional headers
+            extra_headers (dict): Headers added on top of the defaults (optional)
+        
+        Returns:
+            requests.Response: Upstream response
+        """
         # Default headers
         if headers is None:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
+        if extra_headers:
+            headers = {**headers, **extra_headers}
         
-        # Fetch content
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        content = response.text
+        start = time.perf_counter()
+        try:
+            response = get_http_client().get(url, headers=headers)
+        except UpstreamBusy:
+            # 请求没有发出，不计入上游指标
+            raise
+        except Exception:
+            observe_upstream('error', 0, time.perf_counter() - start)
+            raise
+        observe_upstream(response.status_code, len(response.content), time.perf_counter() - start)
+        return response
+    
+    def _download(self, url, headers=None):
+        """
+        Fetch URL content from the upstream server.
         
-        # Cache the result
-        if use_cache:
-            try:
-                current_app.config.get('CACHE_INSTANCE').set(cache_key, content, self.cache_ttl)
-            except Exception as e:
-                # 如果缓存不可用，忽略错误
-                pass
+        Args:
+            url (str): URL to fetch
+            headers (dict): Optional headers
         
-        return content
+        Returns:
+            str: Response content
+        """
+        response = self._request(url, headers)
+        response.raise_for_status()
+        return response.text
     
     def parse_html(self, html_content):
         """
@@ -87,27 +353,27 @@ class BaseSpider(ABC):
         Returns:
             BeautifulSoup: Parsed HTML object
         """
+        # 只有解析HTML的爬虫才需要BeautifulSoup，首次使用时再导入
+        from bs4 import BeautifulSoup
         return BeautifulSoup(html_content, 'html.parser')
     
-    def create_item(self, title, link, description='', pub_date=None):
+    def create_item(self, title, link, description='', pub_date=None, **extra):
         """
-        Create a standard item dictionary.
+        Create a standard feed item.
         
         Args:
             title (str): Item title
             link (str): Item link
             description (str): Item description
-            pub_date (str): Item publication date in RSS format
+            pub_date (datetime|str): Item publication date, a datetime or an RFC 822 string
+            **extra: Optional guid, author, categories and enclosure
         
         Returns:
-            dict: Item dictionary
+            FeedItem: Item
         """
-        return {
-            'title': title,
-            'link': link,
-            'description': description,
-            'pub_date': pub_date
-        }
+        if 'categories' in extra:
+            extra['categories'] = tuple(extra['categories'] or ())
+        return FeedItem(title, link, description, parse_datetime(pub_date), **extra)
     
     def clean_text(self, text):
         """
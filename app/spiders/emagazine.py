@@ -1,17 +1,38 @@
+import os
+
 from app.spiders.base_spider import BaseSpider
-from datetime import datetime
+from app.core.dates import EPOCH, normalize_date
+from app.core.models import Enclosure
+from app.core.rate_limit import UpstreamBusy
 import xml.etree.ElementTree as ET
 
+# OPDS/Atom中使用的限定标签名
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+ATOM_ENTRY = f'{ATOM_NS}entry'
+ATOM_TITLE = f'{ATOM_NS}title'
+ATOM_LINK = f'{ATOM_NS}link'
+ATOM_ID = f'{ATOM_NS}id'
+ATOM_UPDATED = f'{ATOM_NS}updated'
+ATOM_AUTHOR = f'{ATOM_NS}author'
+ATOM_PUBLISHER = f'{ATOM_NS}publisher'
+ATOM_NAME = f'{ATOM_NS}name'
+ATOM_SUMMARY = f'{ATOM_NS}summary'
+OPDS_ACQUISITION = 'http://opds-spec.org/acquisition'
+
 class EMagazineSpider(BaseSpider):
     """
     Spider for electronic magazine content from OPDS feed.
     Fetches and parses magazine data from https://emagazine.link/opds/new
     """
     
+    # 增量解析时每次送入解析器的字符数
+    PARSE_CHUNK_SIZE = 64 * 1024
+    
     def __init__(self):
         # 设置较长的缓存时间，OPDS源通常更新不频繁
         super().__init__(name='emagazine', cache_ttl=7200)
-        self.opds_url = 'https://emagazine.link/opds/new'
+        # 可通过环境变量指向其他OPDS目录，例如基准测试使用的本地服务
+        self.opds_url = os.environ.get('EMAGAZINE_OPDS_URL', 'https://emagazine.link/opds/new')
     
     def fetch_items(self):
         """
@@ -20,18 +41,28 @@ class EMagazineSpider(BaseSpider):
         Returns:
             list: List of magazine items
         """
+        return list(self.iter_items())
+    
+    def iter_items(self):
+        """
+        Iterate over items from the OPDS feed as they are parsed.
+        
+        Yields:
+            FeedItem: Magazine items
+        """
         try:
             # 获取OPDS XML数据
             opds_content = self.fetch_url(self.opds_url)
-            
-            # 解析OPDS XML
-            items = self._parse_opds_feed(opds_content)
-            
-            return items
+        except UpstreamBusy:
+            # 上游请求已满，由调用方返回旧内容或503
+            raise
         except Exception as e:
-            # 发生错误时返回空列表
+            # 发生错误时不返回任何条目
             print(f"Error fetching OPDS feed: {e}")
-            return []
+            return
+        
+        # 解析OPDS XML，内容未变化时使用缓存的解析结果
+        yield from self.iter_parsed(opds_content, self._iter_opds_entries)
     
     def _parse_opds_feed(self, xml_content):
         """
@@ -41,143 +72,170 @@ class EMagazineSpider(BaseSpider):
             xml_content (str): OPDS XML content
             
         Returns:
-            list: List of parsed magazine items
+            list: Parsed magazine items (FeedItems)
         """
-        items = []
-        
-        # 定义OPDS命名空间
-        namespaces = {
-            'atom': 'http://www.w3.org/2005/Atom',
-            'dc': 'http://purl.org/dc/terms/',
-            'dcterms': 'http://purl.org/dc/terms/'
-        }
+        return list(self._iter_opds_feed(xml_content))
+    
+    def _iter_opds_feed(self, xml_content):
+        """
+        Parse OPDS XML feed incrementally, yielding magazine items one entry at a time.
         
-        try:
-            # 解析XML
-            root = ET.fromstring(xml_content)
+        Args:
+            xml_content (str|bytes|iterable): OPDS XML content, or an iterable of chunks
             
-            # 获取所有entry元素
-            entries = root.findall('.//atom:entry', namespaces)
+        Yields:
+            FeedItem: Parsed magazine items
+        """
+        for _, item in self._iter_opds_entries(xml_content):
+            yield item
+    
+    def _iter_opds_entries(self, xml_content, known=None):
+        """
+        Parse OPDS XML feed incrementally, yielding each entry's key and item.
+        
+        Entries are extracted in a single pass over their children and removed
+        from the tree once processed, so memory stays constant for large catalogs.
+        Entries are keyed by their id and updated timestamp; an entry whose key
+        is in ``known`` reuses that item instead of being parsed again.
+        
+        Args:
+            xml_content (str|bytes|iterable): OPDS XML content, or an iterable of chunks
+            known (dict): Items of a previous parse by entry key (optional)
             
-            for entry in entries:
-                # 提取标题
-                title_elem = entry.find('./atom:title', namespaces)
-                title = title_elem.text if title_elem is not None else 'Unknown Title'
-                
-                    # 首先尝试获取acquisition类型的链接
-                link = ''
-                acquisition_links = entry.findall('./atom:link', namespaces)
-                
-                # 先寻找包含/epub/的链接
-                epub_link = None
-                for a_link in acquisition_links:
-                    if a_link.get('rel') == 'http://opds-spec.org/acquisition':
-                        href = a_link.get('href')
-                        if href and '/epub/' in href:
-                            epub_link = href
-                            break
-                
-                # 如果找到epub链接，使用它
-                if epub_link:
-                    href = epub_link
-                else:
-                    # 否则使用第一个acquisition链接
-                    href = None
-                    for a_link in acquisition_links:
-                        if a_link.get('rel') == 'http://opds-spec.org/acquisition':
-                            href = a_link.get('href')
-                            if href:
-                                break
-                
-                # 处理找到的链接
-                if href:
-                    # 拼接完整的URL
-                    if not href.startswith(('http://', 'https://')):
-                        if href.startswith('/'):
-                            link = f'https://emagazine.link{href}'
-                        else:
-                            link = f'https://emagazine.link/{href}'
+        Yields:
+            tuple: (entry key or None, parsed magazine item)
+        """
+        if isinstance(xml_content, (str, bytes)):
+            chunks = (xml_content[i:i + self.PARSE_CHUNK_SIZE]
+                      for i in range(0, len(xml_content), self.PARSE_CHUNK_SIZE))
+        else:
+            chunks = xml_content
+        
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        # 记录当前元素的祖先链，用于在处理完entry后将其从父元素中移除
+        stack = []
+        # 条目没有可解析的更新时间时，使用整个源的更新时间
+        feed_updated = EPOCH
+        
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+                for event, elem in parser.read_events():
+                    if event == 'start':
+                        stack.append(elem)
+                        continue
+                    
+                    stack.pop()
+                    if elem.tag != ATOM_ENTRY:
+                        if elem.tag == ATOM_UPDATED and len(stack) == 1:
+                            feed_updated = normalize_date(elem.text, EPOCH)
+                        continue
+                    
+                    entry_id = elem.findtext(ATOM_ID)
+                    updated = elem.findtext(ATOM_UPDATED)
+                    # 没有id或更新时间的条目无法判断是否变化，每次都重新解析
+                    key = f'{entry_id}|{updated}' if entry_id and updated else None
+                    item = known.get(key) if known and key is not None else None
+                    yield key, item if item is not None else self._parse_opds_entry(elem, feed_updated)
+                    
+                    # 释放已处理的entry
+                    if stack:
+                        stack[-1].remove(elem)
                     else:
-                        link = href
-                
-                # 如果没有找到acquisition链接，使用id作为备选
-                if not link:
-                    id_elem = entry.find('./atom:id', namespaces)
-                    if id_elem is not None:
-                        link = id_elem.text
-                
-                # 提取更新时间
-                updated_elem = entry.find('./atom:updated', namespaces)
-                pub_date = self._parse_opds_date(updated_elem.text) if updated_elem is not None else datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
-                
-                # 提取作者信息
-                author_elem = entry.find('./atom:author/atom:name', namespaces)
-                author = author_elem.text if author_elem is not None else ''
-                
-                # 提取出版社信息
-                publisher_elem = entry.find('./atom:publisher/atom:name', namespaces)
-                publisher = publisher_elem.text if publisher_elem is not None else ''
-                
-                # 提取摘要
-                summary_elem = entry.find('./atom:summary', namespaces)
-                summary = summary_elem.text if summary_elem is not None else ''
-                
-                # 构建描述信息
-                description_parts = []
-                if author:
-                    description_parts.append(f'作者: {author}')
-                if publisher:
-                    description_parts.append(f'出版社: {publisher}')
-                if summary:
-                    description_parts.append(f'内容: {summary}')
-                
-                description = '<br>'.join(description_parts) if description_parts else '电子杂志'
-                
-                # 创建RSS项目
-                items.append(self.create_item(
-                    title=title,
-                    link=link,
-                    description=description,
-                    pub_date=pub_date
-                ))
+                        elem.clear()
+            parser.close()
         
         except ET.ParseError as e:
             print(f"XML parsing error: {e}")
         except Exception as e:
             print(f"Error parsing OPDS feed: {e}")
-        
-        return items
     
-    def _parse_opds_date(self, date_str):
+    def _parse_opds_entry(self, entry, fallback_date=EPOCH):
         """
-        Parse date string from OPDS feed (ISO 8601 format).
+        Extract magazine information from a single OPDS entry element.
         
         Args:
-            date_str (str): ISO 8601 date string
+            entry (Element): Atom entry element
+            fallback_date (datetime): Publication date used when the entry has no valid updated time
             
         Returns:
-            str: Formatted date string in RSS format
+            FeedItem: Parsed magazine item
         """
-        try:
-            # OPDS使用ISO 8601格式，例如：2025-11-01T23:16:11+00:00
-            # 移除时区部分的冒号以兼容strptime
-            if ':' in date_str[-6:] and date_str[-3] == ':':
-                date_str = date_str[:-3] + date_str[-2:]
-            
-            # 尝试不同的ISO 8601格式
-            formats = ['%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%SZ']
-            
-            for fmt in formats:
-                try:
-                    date_obj = datetime.strptime(date_str, fmt)
-                    # 转换为RSS格式
-                    return date_obj.strftime('%a, %d %b %Y %H:%M:%S %z')
-                except ValueError:
-                    continue
-            
-            # 如果所有格式都失败，返回当前时间
-            return datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
-            
-        except Exception:
-            # 发生任何错误时返回当前时间
-            return datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
\ No newline at end of file
+        # 与find()语义一致，每个字段只取第一个匹配的元素
+        fields = {}
+        # 优先使用包含/epub/的acquisition链接，否则使用第一个acquisition链接
+        epub_link = None
+        first_link = None
+        
+        for child in entry:
+            tag = child.tag
+            if tag == ATOM_LINK:
+                if child.get('rel') == OPDS_ACQUISITION:
+                    href = child.get('href')
+                    if href:
+                        if first_link is None:
+                            first_link = child
+                        if epub_link is None and '/epub/' in href:
+                            epub_link = child
+            elif tag == ATOM_AUTHOR or tag == ATOM_PUBLISHER:
+                if tag not in fields:
+                    name_elem = child.find(ATOM_NAME)
+                    if name_elem is not None:
+                        fields[tag] = name_elem
+            elif tag not in fields:
+                fields[tag] = child
+        
+        title_elem = fields.get(ATOM_TITLE)
+        title = title_elem.text if title_elem is not None else 'Unknown Title'
+        author_elem = fields.get(ATOM_AUTHOR)
+        author = author_elem.text if author_elem is not None else ''
+        publisher_elem = fields.get(ATOM_PUBLISHER)
+        publisher = publisher_elem.text if publisher_elem is not None else ''
+        summary_elem = fields.get(ATOM_SUMMARY)
+        summary = summary_elem.text if summary_elem is not None else ''
+        
+        link = ''
+        enclosure = None
+        acquisition = epub_link if epub_link is not None else first_link
+        if acquisition is not None:
+            href = acquisition.get('href')
+            # 拼接完整的URL
+            if not href.startswith(('http://', 'https://')):
+                if href.startswith('/'):
+                    link = f'https://emagazine.link{href}'
+                else:
+                    link = f'https://emagazine.link/{href}'
+            else:
+                link = href
+            enclosure = Enclosure(link, acquisition.get('type') or 'application/octet-stream')
+        
+        # 如果没有找到acquisition链接，使用id作为备选
+        if not link:
+            id_elem = fields.get(ATOM_ID)
+            if id_elem is not None:
+                link = id_elem.text
+        
+        # 提取更新时间
+        updated_elem = fields.get(ATOM_UPDATED)
+        pub_date = normalize_date(updated_elem.text, fallback_date) if updated_elem is not None else fallback_date
+        
+        # 构建描述信息
+        description_parts = []
+        if author:
+            description_parts.append(f'作者: {author}')
+        if publisher:
+            description_parts.append(f'出版社: {publisher}')
+        if summary:
+            description_parts.append(f'内容: {summary}')
+        
+        description = '<br>'.join(description_parts) if description_parts else '电子杂志'
+        
+        # 创建RSS项目
+        return self.create_item(
+            title=title,
+            link=link,
+            description=description,
+            pub_date=pub_date,
+            author=author or None,
+            enclosure=enclosure
+        )
@@ -0,0 +1,162 @@
+import threading
+from collections.abc import Mapping
+from importlib import import_module
+
+# 第三方爬虫可以通过该入口点组注册，例如在pyproject.toml中：
+# [project.entry-points."rsshub.spiders"]
+# mysource = "mypackage.spiders:MySourceSpider"
+ENTRY_POINT_GROUP = 'rsshub.spiders'
+
+
+class SpiderRegistry(Mapping):
+    """
+    Registry mapping feed names to spider classes.
+
+    Spiders are registered by dotted path, by class (for example through
+    the ``register_spider`` decorator) or through the ``rsshub.spiders``
+    entry point group. Modules are imported only when a feed is first
+    requested; each class is resolved once and its instance is reused.
+    """
+
+    def __init__(self, spiders=None, entry_point_group=ENTRY_POINT_GROUP):
+        """
+        Initialize the registry.
+
+        Args:
+            spiders (dict): Initial mapping of feed name to dotted class path or class
+            entry_point_group (str): Entry point group to discover spiders from, None to disable
+        """
+        self._targets = {}
+        self._classes = {}
+        self._instances = {}
+        self._lock = threading.RLock()
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = entry_point_group is None
+        for name, target in (spiders or {}).items():
+            self.register(name, target)
+
+    def _load_entry_points(self):
+        if self._entry_points_loaded:
+            return
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            from importlib.metadata import entry_points
+
+            for entry_point in entry_points(group=self._entry_point_group):
+                # 内置爬虫优先，不允许被同名入口点覆盖
+                self._targets.setdefault(entry_point.name, entry_point)
+
+    def register(self, name, target):
+        """
+        Register a spider for a feed name.
+
+        Args:
+            name (str): Feed name
+            target (str|type): Dotted path "package.module.ClassName" or spider class
+        """
+        with self._lock:
+            self._targets[name] = target
+            self._classes.pop(name, None)
+            self._instances.pop(name, None)
+            if isinstance(target, type):
+                self._classes[name] = target
+
+    def spider(self, name):
+        """
+        Class decorator registering a spider under a feed name.
+
+        Args:
+            name (str): Feed name
+
+        Returns:
+            callable: Decorator returning the class unchanged
+        """
+        def decorator(cls):
+            self.register(name, cls)
+            return cls
+        return decorator
+
+    def __getitem__(self, name):
+        self._load_entry_points()
+        return self._targets[name]
+
+    def __iter__(self):
+        self._load_entry_points()
+        return iter(list(self._targets))
+
+    def __len__(self):
+        self._load_entry_points()
+        return len(self._targets)
+
+    def __contains__(self, name):
+        if name in self._targets:
+            return True
+        self._load_entry_points()
+        return name in self._targets
+
+    def get_class(self, name):
+        """
+        Resolve the spider class for a feed, importing its module on first use.
+
+        Args:
+            name (str): Feed name
+
+        Returns:
+            type: Spider class
+        """
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        with self._lock:
+            cls = self._classes.get(name)
+            if cls is None:
+                target = self[name]
+                if isinstance(target, str):
+                    module_path, class_name = target.rsplit('.', 1)
+                    cls = getattr(import_module(module_path), class_name)
+                else:
+                    # importlib.metadata.EntryPoint
+                    cls = target.load()
+                self._classes[name] = cls
+            return cls
+
+    def create(self, name):
+        """
+        Create a new, private spider instance for a feed.
+
+        Args:
+            name (str): Feed name
+
+        Returns:
+            BaseSpider: Spider instance
+        """
+        return self.get_class(name)()
+
+    def get_spider(self, name):
+        """
+        Get the shared spider instance for a feed.
+
+        Args:
+            name (str): Feed name
+
+        Returns:
+            BaseSpider: Spider instance
+        """
+        spider = self._instances.get(name)
+        if spider is not None:
+            return spider
+        with self._lock:
+            spider = self._instances.get(name)
+            if spider is None:
+                spider = self._instances[name] = self.create(name)
+            return spider
+
+
+# 爬虫注册表 - 用于动态加载和管理所有爬虫
+spider_registry = SpiderRegistry({
+    'emagazine': 'app.spiders.emagazine.EMagazineSpider'
+})
+
+register_spider = spider_registry.spider
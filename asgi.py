@@ -0,0 +1,188 @@
+"""
+ASGI entry point.
+
+    uvicorn asgi:app
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py
+
+Feed requests are served on the event loop with the same decisions as the
+Flask routes: cache reads and writes run in worker threads, and concurrent
+requests for a stale feed share one refresh, during
+which async spiders run on the loop and sync spiders in a worker thread.
+Every other route is delegated to the Flask application.
+
+Requires the optional asgiref and uvicorn packages.
+"""
+import asyncio
+from urllib.parse import parse_qsl
+
+from werkzeug.exceptions import HTTPException
+from werkzeug.sansio.utils import get_current_url, get_host
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    raise RuntimeError('The asgiref package is required for the ASGI mode (pip install asgiref uvicorn)')
+
+from app.core import feed_service
+from app.core.feed_cache import FeedCache, track_upstream_freshness
+from app.core.feed_service import FeedRequest
+from app.core.metrics import current_feed, time_stage
+from app.core.rate_limit import UpstreamBusy
+from app.core.rss_generator import generate_rss, iter_rss
+from app.routes import load_spider
+from app.spiders.async_spider import as_async
+from app.spiders.registry import spider_registry
+from main import app as flask_app
+
+
+class FeedApplication:
+    """
+    ASGI application serving feeds natively and everything else through Flask.
+    """
+
+    def __init__(self, flask_app):
+        """
+        Wrap a Flask application.
+
+        Args:
+            flask_app (Flask): Application providing the routes, cache and config
+        """
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.url_map = flask_app.url_map.bind('localhost')
+        # 源名称 -> 正在进行的刷新任务
+        self._refreshes = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        feed_name = self._match_feed(scope)
+        if feed_name is None:
+            return await self.wsgi(scope, receive, send)
+        await self.serve_feed(feed_name, scope, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _match_feed(self, scope):
+        """
+        Get the feed requested by an HTTP request that can be served natively.
+
+        Uses the Flask URL map, so routing is identical to the WSGI mode.
+
+        Returns:
+            str: Feed name, or None to delegate the request to Flask
+        """
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            return None
+        # 流式输出和未启用缓存时由Flask处理
+        if self.flask_app.config.get('STREAM_FEEDS') or self.flask_app.config.get('CACHE_INSTANCE') is None:
+            return None
+        try:
+            endpoint, args = self.url_map.match(scope['path'], method=scope['method'])
+        except HTTPException:
+            return None
+        if endpoint != 'main.get_feed':
+            return None
+        return args['feed_name'] if args['feed_name'] in spider_registry else None
+
+    async def serve_feed(self, feed_name, scope, send):
+        """
+        Serve a feed from the rendered feed cache, refreshing it if needed.
+
+        The decisions are shared with the Flask routes (app.core.feed_service);
+        cache reads and writes run in worker threads so they never block the
+        event loop.
+
+        Args:
+            feed_name (str): Feed name in spider_registry
+            scope (dict): ASGI connection scope
+            send (callable): ASGI send callable
+        """
+        token = current_feed.set(feed_name)
+        try:
+            with self.flask_app.app_context(), time_stage('total'):
+                feed_request = self._feed_request(scope)
+                reply = await self._reply(feed_name, feed_request)
+                await self._send(send, reply, scope)
+        finally:
+            current_feed.reset(token)
+
+    async def _reply(self, feed_name, feed_request):
+        feed_cache = FeedCache(self.flask_app.config['CACHE_INSTANCE'])
+        # 限流和读取渲染缓存可能访问Redis或磁盘，在线程中进行（上下文变量随之复制）
+        rejected, entry = await asyncio.to_thread(self._lookup, feed_name, feed_request, feed_cache)
+        if rejected is not None:
+            return rejected
+        if not feed_cache.is_fresh(entry):
+            # 同一个源的并发请求等待同一次刷新，不各自占用线程
+            task = self._refreshes.get(feed_name)
+            if task is None:
+                task = self._refreshes[feed_name] = asyncio.ensure_future(self._refresh(feed_name, feed_cache, entry))
+                task.add_done_callback(lambda _: self._refreshes.pop(feed_name, None))
+            try:
+                refreshed = await asyncio.shield(task)
+            except UpstreamBusy as e:
+                return feed_service.upstream_busy(entry, e, feed_request)
+            except Exception as e:
+                return feed_service.json_reply(500, {'error': str(e)})
+            if refreshed is not None:
+                entry = refreshed
+            elif entry is None:
+                # 获取失败时不缓存空结果，下次请求重新获取
+                return feed_service.rss_reply(generate_rss([], feed_name))
+        return feed_service.entry_reply(entry, feed_request)
+
+    def _lookup(self, feed_name, feed_request, feed_cache):
+        rejected = feed_service.prepare(feed_request, self.flask_app.config)
+        if rejected is not None:
+            return rejected, None
+        return None, feed_cache.get(feed_name)
+
+    async def _refresh(self, feed_name, feed_cache, previous):
+        spider = load_spider(feed_name)
+        with track_upstream_freshness() as freshness:
+            items = await as_async(spider).afetch_items()
+        if not items:
+            return None
+        return await asyncio.to_thread(feed_cache.store, feed_name, items, lambda: iter_rss(items, feed_name),
+                                       freshness.ttl(spider.cache_ttl), previous)
+
+    def _feed_request(self, scope):
+        headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        # 与Flask的request.base_url一致：代理之后的协议、主机名和客户端IP由uvicorn的代理头支持处理
+        scheme = scope.get('scheme', 'http')
+        base_url = get_current_url(scheme, get_host(scheme, headers.get('host'), scope.get('server')),
+                                   scope.get('root_path'), scope['path'])
+        args = {}
+        for name, value in parse_qsl(scope.get('query_string', b'').decode('latin-1')):
+            # 与request.args.to_dict()一致，重复的参数取第一个值
+            args.setdefault(name, value)
+        return FeedRequest(
+            client=(scope.get('client') or ('',))[0],
+            args=args,
+            base_url=base_url,
+            if_none_match=headers.get('if-none-match'),
+            if_modified_since=headers.get('if-modified-since'),
+            method=scope['method']
+        )
+
+    async def _send(self, send, reply, scope):
+        headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in reply.headers]
+        body = reply.body.encode('utf-8')
+        if reply.status != 304:
+            headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': reply.status, 'headers': headers})
+        if scope['method'] == 'HEAD':
+            body = b''
+        await send({'type': 'http.response.body', 'body': body})
+
+
+app = FeedApplication(flask_app)
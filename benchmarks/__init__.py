@@ -0,0 +1,2 @@
+# Benchmarks for RSS Generator
+"""Standalone performance benchmarks; run each module with ``python -m``."""
@@ -0,0 +1,111 @@
+"""
+Benchmark the binary cache file format against the previous JSON files.
+
+Usage:
+    python -m benchmarks.bench_cache_format [--sizes 10,1000,20000] [--codecs zstd,zlib,none]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from app.core.cache import Cache, zstandard
+from app.core.rss_generator import generate_rss
+from benchmarks.bench_rss_generator import make_items
+from benchmarks.fixtures import make_opds
+
+
+class LegacyJsonCache:
+    """The JSON file format Cache used to write, without the memory tier."""
+
+    def __init__(self, cache_dir, default_ttl=3600):
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def set(self, key, data, ttl=None):
+        cache_data = {
+            'data': data,
+            'timestamp': time.time(),
+            'expires_at': time.time() + (ttl or self.default_ttl)
+        }
+        with open(self._path(key), 'w') as f:
+            f.write(json.dumps(cache_data))
+
+    def get(self, key):
+        with open(self._path(key), 'r') as f:
+            cache_data = json.loads(f.read())
+        if time.time() > cache_data['expires_at']:
+            return None
+        return cache_data['data']
+
+
+def make_payloads(size):
+    """Build the two kinds of entries the app caches: upstream bodies and rendered feeds."""
+    return {
+        'upstream': {'content': make_opds(size), 'fresh_until': time.time() + 3600, 'etag': '"abc"', 'last_modified': None},
+        'rendered': {'xml': generate_rss(make_items(size), 'bench'), 'digest': '0' * 64, 'fresh_until': time.time() + 3600}
+    }
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def file_size(cache_dir, suffix):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(cache_dir) for name in files if name.endswith(suffix))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,1000,20000')
+    parser.add_argument('--codecs', default='zstd,zlib,none' if zstandard is not None else 'zlib,none')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"items":>6} {"entry":>9} {"format":>7} {"size (KiB)":>11} {"set (ms)":>9} {"get (ms)":>9} {"expired get (ms)":>17}')
+    for size in (int(s) for s in args.sizes.split(',')):
+        for kind, payload in make_payloads(size).items():
+            with tempfile.TemporaryDirectory() as cache_dir:
+                legacy = LegacyJsonCache(cache_dir)
+                legacy.set('entry', payload)
+                legacy.set('expired', payload, ttl=-1)
+                rows = [('json', file_size(cache_dir, '.json'),
+                         timeit(lambda: legacy.set('entry', payload), args.repeat),
+                         timeit(lambda: legacy.get('entry'), args.repeat),
+                         timeit(lambda: legacy.get('expired'), args.repeat))]
+
+            for codec in args.codecs.split(','):
+                with tempfile.TemporaryDirectory() as cache_dir:
+                    # 禁用进程内缓存，只测量文件读写
+                    cache = Cache(cache_dir, memory_limit=0, codec=codec)
+                    cache.set('entry', payload)
+                    assert cache.get('entry') == payload
+                    size_on_disk = file_size(cache_dir, '.cache')
+                    set_time = timeit(lambda: cache.set('entry', payload), args.repeat)
+                    get_time = timeit(lambda: cache.get('entry'), args.repeat)
+
+                    def get_expired():
+                        cache.set('expired', payload, ttl=-1)
+                        start = time.perf_counter()
+                        cache.get('expired')
+                        return time.perf_counter() - start
+                    expired_time = min(get_expired() for _ in range(args.repeat))
+                    rows.append((codec, size_on_disk, set_time, get_time, expired_time))
+
+            for name, disk, set_time, get_time, expired_time in rows:
+                print(f'{size:>6} {kind:>9} {name:>7} {disk / 1024:>11.1f} {set_time * 1000:>9.2f} '
+                      f'{get_time * 1000:>9.2f} {expired_time * 1000:>17.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Cold-start benchmark based on ``python -X importtime``.
+
+Imports ``main`` in fresh interpreters with lazy initialization enabled and
+fails (exit code 1) when the median import time exceeds the budget or when
+a module that should only load on first use is imported at startup.
+
+Usage:
+    python -m benchmarks.bench_cold_start [--runs 5] [--budget-ms 400] [--top 15]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 这些模块只应在首次请求RSS源（或启用对应功能）时才导入
+LAZY_MODULES = (
+    'requests', 'bs4', 'lxml', 'redis', 'asyncio',
+    'app.spiders.base_spider', 'app.spiders.emagazine', 'app.core.http_client', 'app.core.scheduler'
+)
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def profile_import(module):
+    """
+    Import a module in a fresh interpreter under -X importtime.
+
+    Returns:
+        dict: Module name to (self_us, cumulative_us) for every imported module
+    """
+    env = dict(os.environ, LAZY_INIT='true', PREWARM_ENABLED='false')
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--module', default='main')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=400.0,
+                        help='maximum median cumulative import time of the module')
+    parser.add_argument('--top', type=int, default=15, help='show the slowest modules by self time')
+    args = parser.parse_args()
+
+    runs = [profile_import(args.module) for _ in range(args.runs)]
+    totals = [run[args.module][1] / 1000 for run in runs]
+    median = statistics.median(totals)
+    print(f'import {args.module}: median {median:.1f} ms (min {min(totals):.1f}, max {max(totals):.1f}) '
+          f'over {args.runs} runs, budget {args.budget_ms:.0f} ms')
+
+    last = runs[-1]
+    print(f'\nslowest modules by self time ({len(last)} imported):')
+    for name, (self_us, cumulative_us) in sorted(last.items(), key=lambda kv: kv[1][0], reverse=True)[:args.top]:
+        print(f'  {self_us / 1000:>7.1f} ms self {cumulative_us / 1000:>8.1f} ms cumulative  {name}')
+
+    failures = []
+    eager = sorted(name for name in last if name.split('.')[0] in LAZY_MODULES or name in LAZY_MODULES)
+    if eager:
+        failures.append(f'modules imported eagerly at startup: {", ".join(eager)}')
+    if median > args.budget_ms:
+        failures.append(f'median import time {median:.1f} ms exceeds budget {args.budget_ms:.0f} ms')
+
+    for failure in failures:
+        print(f'\nFAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
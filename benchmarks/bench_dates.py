@@ -0,0 +1,78 @@
+"""
+Benchmark OPDS date normalization and RFC 822 formatting.
+
+Usage:
+    python -m benchmarks.bench_dates [--count 100000] [--distinct 5000]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app.core.dates import _parse, format_rfc822, format_rfc822_many, normalize_date, normalize_dates
+
+
+def legacy_parse_opds_date(date_str):
+    """strptime-based parsing and formatting, as EMagazineSpider used to do."""
+    try:
+        if ':' in date_str[-6:] and date_str[-3] == ':':
+            date_str = date_str[:-3] + date_str[-2:]
+        for fmt in ['%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%SZ']:
+            try:
+                return datetime.strptime(date_str, fmt).strftime('%a, %d %b %Y %H:%M:%S %z')
+            except ValueError:
+                continue
+        return datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
+    except Exception:
+        return datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
+
+
+def make_timestamps(count, distinct):
+    """Build ``count`` Atom timestamps drawn from ``distinct`` values, with mixed offsets."""
+    base = datetime(2020, 1, 1)
+    offsets = ('+00:00', '+08:00', '-05:00', 'Z')
+    return [
+        (base + timedelta(seconds=i * 3607)).isoformat() + offsets[i % 4]
+        for i in (n % distinct for n in range(count))
+    ]
+
+
+def timeit(func, repeat, setup=None):
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--distinct', type=int, default=5000, help='number of distinct timestamps')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    unique = make_timestamps(args.count, args.count)
+    repeated = make_timestamps(args.count, args.distinct)
+    for value in unique[:1000]:
+        assert format_rfc822(normalize_date(value)) == legacy_parse_opds_date(value)
+    dates = normalize_dates(unique)
+
+    rows = [
+        ('legacy strptime+strftime', timeit(lambda: [legacy_parse_opds_date(v) for v in unique], args.repeat)),
+        ('parse (unique, cold memo)', timeit(lambda: normalize_dates(unique), args.repeat, _parse.cache_clear)),
+        (f'parse ({args.distinct} distinct)', timeit(lambda: normalize_dates(repeated), args.repeat, _parse.cache_clear)),
+        ('strftime', timeit(lambda: [d.strftime('%a, %d %b %Y %H:%M:%S %z') for d in dates], args.repeat)),
+        ('format_rfc822', timeit(lambda: format_rfc822_many(dates), args.repeat)),
+        ('parse+format (unique)', timeit(lambda: format_rfc822_many(normalize_dates(unique)), args.repeat,
+                                         _parse.cache_clear)),
+    ]
+    print(f'{args.count:,} timestamps')
+    for label, elapsed in rows:
+        print(f'{label:<28} {elapsed * 1000:>9.1f} ms {args.count / elapsed:>12,.0f} /s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+End-to-end load test of /emagazine under gunicorn against a local fake OPDS server.
+
+For every worker count a fresh gunicorn is started with its own cache
+namespace. The first request (cold: upstream fetch, parse and render) is
+timed separately, then closed-loop clients issue requests for a fixed
+duration and the throughput and latency percentiles are reported.
+
+Usage:
+    python -m benchmarks.bench_load [--workers 1,2,4] [--entries 1000] [--latency 0.2]
+                                    [--duration 10] [--concurrency 16]
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.fake_opds import FakeOpdsServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    """Get a TCP port that is currently free on the loopback interface."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(samples, q):
+    """The q-th percentile (1-99) of samples, interpolated linearly."""
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method='inclusive')[q - 1]
+
+
+def get(port, path, timeout=30):
+    """Issue one GET request and return (status, body)."""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+class Gunicorn:
+    """
+    gunicorn serving main:app in a subprocess.
+    """
+
+    def __init__(self, workers, upstream_url, worker_class=None, threads=None, extra_env=None):
+        self.workers = workers
+        self.port = free_port()
+        self.namespace = f'rsshub-bench-{os.getpid()}-{workers}'
+        self.log = tempfile.TemporaryFile(mode='w+')
+        self.env = dict(
+            os.environ,
+            FLASK_ENV='production',
+            EMAGAZINE_OPDS_URL=upstream_url,
+            CACHE_NAMESPACE=self.namespace,
+            PREWARM_ENABLED='false',
+            # 压测客户端都来自同一个IP，关闭限流
+            API_RATE_LIMIT='0',
+            **(extra_env or {})
+        )
+        # 使用生产环境的gunicorn.conf.py，只覆盖需要比较的设置
+        self.command = [
+            sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'main:app',
+            '--bind', f'127.0.0.1:{self.port}',
+            '--workers', str(workers),
+            '--log-level', 'warning'
+        ]
+        if worker_class:
+            self.command += ['--worker-class', worker_class]
+        if threads:
+            self.command += ['--threads', str(threads)]
+        self.process = None
+
+    def start(self, timeout=30):
+        """Start gunicorn and wait until /health answers."""
+        self.process = subprocess.Popen(self.command, cwd=ROOT, env=self.env, stdout=self.log,
+                                        stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                if get(self.port, '/health', timeout=1)[0] == 200:
+                    return self
+            except OSError:
+                pass
+            time.sleep(0.1)
+        self.stop()
+        self.log.seek(0)
+        raise RuntimeError(f'gunicorn did not start:\n{self.log.read()}')
+
+    def stop(self):
+        """Stop gunicorn and remove its cache namespace."""
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        # 生产模式下缓存固定保存在/tmp中
+        shutil.rmtree(os.path.join('/tmp', self.namespace), ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _client(port, path, deadline, latencies, errors):
+    """Closed-loop client: one keep-alive connection, one request at a time."""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException):
+            errors.append('connection')
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def _client_process(args):
+    """Run a group of client threads and return their latencies, errors and elapsed time."""
+    port, path, duration, threads = args
+    start = time.monotonic()
+    deadline = start + duration
+    latencies, errors = [], []
+    group = [threading.Thread(target=_client, args=(port, path, deadline, latencies, errors))
+             for _ in range(threads)]
+    for thread in group:
+        thread.start()
+    for thread in group:
+        thread.join()
+    return latencies, errors, time.monotonic() - start
+
+
+def generate_load(port, path, duration, concurrency, processes):
+    """
+    Drive the server with ``concurrency`` closed-loop clients spread over
+    ``processes`` client processes, so the client is not limited by the GIL.
+
+    Returns:
+        tuple: (sorted latencies in seconds, error list, requests per second)
+    """
+    processes = max(1, min(processes, concurrency))
+    shares = [concurrency // processes + (i < concurrency % processes) for i in range(processes)]
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        results = pool.map(_client_process, [(port, path, duration, share) for share in shares])
+    # 各客户端进程分别计时，不计入进程启动的时间
+    rps = sum(len(latencies) / elapsed for latencies, _, elapsed in results if elapsed)
+    latencies = sorted(latency for result in results for latency in result[0])
+    errors = [error for result in results for error in result[1]]
+    return latencies, errors, rps
+
+
+def run_load(workers, upstream_url, path='/emagazine', duration=10.0, warmup=2.0, concurrency=16,
+             client_processes=None, worker_class=None, threads=None):
+    """
+    Load-test one gunicorn configuration.
+
+    Returns:
+        dict: cold_ms, rps, p50_ms, p90_ms, p99_ms, max_ms, requests and errors
+    """
+    client_processes = client_processes or min(4, os.cpu_count() or 1)
+    with Gunicorn(workers, upstream_url, worker_class, threads) as server:
+        start = time.perf_counter()
+        status, body = get(server.port, path)
+        cold = time.perf_counter() - start
+        if status != 200:
+            raise RuntimeError(f'GET {path} returned {status}')
+        if warmup:
+            generate_load(server.port, path, warmup, concurrency, client_processes)
+        latencies, errors, rps = generate_load(server.port, path, duration, concurrency, client_processes)
+
+    return {
+        'workers': workers,
+        'response_bytes': len(body),
+        'cold_ms': cold * 1000,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': rps,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0.0) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated gunicorn worker counts')
+    parser.add_argument('--worker-class', default=None, help='override the worker class of gunicorn.conf.py')
+    parser.add_argument('--threads', type=int, default=None, help='override the threads per gunicorn worker')
+    parser.add_argument('--entries', type=int, default=1000, help='entries in the fake OPDS catalog')
+    parser.add_argument('--latency', type=float, default=0.2, help='fake upstream latency in seconds')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of measured load per run')
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent closed-loop clients')
+    parser.add_argument('--client-processes', type=int, default=None)
+    args = parser.parse_args()
+
+    with FakeOpdsServer(args.entries, args.latency) as upstream:
+        print(f'upstream: {args.entries:,} entries, {args.latency * 1000:.0f} ms latency; '
+              f'{args.concurrency} clients for {args.duration:.0f}s')
+        print(f'{"workers":>7} {"cold ms":>9} {"req/s":>9} {"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} '
+              f'{"max ms":>8} {"errors":>6}')
+        for workers in (int(n) for n in args.workers.split(',')):
+            result = run_load(workers, upstream.url, duration=args.duration, warmup=args.warmup,
+                              concurrency=args.concurrency, client_processes=args.client_processes,
+                              worker_class=args.worker_class, threads=args.threads)
+            print(f'{workers:>7} {result["cold_ms"]:>9.1f} {result["rps"]:>9.1f} {result["p50_ms"]:>8.2f} '
+                  f'{result["p90_ms"]:>8.2f} {result["p99_ms"]:>8.2f} {result["max_ms"]:>8.2f} '
+                  f'{result["errors"]:>6}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark the streaming RSS writer against the previous minidom implementation.
+
+Usage:
+    python -m benchmarks.bench_rss_generator [--sizes 10,1000,50000]
+"""
+import argparse
+import datetime
+import os
+import re
+import time
+from xml.dom import minidom
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+from app.core.models import FeedItem
+from app.core.rss_generator import generate_rss
+
+
+def legacy_generate_rss(items, feed_title):
+    """ElementTree + minidom pretty-printing, as generate_rss used to work."""
+    rss = Element('rss')
+    rss.set('version', '2.0')
+    channel = SubElement(rss, 'channel')
+    SubElement(channel, 'title').text = f'{feed_title.title()} RSS Feed'
+    rss_feed_link = os.environ.get('RSS_FEED_LINK', 'https://rsshubpy.vercel.app')
+    SubElement(channel, 'link').text = f'{rss_feed_link}/{feed_title}'
+    SubElement(channel, 'description').text = f'Latest updates from {feed_title.title()} source'
+    pub_date = SubElement(channel, 'pubDate')
+    pub_date.text = datetime.datetime.now(datetime.timezone.utc).strftime('%a, %d %b %Y %H:%M:%S %z')
+    SubElement(channel, 'lastBuildDate').text = pub_date.text
+    for item in items:
+        item_elem = SubElement(channel, 'item')
+        SubElement(item_elem, 'title').text = item.get('title', 'Untitled')
+        SubElement(item_elem, 'link').text = item.get('link', '')
+        SubElement(item_elem, 'description').text = item.get('description', '')
+        if 'pub_date' in item:
+            SubElement(item_elem, 'pubDate').text = item['pub_date']
+        guid = SubElement(item_elem, 'guid')
+        guid.set('isPermaLink', 'true')
+        guid.text = item.get('link', f'urn:uuid:{datetime.datetime.now().timestamp()}')
+    rough_string = tostring(rss, encoding='unicode')
+    reparsed = minidom.parseString(rough_string.encode('utf-8'))
+    pretty_xml = reparsed.toprettyxml(indent='  ', encoding='utf-8').decode('utf-8')
+    first_newline = pretty_xml.find('\n')
+    return '<?xml version="1.0" encoding="UTF-8" ?>\n' + pretty_xml[first_newline + 1:]
+
+
+def make_items(count):
+    """Build synthetic feed items with characters that need escaping."""
+    return [
+        {
+            'title': f'第{i}期 Magazine & "Special" <Edition>',
+            'link': f'https://emagazine.link/epub/{i}.epub',
+            'description': f'作者: Author {i}<br>出版社: Publisher<br>内容: ' + 'Lorem ipsum ' * 20,
+            'pub_date': 'Sat, 01 Nov 2025 23:16:11 +0000'
+        }
+        for i in range(count)
+    ]
+
+
+def normalize(xml):
+    """Strip inter-element whitespace and the build timestamps."""
+    xml = re.sub(r'<(pubDate|lastBuildDate)>[^<]*</\1>', '', xml, count=2)
+    return re.sub(r'>\s+<', '><', xml).strip()
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,1000,50000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"items":>8} {"minidom (ms)":>14} {"dicts (ms)":>11} {"typed (ms)":>11} {"compact (ms)":>13} {"speedup":>8}')
+    for size in (int(s) for s in args.sizes.split(',')):
+        items = make_items(size)
+        # 爬虫产生的是FeedItem，旧式字典需要在写入时逐条转换
+        typed_items = [FeedItem.from_dict(item) for item in items]
+        assert normalize(legacy_generate_rss(items, 'bench')) == normalize(generate_rss(typed_items, 'bench'))
+        legacy = timeit(lambda: legacy_generate_rss(items, 'bench'), args.repeat)
+        dicts = timeit(lambda: generate_rss(items, 'bench'), args.repeat)
+        typed = timeit(lambda: generate_rss(typed_items, 'bench'), args.repeat)
+        compact = timeit(lambda: generate_rss(typed_items, 'bench', pretty=False), args.repeat)
+        print(f'{size:>8} {legacy * 1000:>14.2f} {dicts * 1000:>11.2f} {typed * 1000:>11.2f} '
+              f'{compact * 1000:>13.2f} {legacy / typed:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
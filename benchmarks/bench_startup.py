@@ -0,0 +1,63 @@
+"""
+Measure application import time and per-request spider resolution cost.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from importlib import import_module
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_seconds(module, runs):
+    """Median wall time of importing a module in a fresh interpreter."""
+    code = f'import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)'
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def legacy_resolve(path):
+    """Per-request resolution as get_feed used to do it."""
+    module_path, class_name = path.rsplit('.', 1)
+    return getattr(import_module(module_path), class_name)()
+
+
+def per_call_us(func, calls=10000):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    for module in ('app.routes', 'main'):
+        print(f'import {module:<12} {import_seconds(module, args.runs) * 1000:>8.1f} ms')
+
+    from app.spiders.registry import spider_registry
+
+    for name in spider_registry:
+        start = time.perf_counter()
+        spider_registry.get_spider(name)
+        first = (time.perf_counter() - start) * 1000
+        target = spider_registry[name]
+        print(f'{name}: first resolution {first:.1f} ms, '
+              f'registry {per_call_us(lambda: spider_registry.get_spider(name)):.2f} us/request, '
+              f'import_module {per_call_us(lambda: legacy_resolve(target)):.2f} us/request')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Local stand-in for the upstream OPDS server, serving a synthetic catalog.
+
+The catalog is rendered once at startup; every response is delayed by the
+configured latency to mimic a remote server. ETag/If-None-Match are
+honoured so conditional refreshes can be measured too.
+
+Usage:
+    python -m benchmarks.fake_opds [--entries 1000] [--latency 0.2] [--port 8081]
+"""
+import argparse
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import make_opds
+
+
+class FakeOpdsServer:
+    """
+    Threaded HTTP server returning the same synthetic OPDS catalog for any path.
+    """
+
+    def __init__(self, entries=1000, latency=0.0, host='127.0.0.1', port=0):
+        """
+        Build the catalog and bind the server (port 0 picks a free port).
+
+        Args:
+            entries (int): Number of entries in the catalog
+            latency (float): Delay added to every response, in seconds
+            host (str): Address to bind
+            port (int): Port to bind
+        """
+        self.body = make_opds(entries).encode('utf-8')
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+        self.latency = latency
+        self.requests = 0
+        self._thread = None
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        """URL of the catalog."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/opds/new'
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                if self.headers.get('If-None-Match') == server.etag:
+                    self.send_response(304)
+                    self.send_header('ETag', server.etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/atom+xml;profile=opds-catalog;charset=utf-8')
+                self.send_header('Content-Length', str(len(server.body)))
+                self.send_header('ETag', server.etag)
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self):
+        """Serve requests in the current thread until stopped."""
+        self._server.serve_forever()
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-opds', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds added to every response')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    args = parser.parse_args()
+
+    server = FakeOpdsServer(args.entries, args.latency, args.host, args.port)
+    print(f'serving {args.entries:,} entries ({len(server.body) / 1024:.0f} KiB) at {server.url}')
+    print(f'run the app with EMAGAZINE_OPDS_URL={server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
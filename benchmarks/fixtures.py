@@ -0,0 +1,39 @@
+"""Synthetic data shared by the benchmarks."""
+
+OPDS_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:dc="http://purl.org/dc/terms/">\n'
+    '<id>urn:uuid:catalog</id>\n<title>Synthetic catalog</title>\n'
+    '<updated>2025-11-01T23:16:11+00:00</updated>\n'
+)
+OPDS_FOOTER = '</feed>\n'
+
+
+def opds_entry(index):
+    """Render one OPDS acquisition entry."""
+    return (
+        f'<entry>\n'
+        f'  <title>第{index}期 Magazine &amp; Special</title>\n'
+        f'  <id>urn:uuid:{index:08d}</id>\n'
+        f'  <updated>2025-{1 + index % 12:02d}-{1 + index % 28:02d}T{index % 24:02d}:16:11+00:00</updated>\n'
+        f'  <author><name>Author {index % 500}</name></author>\n'
+        f'  <publisher><name>Publisher {index % 50}</name></publisher>\n'
+        f'  <summary>Issue {index} of a synthetic magazine with some CJK text 电子杂志内容摘要。</summary>\n'
+        f'  <link rel="http://opds-spec.org/image" href="/covers/{index}.jpg" type="image/jpeg"/>\n'
+        f'  <link rel="http://opds-spec.org/acquisition" href="/pdf/{index}.pdf" type="application/pdf"/>\n'
+        f'  <link rel="http://opds-spec.org/acquisition" href="/epub/{index}.epub" type="application/epub+zip"/>\n'
+        f'</entry>\n'
+    )
+
+
+def iter_opds_chunks(count):
+    """Yield a synthetic OPDS catalog with ``count`` entries piece by piece."""
+    yield OPDS_HEADER
+    for index in range(count):
+        yield opds_entry(index)
+    yield OPDS_FOOTER
+
+
+def make_opds(count):
+    """Build a synthetic OPDS catalog with ``count`` entries."""
+    return ''.join(iter_opds_chunks(count))
@@ -0,0 +1,216 @@
+"""
+Run the benchmark suite, save the results as JSON and compare them with a baseline.
+
+Microbenchmarks cover OPDS parsing, RSS generation, feed windows and the
+file cache; the load test runs /emagazine under gunicorn against a local
+fake OPDS server (see benchmarks.bench_load). Exits with code 1 when a
+metric regressed by more than the threshold compared to the baseline.
+
+Usage:
+    python -m benchmarks.suite [--output results.json] [--baseline baseline.json]
+                               [--threshold 0.15] [--skip-load] [--quick]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from app.core.cache import Cache, MemoryCache
+from app.core.feed_cache import FeedCache
+from app.core.pagination import FeedWindow
+from app.core.rss_generator import generate_rss, iter_rss
+from app.spiders.emagazine import EMagazineSpider
+from benchmarks.bench_load import ROOT, run_load
+from benchmarks.fake_opds import FakeOpdsServer
+from benchmarks.fixtures import make_opds
+
+
+def best_of(func, repeat):
+    """Shortest wall time of ``repeat`` calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def metric(value, unit, better):
+    """A result entry; ``better`` is "higher" or "lower"."""
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def run_micro(entries, cache_ops, repeat):
+    """
+    Run the microbenchmarks.
+
+    Args:
+        entries (int): Entries in the synthetic OPDS catalog and the generated feed
+        cache_ops (int): Number of cache keys written and read
+        repeat (int): Repetitions, the best one is reported
+
+    Returns:
+        dict: Metric name to result entry
+    """
+    results = {}
+    spider = EMagazineSpider()
+    xml = make_opds(entries)
+    items = spider._parse_opds_feed(xml)
+    assert len(items) == entries
+
+    elapsed = best_of(lambda: spider._parse_opds_feed(xml), repeat)
+    results['micro.parse_opds.entries_per_s'] = metric(entries / elapsed, 'entries/s', 'higher')
+
+    for pretty in (False, True):
+        elapsed = best_of(lambda: generate_rss(items, 'emagazine', pretty=pretty), repeat)
+        name = 'pretty' if pretty else 'compact'
+        results[f'micro.generate_rss.{name}.items_per_s'] = metric(entries / elapsed, 'items/s', 'higher')
+
+    # 从缓存的完整文档中截取前20个条目
+    entry = FeedCache(MemoryCache()).store('emagazine', items, lambda: iter_rss(items, 'emagazine'), 3600)
+    window = FeedWindow(limit=20)
+    elapsed = best_of(lambda: [FeedCache.window(entry, window) for _ in range(100)], repeat)
+    results['micro.feed_window.limit20_per_s'] = metric(100 / elapsed, 'windows/s', 'higher')
+
+    # 缓存的值使用真实大小的RSS（100个条目）
+    payload = generate_rss(items[:100], 'emagazine')
+    keys = [f'feed_bench_{i}' for i in range(cache_ops)]
+    cache_dir = tempfile.mkdtemp(prefix='rsshub-bench-')
+    try:
+        # 只测文件层：关闭进程内缓存和后台清理
+        cache = Cache(cache_dir, memory_limit=0, sweep_interval=0)
+        elapsed = best_of(lambda: [cache.set(key, payload) for key in keys], repeat)
+        results['micro.cache.set_per_s'] = metric(cache_ops / elapsed, 'ops/s', 'higher')
+        elapsed = best_of(lambda: [cache.get(key) for key in keys], repeat)
+        results['micro.cache.get_per_s'] = metric(cache_ops / elapsed, 'ops/s', 'higher')
+        elapsed = best_of(lambda: [cache.get(f'missing_{key}') for key in keys], repeat)
+        results['micro.cache.get_miss_per_s'] = metric(cache_ops / elapsed, 'ops/s', 'higher')
+
+        cache = Cache(cache_dir, sweep_interval=0, namespace='memory')
+        for key in keys:
+            cache.set(key, payload)
+        elapsed = best_of(lambda: [cache.get(key) for key in keys], repeat)
+        results['micro.cache.get_memory_per_s'] = metric(cache_ops / elapsed, 'ops/s', 'higher')
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def run_load_tests(worker_counts, entries, latency, duration, warmup, concurrency):
+    """
+    Run the gunicorn load test for each worker count against one fake upstream.
+
+    Returns:
+        dict: Metric name to result entry
+    """
+    results = {}
+    with FakeOpdsServer(entries, latency) as upstream:
+        for workers in worker_counts:
+            load = run_load(workers, upstream.url, duration=duration, warmup=warmup, concurrency=concurrency)
+            prefix = f'load.emagazine.w{workers}'
+            results[f'{prefix}.rps'] = metric(load['rps'], 'req/s', 'higher')
+            for field in ('cold_ms', 'p50_ms', 'p90_ms', 'p99_ms'):
+                results[f'{prefix}.{field}'] = metric(load[field], 'ms', 'lower')
+            results[f'{prefix}.errors'] = metric(load['errors'], 'requests', 'lower')
+    return results
+
+
+def environment():
+    """Describe the machine and revision the results were measured on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (dict): Metric name to result entry
+        baseline (dict): Metric name to result entry of an earlier run
+        threshold (float): Allowed relative change in the worse direction, e.g. 0.15
+
+    Returns:
+        list: Names of the regressed metrics
+    """
+    regressions = []
+    print(f'\n{"metric":<42} {"baseline":>12} {"current":>12} {"change":>8}')
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        old, new = previous['value'], current['value']
+        change = (new - old) / old if old else 0.0
+        worse = -change if current['better'] == 'higher' else change
+        # 错误数的基线通常为0，任何新增错误都视为退化
+        regressed = worse > threshold or (old == 0 and new > 0 and current['better'] == 'lower')
+        if regressed:
+            regressions.append(name)
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:<42} {old:>12,.2f} {new:>12,.2f} {change:>+7.1%}{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='relative change in the worse direction counted as a regression')
+    parser.add_argument('--quick', action='store_true', help='smaller inputs and shorter load runs')
+    parser.add_argument('--skip-load', action='store_true', help='run only the microbenchmarks')
+    parser.add_argument('--entries', type=int, default=None, help='entries in the synthetic catalog')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated gunicorn worker counts')
+    parser.add_argument('--latency', type=float, default=0.2, help='fake upstream latency in seconds')
+    parser.add_argument('--duration', type=float, default=None, help='seconds of measured load per run')
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    entries = args.entries or (1000 if args.quick else 5000)
+    duration = args.duration or (3.0 if args.quick else 10.0)
+
+    results = run_micro(entries, cache_ops=200 if args.quick else 1000, repeat=args.repeat)
+    if not args.skip_load:
+        worker_counts = [int(n) for n in args.workers.split(',')]
+        results.update(run_load_tests(worker_counts, min(entries, 1000), args.latency, duration,
+                                      warmup=1.0 if args.quick else 2.0, concurrency=args.concurrency))
+
+    for name, result in results.items():
+        print(f'{name:<42} {result["value"]:>14,.2f} {result["unit"]}')
+
+    report = {'environment': environment(), 'settings': vars(args), 'metrics': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nresults written to {args.output}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['metrics'], args.threshold)
+        if regressions:
+            print(f'\nFAIL: {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: '
+                  f'{", ".join(regressions)}')
+            sys.exit(1)
+        print(f'\nno regressions beyond {args.threshold:.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,24 @@
 import os
 from datetime import timedelta
 
+def parse_bundles(value):
+    """
+    Parse FEED_BUNDLES into a mapping of bundle name to feed names.
+    
+    Args:
+        value (str): Bundles in the form "name:feed1,feed2;name2:feed3"
+    
+    Returns:
+        dict: Bundle name to list of feed names
+    """
+    bundles = {}
+    for part in value.split(';'):
+        name, _, feeds = part.partition(':')
+        feeds = [feed.strip() for feed in feeds.split(',') if feed.strip()]
+        if name.strip() and feeds:
+            bundles[name.strip()] = feeds
+    return bundles
+
 class Config:
     """
     应用配置类
@@ -10,6 +28,11 @@ class Config:
         # 基本配置
         self.DEBUG = os.environ.get('FLASK_ENV') != 'production'
         
+        # 延迟初始化：缓存等组件在首次使用时才创建，适合Vercel等无服务器环境
+        # Vercel运行时会设置VERCEL=1，此时默认开启
+        default_lazy = 'true' if os.environ.get('VERCEL') else 'false'
+        self.LAZY_INIT = os.environ.get('LAZY_INIT', default_lazy).lower() == 'true'
+        
         # SECRET_KEY 统一处理
         self.SECRET_KEY = os.environ.get('SECRET_KEY')
         if not self.SECRET_KEY:
@@ -20,24 +43,67 @@ class Config:
                 self.SECRET_KEY = 'dev-secret-key-change-in-production'
         
         # 缓存配置
+        # 缓存后端：file（文件，默认）、memory（进程内）、redis（多实例共享）
+        self.CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+        self.REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+        self.CACHE_REDIS_PREFIX = os.environ.get('CACHE_REDIS_PREFIX', 'rsshub:')
+        self.REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', 20))
         self.CACHE_DIR = os.environ.get('CACHE_DIR') or '/tmp'
+        # 文件缓存保存在CACHE_DIR下的该子目录中
+        self.CACHE_NAMESPACE = os.environ.get('CACHE_NAMESPACE', 'rsshub-py')
         self.DEFAULT_CACHE_TTL = int(os.environ.get('DEFAULT_CACHE_TTL', 3600))
+        # 进程内LRU缓存的字节上限（0表示禁用）及条目的最长驻留时间
+        self.CACHE_MEMORY_LIMIT = int(os.environ.get('CACHE_MEMORY_LIMIT', 32 * 1024 * 1024))
+        self.CACHE_MEMORY_TTL = int(os.environ.get('CACHE_MEMORY_TTL', 60))
+        # 文件缓存的压缩方式（auto/zstd/zlib/none）及启用压缩的最小字节数
+        self.CACHE_CODEC = os.environ.get('CACHE_CODEC', 'auto')
+        self.CACHE_COMPRESS_MIN = int(os.environ.get('CACHE_COMPRESS_MIN', 1024))
+        # 文件缓存的总字节上限（0表示不限制）及后台清理的间隔（秒，0表示禁用）
+        self.CACHE_MAX_SIZE = int(os.environ.get('CACHE_MAX_SIZE', 256 * 1024 * 1024))
+        self.CACHE_SWEEP_INTERVAL = int(os.environ.get('CACHE_SWEEP_INTERVAL', 300))
+        
+        # 预热配置：在缓存过期前后台刷新所有RSS源
+        self.PREWARM_ENABLED = os.environ.get('PREWARM_ENABLED', 'false').lower() == 'true'
+        self.PREWARM_CONCURRENCY = int(os.environ.get('PREWARM_CONCURRENCY', 2))
+        self.PREWARM_JITTER = float(os.environ.get('PREWARM_JITTER', 0.1))
         
         # 请求配置
         self.REQUEST_TIMEOUT = int(os.environ.get('REQUEST_TIMEOUT', 30))
         self.MAX_RETRIES = int(os.environ.get('MAX_RETRIES', 3))
+        # 每个上游主机保持的长连接数量，重试的指数退避基数及单次等待上限（秒）
+        self.HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 10))
+        self.HTTP_BACKOFF_FACTOR = float(os.environ.get('HTTP_BACKOFF_FACTOR', 0.5))
+        self.HTTP_BACKOFF_MAX = float(os.environ.get('HTTP_BACKOFF_MAX', 2.0))
+        # 每个进程同时进行的上游请求数上限（0表示不限制），以及等待空闲名额的最长时间（秒）
+        # 超时后返回旧内容，没有旧内容时返回503
+        self.MAX_UPSTREAM_FETCHES = int(os.environ.get('MAX_UPSTREAM_FETCHES', 16))
+        self.UPSTREAM_QUEUE_TIMEOUT = float(os.environ.get('UPSTREAM_QUEUE_TIMEOUT', 1.0))
         
         # RSS配置
         self.RSS_FEED_TITLE = os.environ.get('RSS_FEED_TITLE', 'RSS Generator')
         self.RSS_FEED_LINK = os.environ.get('RSS_FEED_LINK', 'https://rsshubpy.vercel.app')
         self.RSS_FEED_DESCRIPTION = os.environ.get('RSS_FEED_DESCRIPTION', 'RSS生成服务')
+        # 合并RSS源：单次输出的条目上限，以及预先配置的RSS源组合
+        # FEED_BUNDLES格式：名称:源1,源2;名称2:源3
+        self.MERGE_MAX_ITEMS = int(os.environ.get('MERGE_MAX_ITEMS', 100))
+        self.FEED_BUNDLES = parse_bundles(os.environ.get('FEED_BUNDLES', ''))
+        # 流式输出RSS，降低大型RSS源的首字节时间和内存占用
+        self.STREAM_FEEDS = os.environ.get('STREAM_FEEDS', 'false').lower() == 'true'
         
         # 日志配置
         self.LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
         self.LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         
         # API配置
+        # 每个客户端IP对每个RSS源每分钟的请求数上限（令牌桶，0表示不限制），超出时返回429
         self.API_RATE_LIMIT = int(os.environ.get('API_RATE_LIMIT', 60))
+        # 令牌桶容量，即允许的突发请求数，0表示与API_RATE_LIMIT相同
+        self.API_RATE_LIMIT_BURST = int(os.environ.get('API_RATE_LIMIT_BURST', 0))
+        # 限流计数的保存位置：memory（每个进程独立）或redis（多个worker和实例共享，使用REDIS_URL）
+        self.RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+        # 应用前的反向代理层数，用于从X-Forwarded-For中获取客户端IP；Vercel上默认为1
+        default_proxies = '1' if os.environ.get('VERCEL') else '0'
+        self.PROXY_COUNT = int(os.environ.get('PROXY_COUNT', default_proxies))
 
 # 创建配置实例
 def get_config():
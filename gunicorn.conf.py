@@ -0,0 +1,119 @@
+"""
+gunicorn configuration for production deployments.
+
+    gunicorn -c gunicorn.conf.py
+
+Serves main:app with threaded workers by default; SERVER_MODE=asgi serves
+asgi:app with uvicorn workers instead. Every setting can be overridden with
+the environment variables below or with command-line flags.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    return value.lower() == 'true' if value else default
+
+
+def cpu_count():
+    """
+    Number of CPUs available to this process, honouring CPU affinity and
+    cgroup v2 quotas (docker --cpus).
+
+    Returns:
+        int: CPU count, at least 1
+    """
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = multiprocessing.cpu_count()
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            count = min(count, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, count)
+
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+bind = os.environ.get('GUNICORN_BIND') or f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}"
+
+if SERVER_MODE == 'asgi':
+    # 异步爬虫直接在事件循环中运行，等待上游时不占用线程
+    wsgi_app = 'asgi:app'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'main:app'
+    # 抓取上游是I/O密集型：每个进程使用多个线程，一个慢速的上游响应不会阻塞其他读者
+    worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+if worker_class == 'gevent':
+    try:
+        import gevent  # noqa: F401
+    except ImportError:
+        worker_class = 'gthread'
+
+workers = _env_int('WEB_CONCURRENCY', cpu_count() * 2 + 1)
+threads = _env_int('GUNICORN_THREADS', 8)
+# gevent worker的并发连接数上限
+worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS', 1000)
+
+# 预加载应用：缓存、爬虫注册表和已导入的模块在主进程中初始化一次，fork后以写时复制方式共享。
+# gevent在worker中才打上猴子补丁，预加载时主进程中创建的锁和连接不会被替换，因此默认不预加载
+preload_app = _env_bool('GUNICORN_PRELOAD', worker_class != 'gevent')
+
+# 处理一定数量的请求后平滑重启worker，抖动使各worker不会同时重启；文件缓存在重启后仍然有效
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 10000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 1000)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# 同步worker处理请求期间无法发送心跳，超时需大于上游请求的最长耗时（含重试）
+timeout = _env_int('GUNICORN_TIMEOUT', 120)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# 心跳文件放在内存文件系统中，避免容器的overlay文件系统导致worker被误判为超时
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
+errorlog = '-'
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+
+# 预热调度器改由post_worker_init在每个worker中启动，见main.start_scheduler
+os.environ['PREWARM_DEFERRED'] = 'true'
+
+
+def when_ready(server):
+    """
+    Resolve every spider in the master before forking, so the spider
+    modules and their dependencies are shared by all workers.
+    """
+    if not server.cfg.preload_app:
+        return
+    from app.spiders.registry import spider_registry
+
+    for name in spider_registry:
+        try:
+            spider_registry.get_spider(name)
+        except Exception as e:
+            server.log.warning(f"Could not preload spider {name}: {e}")
+
+
+def post_worker_init(worker):
+    """
+    Start the pre-warming scheduler in each worker when PREWARM_ENABLED is set.
+
+    Workers coordinate through cache locks, so each feed is refreshed by one
+    worker at a time.
+    """
+    from main import start_scheduler
+
+    start_scheduler()
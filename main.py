@@ -2,7 +2,8 @@ from flask import Flask
 import os
 import logging
 from app.routes import main as main_blueprint
-from app.core.cache import Cache
+from app.core.cache import create_cache, LazyCache
+from app.core.rate_limit import create_rate_limiter
 
 # 设置日志
 logging.basicConfig(level=logging.INFO)
@@ -21,7 +22,7 @@ app = Flask(__name__, template_folder='app/templates')
 # 加载配置
 from config import config_by_name
 config_name = os.environ.get('FLASK_ENV', 'development')
-app.config.from_object(config_by_name[config_name])
+app.config.from_object(config_by_name[config_name]())
 
 # 初始化缓存
 # 在Vercel上使用临时目录存储缓存，因为Vercel的文件系统大部分是只读的
@@ -29,17 +30,52 @@ cache_dir = os.environ.get('CACHE_DIR', '/tmp')
 # 确保在生产环境下使用临时目录
 if os.environ.get('FLASK_ENV') == 'production':
     cache_dir = '/tmp'
-cache = Cache(cache_dir=cache_dir)
+if app.config.get('LAZY_INIT'):
+    # 延迟初始化：首次使用时才创建缓存（无服务器环境冷启动更快）
+    cache = LazyCache(lambda: create_cache(app.config, cache_dir=cache_dir))
+else:
+    cache = create_cache(app.config, cache_dir=cache_dir)
 
 # 将缓存实例存储到Flask配置中，供爬虫使用
 app.config['CACHE_INSTANCE'] = cache
 
-# 将缓存实例存储到Flask配置中，供爬虫使用
-app.config['CACHE_INSTANCE'] = cache
+# 按客户端IP和RSS源限流（API_RATE_LIMIT）
+app.config['RATE_LIMITER'] = create_rate_limiter(app.config)
+
+# 位于反向代理之后时，从X-Forwarded-For中获取真实的客户端IP
+if app.config.get('PROXY_COUNT'):
+    from werkzeug.middleware.proxy_fix import ProxyFix
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_COUNT'], x_proto=app.config['PROXY_COUNT'])
 
 # 注册蓝图
 app.register_blueprint(main_blueprint)
 
+scheduler = None
+
+def start_scheduler():
+    """
+    Start the in-process pre-warming scheduler if PREWARM_ENABLED is set.
+
+    Returns:
+        FeedScheduler: The running scheduler, or None if pre-warming is disabled
+    """
+    global scheduler
+    if not app.config.get('PREWARM_ENABLED') or scheduler is not None:
+        return scheduler
+    from app.core.scheduler import FeedScheduler
+    scheduler = FeedScheduler(
+        app,
+        max_workers=app.config.get('PREWARM_CONCURRENCY', 2),
+        jitter=app.config.get('PREWARM_JITTER', 0.1)
+    )
+    scheduler.start()
+    return scheduler
+
+# 在进程内启动预热调度器（也可以使用 python -m app.core.scheduler 单独运行）
+# 由gunicorn.conf.py启动时改为在每个worker初始化后启动：预加载应用的主进程中启动的线程不会被fork到worker中
+if os.environ.get('PREWARM_DEFERRED', 'false').lower() != 'true':
+    start_scheduler()
+
 # 自定义错误处理
 @app.errorhandler(404)
 def page_not_found(e):
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+
+from app.core.cache import MemoryCache
+from app.core.models import FeedItem
+from app.spiders.base_spider import BaseSpider
+from app.spiders.registry import SpiderRegistry
+
+BASE_DATE = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+
+def make_items(count, same_date=False):
+    """Build FeedItems newest first; with same_date all items share one timestamp."""
+    return [
+        FeedItem(f'Item {i}', f'https://example.com/{i}', f'Description {i}',
+                 BASE_DATE if same_date else BASE_DATE - timedelta(hours=i))
+        for i in range(count)
+    ]
+
+
+class StaticSpider(BaseSpider):
+    """Spider returning a fixed list of items and counting its fetches."""
+
+    items = make_items(5)
+
+    def __init__(self):
+        super().__init__(cache_ttl=3600)
+        self.fetches = 0
+
+    def fetch_items(self):
+        self.fetches += 1
+        return list(self.items)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = SpiderRegistry({'static': StaticSpider}, entry_point_group=None)
+    monkeypatch.setattr('app.routes.spider_registry', registry)
+    return registry
+
+
+@pytest.fixture
+def client(registry):
+    from app.routes import main
+
+    app = Flask(__name__)
+    app.config.update(CACHE_INSTANCE=MemoryCache(), RATE_LIMITER=None, RSS_FEED_LINK='https://example.com')
+    app.register_blueprint(main)
+    return app.test_client()
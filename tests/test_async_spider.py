@@ -0,0 +1,131 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from app.core.rate_limit import UpstreamBusy
+from app.spiders.async_spider import AsyncBaseSpider, HostRateLimiter, as_async, gather_bounded, run_sync
+
+from conftest import StaticSpider
+
+request_id = contextvars.ContextVar('request_id', default=None)
+
+
+def test_gather_bounded_limits_concurrency():
+    running = peak = 0
+
+    async def task(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if i == 3:
+            raise ValueError('failed')
+        return i
+
+    results = asyncio.run(gather_bounded([lambda i=i: task(i) for i in range(10)], 3))
+    assert peak == 3
+    assert results[:3] == [0, 1, 2]
+    assert isinstance(results[3], ValueError)
+
+
+def test_host_rate_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(10)
+    delays = [limiter.reserve('https://a.example/feed') for _ in range(3)]
+    assert delays[0] == 0
+    assert delays[1] == pytest.approx(0.1, abs=0.01)
+    assert delays[2] == pytest.approx(0.2, abs=0.01)
+    # 其他主机不受影响
+    assert limiter.reserve('https://b.example/feed') == 0
+    assert HostRateLimiter(0).reserve('https://a.example/feed') == 0
+
+
+def test_run_sync_without_event_loop():
+    async def value():
+        return 42
+
+    assert run_sync(value()) == 42
+
+
+def test_run_sync_inside_event_loop_keeps_context():
+    async def read():
+        return request_id.get(), threading.current_thread()
+
+    async def main():
+        request_id.set('abc')
+        return run_sync(read())
+
+    value, thread = asyncio.run(main())
+    assert value == 'abc'
+    # 已有事件循环时在独立线程中运行
+    assert thread is not threading.main_thread()
+
+
+def test_run_sync_inside_event_loop_raises_errors():
+    async def fail():
+        raise UpstreamBusy(3)
+
+    async def main():
+        return run_sync(fail())
+
+    with pytest.raises(UpstreamBusy):
+        asyncio.run(main())
+
+
+class PagesSpider(AsyncBaseSpider):
+    """Async spider over stubbed blocking fetches."""
+
+    max_concurrency = 2
+
+    def __init__(self, fail=(), error=RuntimeError):
+        super().__init__()
+        self.fail = set(fail)
+        self.error = error
+        self.contexts = []
+        self.running = self.peak = 0
+        self._lock = threading.Lock()
+
+    def fetch_url(self, url, headers=None, use_cache=True):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.contexts.append(request_id.get())
+        time.sleep(0.02)
+        with self._lock:
+            self.running -= 1
+        if url in self.fail:
+            raise self.error(url)
+        return f'content of {url}'
+
+    async def afetch_items(self):
+        return await self.afetch_many([f'https://example.com/{i}' for i in range(5)])
+
+
+def test_afetch_many_runs_blocking_fetches_in_threads():
+    spider = PagesSpider(fail={'https://example.com/2'})
+
+    async def main():
+        request_id.set('abc')
+        return await spider.afetch_items()
+
+    contents = asyncio.run(main())
+    assert contents[2] is None
+    assert contents[4] == 'content of https://example.com/4'
+    assert spider.peak == 2
+    # 线程池中的fetch_url能访问调用方的上下文变量
+    assert spider.contexts == ['abc'] * 5
+
+
+def test_afetch_many_raises_upstream_busy():
+    spider = PagesSpider(fail={'https://example.com/1'}, error=UpstreamBusy)
+    with pytest.raises(UpstreamBusy):
+        spider.fetch_items()
+
+
+def test_sync_spiders_run_in_a_worker_thread():
+    spider = StaticSpider()
+    assert [item.title for item in asyncio.run(as_async(spider).afetch_items())] == \
+        [item.title for item in StaticSpider.items]
@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from app.core.cache import MemoryCache
+from app.spiders.base_spider import BaseSpider
+
+URL = 'https://upstream.example/feed'
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+
+class UpstreamSpider(BaseSpider):
+    """Spider whose upstream requests are answered by a stub."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = []
+        self.version = 1
+        self.delay = 0
+        self._lock = threading.Lock()
+
+    def fetch_items(self):
+        return []
+
+    def _request(self, url, headers=None, extra_headers=None):
+        with self._lock:
+            self.requests.append(dict(extra_headers or {}))
+        time.sleep(self.delay)
+        etag = f'"v{self.version}"'
+        if extra_headers and extra_headers.get('If-None-Match') == etag:
+            return FakeResponse(304, headers={'ETag': etag})
+        return FakeResponse(200, f'content v{self.version}', {'ETag': etag})
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['CACHE_INSTANCE'] = MemoryCache()
+    return app
+
+
+def fetch_in_threads(app, spider, count):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def fetch(i):
+        with app.app_context():
+            barrier.wait()
+            results[i] = spider.fetch_url(URL)
+
+    threads = [threading.Thread(target=fetch, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def expire(app, spider):
+    """Make the cached copy of URL stale (but still within stale_ttl)."""
+    cache = app.config['CACHE_INSTANCE']
+    entry = cache.get(f'url_{URL}')
+    entry['fresh_until'] = time.time() - 1
+    cache.set(f'url_{URL}', entry)
+
+
+def wait_for_refresh(spider):
+    deadline = time.time() + 5
+    while spider._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+    assert not spider._refreshing
+
+
+def test_concurrent_misses_share_one_upstream_request(app):
+    spider = UpstreamSpider()
+    spider.delay = 0.1
+    assert fetch_in_threads(app, spider, 8) == ['content v1'] * 8
+    assert len(spider.requests) == 1
+
+
+def test_stale_content_is_served_while_one_refresh_runs(app):
+    spider = UpstreamSpider()
+    with app.app_context():
+        spider.fetch_url(URL)
+    expire(app, spider)
+    spider.version = 2
+    spider.delay = 0.3
+
+    start = time.perf_counter()
+    assert fetch_in_threads(app, spider, 8) == ['content v1'] * 8
+    # 旧内容立即返回，不等待上游
+    assert time.perf_counter() - start < 0.2
+    wait_for_refresh(spider)
+    assert len(spider.requests) == 2
+
+    with app.app_context():
+        assert spider.fetch_url(URL) == 'content v2'
+    assert len(spider.requests) == 2
+
+
+def test_refresh_revalidates_with_validators(app):
+    spider = UpstreamSpider()
+    with app.app_context():
+        spider.fetch_url(URL)
+        expire(app, spider)
+        assert spider.fetch_url(URL) == 'content v1'
+    wait_for_refresh(spider)
+    # 上游返回304：沿用缓存的内容，只延长有效期
+    assert spider.requests[-1] == {'If-None-Match': '"v1"'}
+    entry = app.config['CACHE_INSTANCE'].get(f'url_{URL}')
+    assert entry['content'] == 'content v1'
+    assert entry['fresh_until'] > time.time()
+
+
+def test_lock_timeout_falls_through_to_upstream(app):
+    spider = UpstreamSpider(lock_timeout=0.05)
+    cache = app.config['CACHE_INSTANCE']
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with cache.lock(f'url_{URL}'):
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait(5)
+    try:
+        with app.app_context():
+            # 持锁的请求迟迟没有结果时不再等待，自行请求上游
+            assert spider.fetch_url(URL) == 'content v1'
+        assert len(spider.requests) == 1
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_background_refresh_errors_are_logged(app, caplog):
+    spider = UpstreamSpider()
+    with app.app_context():
+        spider.fetch_url(URL)
+        expire(app, spider)
+        spider._request = lambda *args: FakeResponse(500)
+        assert spider.fetch_url(URL) == 'content v1'
+    wait_for_refresh(spider)
+    assert 'Error refreshing' in caplog.text
@@ -0,0 +1,44 @@
+import io
+import time
+
+import pytest
+
+from app.core.cache import (CACHE_FILE_HEADER, Cache, CODEC_NONE, CODEC_ZLIB, CODEC_ZSTD, decode_cache_payload,
+                            encode_cache_file, read_cache_header, zstandard)
+
+CODECS = [CODEC_NONE, CODEC_ZLIB,
+          pytest.param(CODEC_ZSTD, marks=pytest.mark.skipif(zstandard is None, reason='zstandard not installed'))]
+
+
+@pytest.mark.parametrize('codec', CODECS)
+@pytest.mark.parametrize('data', ['<rss>' + 'x' * 4096 + '</rss>', {'xml': 'y' * 4096, 'offsets': [1, 2, 3]}])
+def test_round_trip(codec, data):
+    expires_at, timestamp = time.time() + 60, time.time()
+    raw, size = encode_cache_file(data, expires_at, timestamp, codec=codec, compress_min=1024, key='feed_test')
+
+    f = io.BytesIO(raw)
+    stored_codec, content_type, stored_expires_at, stored_timestamp, key = read_cache_header(f)
+    assert (stored_codec, stored_expires_at, stored_timestamp, key) == (codec, expires_at, timestamp, 'feed_test')
+    assert decode_cache_payload(stored_codec, content_type, f.read()) == (data, size)
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_small_payloads_are_not_compressed(codec):
+    raw, _ = encode_cache_file('small', 0, 0, codec=codec, compress_min=1024)
+    assert read_cache_header(io.BytesIO(raw))[0] == CODEC_NONE
+
+
+@pytest.mark.parametrize('raw', [b'', b'RSC', b'XYZ' + bytes(CACHE_FILE_HEADER.size)])
+def test_invalid_header(raw):
+    with pytest.raises(ValueError):
+        read_cache_header(io.BytesIO(raw))
+
+
+@pytest.mark.parametrize('codec', ['none', 'zlib',
+                                   pytest.param('zstd', marks=pytest.mark.skipif(zstandard is None,
+                                                                                 reason='zstandard not installed'))])
+def test_file_cache_round_trip(tmp_path, codec):
+    data = {'xml': '<rss>' + 'z' * 4096 + '</rss>', 'offsets': [5, 10]}
+    Cache(cache_dir=str(tmp_path), codec=codec, sweep_interval=0).set('feed_test', data, 60)
+    # 新实例没有进程内缓存，从文件读取
+    assert Cache(cache_dir=str(tmp_path), codec=codec, sweep_interval=0).get('feed_test') == data
@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.dates import EPOCH, format_rfc822, format_rfc822_many, normalize_date, normalize_dates, parse_datetime
+
+
+def test_parse_iso_and_rfc822():
+    expected = datetime(2025, 11, 1, 8, 30, tzinfo=timezone(timedelta(hours=8)))
+    assert parse_datetime('2025-11-01T08:30:00+08:00') == expected
+    assert parse_datetime('Sat, 01 Nov 2025 08:30:00 +0800') == expected
+    assert parse_datetime('2025-11-01T00:30:00Z') == expected
+    # 没有时区信息的时间按UTC处理
+    assert parse_datetime('2025-11-01T00:30:00').tzinfo == timezone.utc
+
+
+def test_unparseable_dates_fall_back_deterministically():
+    assert parse_datetime('not a date') is None
+    assert normalize_date('not a date') == EPOCH
+    fallback = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert normalize_dates(['not a date', None, '2025-11-01T00:00:00Z'], fallback) == [
+        fallback, fallback, datetime(2025, 11, 1, tzinfo=timezone.utc)
+    ]
+
+
+def test_format_rfc822_matches_strftime():
+    dates = [datetime(2025, 11, 1, 8, 5, 3, tzinfo=timezone(timedelta(hours=h, minutes=m)))
+             for h, m in ((0, 0), (8, 0), (-5, 0), (5, 30), (-3, -30))]
+    expected = [value.strftime('%a, %d %b %Y %H:%M:%S %z') for value in dates]
+    assert [format_rfc822(value) for value in dates] == expected
+    assert format_rfc822_many(dates) == expected
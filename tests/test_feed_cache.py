@@ -0,0 +1,52 @@
+from app.core.cache import MemoryCache
+from app.core.feed_cache import FeedCache
+from app.core.pagination import FeedWindow, decode_cursor
+from app.core.rss_generator import iter_rss
+
+from conftest import make_items
+
+
+def store(items):
+    return FeedCache(MemoryCache()).store('test', items, lambda: iter_rss(items, 'test'), 3600)
+
+
+def item_titles(xml):
+    return [line.strip()[len('<title>'):-len('</title>')] for line in xml.splitlines()
+            if line.strip().startswith('<title>Item')]
+
+
+def test_offsets_delimit_item_fragments():
+    items = make_items(4)
+    entry = store(items)
+    xml, offsets = entry['xml'], entry['offsets']
+    assert len(offsets) == len(items) + 1
+    assert len(entry['marks']) == len(items)
+    for i, item in enumerate(items):
+        fragment = xml[offsets[i]:offsets[i + 1]]
+        assert fragment.strip().startswith('<item>')
+        assert f'<title>{item.title}</title>' in fragment
+    assert xml[offsets[-1]:].strip().startswith('</channel>')
+
+
+def test_window_slices_the_cached_document():
+    entry = store(make_items(5))
+    page = FeedCache.window(entry, FeedWindow(limit=2), lambda cursor: f'https://example.com/test?cursor={cursor}')
+    assert item_titles(page['xml']) == ['Item 0', 'Item 1']
+    assert page['xml'].startswith(entry['xml'][:entry['offsets'][0]])
+    assert page['xml'].endswith(entry['xml'][entry['offsets'][-1]:])
+    assert page['next'].startswith('https://example.com/test?cursor=')
+    assert page['etag'] != entry['etag']
+    assert page['last_modified'] == entry['last_modified']
+
+    cursor = decode_cursor(page['next'].split('cursor=')[1])
+    rest = FeedCache.window(entry, FeedWindow(limit=10, cursor=cursor))
+    assert item_titles(rest['xml']) == ['Item 2', 'Item 3', 'Item 4']
+    assert rest['next'] is None
+
+
+def test_window_with_since_uses_marks():
+    entry = store(make_items(5))
+    since = entry['marks'][3][0]
+    page = FeedCache.window(entry, FeedWindow(since=since))
+    assert item_titles(page['xml']) == ['Item 0', 'Item 1', 'Item 2']
+
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from app.core.merge import PARTIAL_TTL, fetch_all, merge_items
+from app.core.models import FeedItem
+from app.spiders.base_spider import BaseSpider
+
+from conftest import BASE_DATE, make_items
+
+
+def test_merge_dedupes_by_guid_then_link():
+    a = FeedItem('A', 'https://example.com/shared', pub_date=BASE_DATE, guid='urn:a')
+    b = FeedItem('B', 'https://example.com/shared', pub_date=BASE_DATE, guid='urn:b')
+    duplicate = FeedItem('A again', 'https://example.com/other', pub_date=BASE_DATE, guid='urn:a')
+    no_guid = FeedItem('C', 'https://example.com/c', pub_date=BASE_DATE)
+    same_link = FeedItem('C again', 'https://example.com/c', pub_date=BASE_DATE)
+    merged = merge_items([[a, b], [duplicate, no_guid, same_link]])
+    assert [item.title for item in merged] == ['A', 'B', 'C']
+
+
+def test_merge_sorts_newest_first_and_limits():
+    items = make_items(6)
+    merged = merge_items([items[1::2], items[0::2]], limit=4)
+    assert [item.title for item in merged] == ['Item 0', 'Item 1', 'Item 2', 'Item 3']
+
+
+class MergeSpider(BaseSpider):
+    """Spider returning one item per feed, failing while ``failing`` is set."""
+
+    def __init__(self):
+        super().__init__(cache_ttl=0)
+        self.failing = False
+
+    def fetch_items(self):
+        if self.failing:
+            raise RuntimeError('upstream error')
+        return [FeedItem(f'{self.name} item', f'https://example.com/{self.name}', pub_date=BASE_DATE)]
+
+
+class OneSpider(MergeSpider):
+    pass
+
+
+class TwoSpider(MergeSpider):
+    pass
+
+
+@pytest.fixture
+def spiders(registry):
+    registry.register('one', OneSpider)
+    registry.register('two', TwoSpider)
+    return registry.get_spider('one'), registry.get_spider('two')
+
+
+def test_fetch_all_reports_failures(spiders):
+    one, two = spiders
+    two.failing = True
+    item_lists, failed = fetch_all([one, two])
+    assert [len(items) for items in item_lists] == [1, 0]
+    assert failed == ['TwoSpider']
+
+
+def test_partial_merge_keeps_previous_feed(client, spiders):
+    one, two = spiders
+    complete = client.get('/merge?feeds=one,two')
+    assert complete.status_code == 200
+    assert complete.data.count(b'<item>') == 2
+
+    two.failing = True
+    partial = client.get('/merge?feeds=one,two')
+    assert partial.data == complete.data
+
+
+def test_partial_merge_without_previous_feed_is_cached_briefly(client, spiders):
+    one, two = spiders
+    one.cache_ttl = two.cache_ttl = 3600
+    two.failing = True
+    response = client.get('/merge?feeds=one,two')
+    assert response.data.count(b'<item>') == 1
+    entry = client.application.config['CACHE_INSTANCE'].get('feed_merge?feeds=one,two')
+    assert entry['fresh_until'] - time.time() <= PARTIAL_TTL
@@ -0,0 +1,60 @@
+import pytest
+
+from app.core.cache import Cache, MemoryCache, RedisCache
+from app.core.metrics import render_metrics
+
+
+def cache_samples(cache):
+    """Cache samples exported by /metrics, as {(name, tier): value}."""
+    samples = {}
+    for line in render_metrics(cache_stats=cache.get_stats()).splitlines():
+        if line.startswith('rsshub_cache_') and '{tier=' in line:
+            series, value = line.rsplit(' ', 1)
+            name, labels = series.split('{', 1)
+            samples[name, labels[len('tier="'):-len('"}')]] = float(value)
+    return samples
+
+
+def exercise(cache):
+    cache.set('a', 'value', 60)
+    cache.get('a')
+    cache.get('missing')
+
+
+def test_memory_cache_metrics():
+    cache = MemoryCache()
+    exercise(cache)
+    samples = cache_samples(cache)
+    assert samples['rsshub_cache_entries', 'memory'] == 1
+    assert samples['rsshub_cache_hits_total', 'memory'] == 1
+    assert samples['rsshub_cache_misses_total', 'memory'] == 1
+    assert ('rsshub_cache_max_bytes', 'memory') in samples
+
+
+def test_file_cache_metrics(tmp_path):
+    cache = Cache(cache_dir=str(tmp_path), sweep_interval=0)
+    exercise(cache)
+    samples = cache_samples(cache)
+    assert samples['rsshub_cache_entries', 'file'] == 1
+    assert samples['rsshub_cache_entries', 'memory'] == 1
+    assert ('rsshub_cache_bytes', 'file') in samples
+
+
+def test_redis_cache_metrics():
+    fakeredis = pytest.importorskip('fakeredis')
+    cache = RedisCache(client=fakeredis.FakeRedis())
+    exercise(cache)
+    cache.delete('a')
+    samples = cache_samples(cache)
+    assert samples['rsshub_cache_writes_total', 'redis'] == 1
+    assert samples['rsshub_cache_deletes_total', 'redis'] == 1
+    assert samples['rsshub_cache_hits_total', 'redis'] == 1
+    # 键的数量需要扫描整个键空间，不导出
+    assert ('rsshub_cache_entries', 'redis') not in samples
+    assert 'None' not in render_metrics(cache_stats=cache.get_stats())
+
+
+def test_metrics_endpoint(client):
+    client.get('/static')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'rsshub_cache_entries{tier="memory"}' in body
@@ -0,0 +1,68 @@
+import pytest
+
+from app.core.pagination import FeedWindow, decode_cursor, encode_cursor, item_mark, mark_items
+
+from conftest import make_items
+
+
+def titles(items):
+    return [item.title for item in items]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(20, 1761955200.5, 'abcd1234')
+    assert decode_cursor(cursor) == (20, 1761955200.5, 'abcd1234')
+
+
+def test_cursor_round_trip_without_timestamp():
+    assert decode_cursor(encode_cursor(3, None, 'abcd1234')) == (3, None, 'abcd1234')
+
+
+@pytest.mark.parametrize('cursor', ['', 'not base64!', encode_cursor(0, None, 'abcd'), 'MTox'])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_from_args():
+    assert FeedWindow.from_args({}) is None
+    window = FeedWindow.from_args({'limit': '500', 'since': '1761955200'}, max_limit=100)
+    assert window.limit == 100
+    assert window.since == 1761955200.0
+    with pytest.raises(ValueError):
+        FeedWindow.from_args({'limit': '0'})
+
+
+def test_pages_follow_cursors():
+    items = make_items(7)
+    pages = []
+    window = FeedWindow(limit=3)
+    while True:
+        page, cursor = window.page(mark_items(items))
+        pages.append(titles(page))
+        if cursor is None:
+            break
+        window = FeedWindow(limit=3, cursor=decode_cursor(cursor))
+    assert pages == [['Item 0', 'Item 1', 'Item 2'], ['Item 3', 'Item 4', 'Item 5'], ['Item 6']]
+
+
+def test_since_excludes_older_items():
+    items = make_items(5)
+    since, _ = item_mark(items[2])
+    page, cursor = FeedWindow(since=since).page(mark_items(items))
+    assert titles(page) == ['Item 0', 'Item 1']
+    assert cursor is None
+
+
+def test_same_timestamp_items_are_not_skipped_when_the_feed_changes():
+    items = make_items(6, same_date=True)
+    page, cursor = FeedWindow(limit=3).page(mark_items(items))
+    assert titles(page) == ['Item 0', 'Item 1', 'Item 2']
+
+    # 两个新条目插入到前面，上一页的最后一条不在游标位置，按发布时间继续
+    changed = make_items(2, same_date=True)
+    for i, item in enumerate(changed):
+        item.title, item.link = f'New {i}', f'https://example.com/new/{i}'
+    next_page, _ = FeedWindow(limit=10, cursor=decode_cursor(cursor)).page(mark_items(changed + items))
+    assert {'Item 3', 'Item 4', 'Item 5'} <= set(titles(next_page))
+    assert 'Item 2' not in titles(next_page)
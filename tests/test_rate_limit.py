@@ -0,0 +1,106 @@
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import ConcurrencyLimit, RateLimiter, UpstreamBusy
+from app.spiders.base_spider import BaseSpider
+
+from conftest import make_items
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, 'time', clock)
+    return clock
+
+
+def test_burst_then_retry_after(clock):
+    limiter = RateLimiter(6, period=60, burst=3)
+    assert [limiter.acquire('a')[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = limiter.acquire('a')
+    assert not allowed
+    # 每10秒补充一个令牌
+    assert retry_after == pytest.approx(10)
+    assert limiter.acquire('b') == (True, 0.0)
+
+
+def test_refill(clock):
+    limiter = RateLimiter(6, period=60, burst=3)
+    for _ in range(3):
+        limiter.acquire('a')
+    clock.now += 4
+    allowed, retry_after = limiter.acquire('a')
+    assert not allowed
+    assert retry_after == pytest.approx(6)
+    clock.now += 6
+    assert limiter.acquire('a') == (True, 0.0)
+    clock.now += 1000
+    # 令牌数不超过桶容量
+    assert [limiter.acquire('a')[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_concurrency_limit_rejects_when_full():
+    limit = ConcurrencyLimit(1, timeout=0.01, retry_after=7)
+    with limit:
+        assert limit.saturated()
+        with pytest.raises(UpstreamBusy) as excinfo:
+            with limit:
+                pass
+    assert excinfo.value.retry_after == 7
+    assert limit.rejected == 1
+    assert not limit.saturated()
+
+
+def test_get_feed_rate_limit(client):
+    client.application.config['RATE_LIMITER'] = RateLimiter(1, period=60)
+    assert client.get('/static').status_code == 200
+    limited = client.get('/static')
+    assert limited.status_code == 429
+    assert limited.headers['Retry-After'] == '60'
+    # 限流按客户端IP和RSS源分别计数
+    assert client.get('/static', environ_base={'REMOTE_ADDR': '10.0.0.2'}).status_code == 200
+
+
+class BusySpider(BaseSpider):
+    """Spider whose upstream capacity is exhausted after the first fetch."""
+
+    def __init__(self):
+        # cache_ttl为0：渲染后的RSS立即过期，下次请求需要刷新
+        super().__init__(cache_ttl=0)
+        self.busy = False
+
+    def fetch_items(self):
+        if self.busy:
+            raise UpstreamBusy(retry_after=3)
+        return make_items(2)
+
+
+@pytest.fixture
+def busy_spider(registry):
+    registry.register('busy', BusySpider)
+    spider = registry.get_spider('busy')
+    spider.busy = True
+    return spider
+
+
+def test_upstream_busy_without_cached_feed(client, busy_spider):
+    response = client.get('/busy')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+
+
+def test_upstream_busy_serves_stale_feed(client, busy_spider):
+    busy_spider.busy = False
+    fresh = client.get('/busy')
+    busy_spider.busy = True
+    stale = client.get('/busy')
+    assert stale.status_code == 200
+    assert stale.data == fresh.data
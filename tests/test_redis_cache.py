@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from app.core.cache import RedisCache
+from app.core.rate_limit import RedisRateLimiter
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def cache(redis_client):
+    return RedisCache(client=redis_client, prefix='test:')
+
+
+def test_round_trip(cache, redis_client):
+    cache.set('feed_a', {'xml': '<rss/>', 'offsets': [1, 2]}, 60)
+    assert cache.get('feed_a') == {'xml': '<rss/>', 'offsets': [1, 2]}
+    assert cache.get('feed_missing') is None
+    assert redis_client.exists('test:feed_a')
+    cache.delete('feed_a')
+    assert cache.get('feed_a') is None
+
+
+def test_entries_expire(cache, redis_client):
+    cache.set('feed_a', 'value', 1)
+    assert 0 < redis_client.pttl('test:feed_a') <= 1000
+    time.sleep(1.1)
+    assert cache.get('feed_a') is None
+
+
+def test_get_many(cache):
+    cache.set('a', 1)
+    cache.set('b', {'x': 2})
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'b': {'x': 2}}
+    assert cache.get_many([]) == {}
+
+
+def test_lock_contention(cache, redis_client):
+    other = RedisCache(client=redis_client, prefix='test:')
+    with cache.lock('url_x') as acquired:
+        assert acquired
+        with other.lock('url_x', blocking=False) as contended:
+            assert not contended
+    with other.lock('url_x', blocking=False) as released:
+        assert released
+
+
+def test_clear_only_removes_prefixed_keys(cache, redis_client):
+    redis_client.set('other:key', 'kept')
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.clear()
+    assert cache.get_many(['a', 'b']) == {}
+    assert redis_client.get('other:key') == b'kept'
+
+
+def test_stats_counters(cache, redis_client):
+    other = RedisCache(client=redis_client, prefix='test:')
+    cache.set('a', 1)
+    other.set('b', 2)
+    other.delete('a')
+    other.get('b')
+    other.get('a')
+    stats = other.get_stats()['tiers']['redis']
+    # 写入和删除次数在所有实例间共享，命中和未命中按进程统计
+    assert (stats['writes'], stats['deletes']) == (2, 1)
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert cache.get_stats()['tiers']['redis']['hits'] == 0
+
+
+def test_rate_limiter_denies_then_refills(redis_client):
+    limiter = RedisRateLimiter(10, period=1, burst=2, client=redis_client)
+    assert [limiter.acquire('client|feed')[0] for _ in range(2)] == [True, True]
+    allowed, retry_after = limiter.acquire('client|feed')
+    assert not allowed
+    assert 0 < retry_after <= 0.1
+    assert limiter.acquire('other|feed') == (True, 0.0)
+    time.sleep(retry_after + 0.02)
+    assert limiter.acquire('client|feed')[0]
@@ -0,0 +1,60 @@
+from app.core.cache import MemoryCache
+from app.core.feed_cache import FeedCache
+from app.core.rss_generator import iter_rss
+
+from conftest import make_items
+
+
+def test_get_feed_answers_304_for_current_copies(client, registry):
+    first = client.get('/static')
+    assert first.status_code == 200
+    assert first.headers['Content-Type'] == 'application/rss+xml; charset=utf-8'
+    etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+
+    cached = client.get('/static', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert cached.headers['ETag'] == etag
+
+    assert client.get('/static', headers={'If-Modified-Since': last_modified}).status_code == 304
+    assert client.get('/static', headers={'If-None-Match': '"other"'}).status_code == 200
+    # 渲染后的RSS已缓存，后续请求不再调用爬虫
+    assert registry.get_spider('static').fetches == 1
+
+
+def test_unchanged_items_keep_validators():
+    items = make_items(3)
+    feed_cache = FeedCache(MemoryCache())
+    first = feed_cache.store('test', items, lambda: iter_rss(items, 'test'), 3600)
+    second = feed_cache.store('test', make_items(3), lambda: iter_rss(items, 'test'), 3600, previous=first)
+    assert second['etag'] == first['etag']
+    assert second['xml'] == first['xml']
+    assert feed_cache.get('test')['etag'] == first['etag']
+
+
+def test_changed_items_get_new_validators():
+    items = make_items(3)
+    feed_cache = FeedCache(MemoryCache())
+    first = feed_cache.store('test', items, lambda: iter_rss(items, 'test'), 3600)
+    changed = make_items(4)
+    second = feed_cache.store('test', changed, lambda: iter_rss(changed, 'test'), 3600, previous=first)
+    assert second['etag'] != first['etag']
+
+
+def test_get_feed_window_has_its_own_validators(client):
+    full = client.get('/static')
+    page = client.get('/static?limit=2')
+    assert page.status_code == 200
+    assert page.headers['ETag'] != full.headers['ETag']
+    assert page.headers['Link'].endswith('rel="next"')
+    assert client.get('/static?limit=2', headers={'If-None-Match': page.headers['ETag']}).status_code == 304
+
+
+def test_get_feed_rejects_invalid_window(client):
+    response = client.get('/static?limit=x')
+    assert response.status_code == 400
+    assert response.json == {'error': 'limit must be an integer'}
+
+
+def test_unknown_feed(client):
+    assert client.get('/missing').status_code == 404